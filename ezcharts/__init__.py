@@ -41,7 +41,9 @@ def cli():
         'modkit', 'mosdepth', 'clinvar', 'bcfstats',
         'status'
         ]
-    others = ['ezcharts.demo', 'ezcharts.plots.demo', 'ezcharts.plots.ideogram']
+    others = [
+        'ezcharts.demo', 'ezcharts.plots.demo', 'ezcharts.plots.ideogram',
+        'ezcharts.batch']
 
     demos = [f'ezcharts.components.{comp}' for comp in components] + others
     for module in demos:
@@ -0,0 +1,304 @@
+"""Build many reports in one long-lived process pool.
+
+Building each report in its own Python process pays for importing ezcharts,
+compiling the theme stylesheet and reading vendor assets every time. Here
+these are loaded once, in the parent process, and inherited by forked
+workers which each build many reports. A report that fails is recorded in
+the summary without stopping the others.
+
+A manifest lists the reports to build. Each entry names a template, a
+callable (given as "package.module:function" in manifest files) which is
+called with the entry's inputs as keyword arguments and returns a `Report`,
+and the output path to which the report is written.
+"""
+import argparse
+from collections import namedtuple
+from concurrent.futures import as_completed, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import csv
+import functools
+import importlib
+import json
+import multiprocessing
+import sys
+import time
+import traceback
+
+from ezcharts import util
+
+
+BatchEntry = namedtuple('BatchEntry', ['template', 'inputs', 'output'])
+SUMMARY_COLUMNS = ['output', 'template', 'status', 'seconds', 'error']
+
+logger = util.get_named_logger("Batch")
+
+
+def read_manifest(path):
+    """Read a manifest of reports to build.
+
+    JSON manifests hold a list of objects with `template`, `output` and
+    `inputs` (an object of keyword arguments). Other files are read as
+    tab-separated tables with `template` and `output` columns, any other
+    (non-empty) columns being passed to the template as string arguments.
+
+    :param path: manifest file.
+    :returns: list of `BatchEntry`.
+    """
+    if str(path).endswith('.json'):
+        with open(path, encoding='utf-8') as fh:
+            return [
+                BatchEntry(x['template'], x.get('inputs', dict()), x['output'])
+                for x in json.load(fh)]
+    entries = list()
+    with open(path, encoding='utf-8', newline='') as fh:
+        for row in csv.DictReader(fh, delimiter='\t'):
+            template, output = row.pop('template'), row.pop('output')
+            inputs = {key: value for key, value in row.items() if value}
+            entries.append(BatchEntry(template, inputs, output))
+    return entries
+
+
+@functools.lru_cache(maxsize=None)
+def _import_template(spec):
+    """Import a template from a "package.module:function" string."""
+    module, _, name = spec.partition(':')
+    if not name:
+        raise ValueError(
+            f"Template '{spec}' should be given as 'package.module:function'.")
+    return getattr(importlib.import_module(module), name)
+
+
+def load_template(template):
+    """Return a template callable, importing it if given by name."""
+    return _import_template(template) if isinstance(template, str) else template
+
+
+def _template_name(template):
+    """Return a name for a template, for the summary."""
+    if isinstance(template, str):
+        return template
+    return f"{template.__module__}:{template.__qualname__}"
+
+
+def warm_caches(templates=()):
+    """Load assets shared by reports, so that forked workers inherit them.
+
+    :param templates: templates to import.
+    """
+    from ezcharts.components import theme
+    for resource in (*theme.LAB_head_resources, *theme.LAB_body_resources):
+        resource()
+    for template in templates:
+        try:
+            load_template(template)
+        except Exception:
+            # reported when the template's reports are built
+            pass
+
+
+def build_report(entry, write_kwargs=None):
+    """Build and write a single report, recording rather than raising errors.
+
+    :param entry: a `BatchEntry`.
+    :param write_kwargs: keyword arguments for `Report.write`.
+    :returns: dict of the summary columns, see `SUMMARY_COLUMNS`.
+    """
+    start = time.perf_counter()
+    status, error = 'ok', ''
+    try:
+        report = load_template(entry.template)(**entry.inputs)
+        report.write(entry.output, **(write_kwargs or dict()))
+    except Exception as e:
+        status, error = 'failed', f"{type(e).__name__}: {e}"
+        logger.debug(traceback.format_exc())
+    return dict(
+        output=str(entry.output), template=_template_name(entry.template),
+        status=status, seconds=round(time.perf_counter() - start, 3),
+        error=error)
+
+
+# entries to build, set before forking worker processes which inherit them,
+# and flags, in memory shared with the workers, of the entries started
+_fork_entries = None
+_fork_started = None
+
+
+def _build_forked(index, write_kwargs):
+    """Build a report whose entry was inherited from the parent process."""
+    _fork_started[index] = 1
+    return build_report(_fork_entries[index], write_kwargs)
+
+
+def _build_pool(indices, threads, write_kwargs, results, log):
+    """Build reports of the given entries in a pool of forked workers.
+
+    :param indices: indices of the entries to build.
+    :param threads: number of worker processes.
+    :param write_kwargs: keyword arguments for `Report.write`.
+    :param results: list of results of all entries, to fill in.
+    :param log: function called with the index of each entry built.
+    :returns: the exception with which the pool broke, and the indices of the
+        entries started but not built by then, or None and an empty list.
+    """
+    for index in indices:
+        _fork_started[index] = 0
+    with ProcessPoolExecutor(
+        max_workers=threads, mp_context=multiprocessing.get_context('fork')
+    ) as executor:
+        futures = {
+            executor.submit(_build_forked, i, write_kwargs): i for i in indices}
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                results[index] = future.result()
+            except BrokenProcessPool as e:
+                # a worker died, e.g. killed for lack of memory
+                return e, [
+                    i for i in indices
+                    if _fork_started[i] and results[i] is None]
+            log(index)
+    return None, list()
+
+
+def build_reports(entries, threads=1, summary=None, write_kwargs=None):
+    """Build many reports, sharing loaded assets and worker processes.
+
+    Workers are forked, so entries (and their templates) need not be
+    picklable. Where fork is not available reports are built in this
+    process. If a worker dies while building a report, e.g. killed for lack
+    of memory, that report is recorded as failed and the others are built
+    in a new pool of workers.
+
+    :param entries: list of `BatchEntry`, or of tuples of template, inputs and
+        output.
+    :param threads: number of worker processes.
+    :param summary: path of a tab-separated file to which to write the
+        status and build time of each report.
+    :param write_kwargs: keyword arguments for `Report.write`.
+    :returns: list of dicts of the summary columns, in the order of entries.
+    """
+    global _fork_entries, _fork_started
+    entries = [BatchEntry(*entry) for entry in entries]
+    warm_caches({x.template for x in entries if isinstance(x.template, str)})
+    results = [None] * len(entries)
+
+    def _log(index):
+        result = results[index]
+        done = sum(x is not None for x in results)
+        message = (
+            f"[{done}/{len(entries)}] {result['status']} {result['output']} "
+            f"({result['seconds']}s)")
+        if result['status'] == 'ok':
+            logger.info(message)
+        else:
+            logger.warning(f"{message}: {result['error']}")
+
+    if threads > 1 and len(entries) > 1 and (
+            'fork' in multiprocessing.get_all_start_methods()):
+        _fork_entries = entries
+        _fork_started = multiprocessing.get_context('fork').Array(
+            'b', len(entries), lock=False)
+        batches = [(list(range(len(entries))), threads)]
+        try:
+            while batches:
+                indices, workers = batches.pop(0)
+                error, started = _build_pool(
+                    indices, workers, write_kwargs, results, _log)
+                if error is None:
+                    continue
+                remaining = [
+                    i for i in indices if results[i] is None and i not in started]
+                if len(started) > 1:
+                    # build each report that was in progress on its own, to
+                    # find the one that killed its worker
+                    batches.extend(([i], 1) for i in started)
+                    started = list()
+                elif not started:
+                    # the pool broke before building any report, don't retry
+                    started, remaining = remaining, list()
+                for index in started:
+                    entry = entries[index]
+                    results[index] = dict(
+                        output=str(entry.output),
+                        template=_template_name(entry.template),
+                        status='failed', seconds=float('nan'),
+                        error=f"{type(error).__name__}: {error}")
+                    _log(index)
+                if remaining:
+                    batches.append((remaining, workers))
+        finally:
+            _fork_entries = _fork_started = None
+    else:
+        for index, entry in enumerate(entries):
+            results[index] = build_report(entry, write_kwargs)
+            _log(index)
+
+    if summary is not None:
+        with open(summary, 'w', encoding='utf-8', newline='') as fh:
+            writer = csv.DictWriter(
+                fh, SUMMARY_COLUMNS, delimiter='\t', lineterminator='\n')
+            writer.writeheader()
+            writer.writerows(results)
+    return results
+
+
+def main(args):
+    """Entry point to build reports listed in a manifest."""
+    entries = read_manifest(args.manifest)
+    write_kwargs = dict(pack_data=args.pack_data)
+    for name in ('max_bytes', 'assets_dir', 'assets_url'):
+        if getattr(args, name) is not None:
+            write_kwargs[name] = getattr(args, name)
+    results = build_reports(
+        entries, threads=args.threads, summary=args.summary,
+        write_kwargs=write_kwargs)
+    failed = sum(x['status'] != 'ok' for x in results)
+    logger.info(f"Built {len(results) - failed} of {len(results)} reports.")
+    if failed:
+        sys.exit(1)
+
+
+def argparser():
+    """Argument parser for entrypoint."""
+    parser = argparse.ArgumentParser(
+        'Batch reports',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        add_help=False
+    )
+    parser.add_argument(
+        "manifest",
+        help=(
+            "Manifest of reports to build: a TSV file with `template` "
+            "('package.module:function') and `output` columns, other columns "
+            "being passed to the template, or a JSON list of objects with "
+            "`template`, `inputs` and `output`."
+        )
+    )
+    parser.add_argument(
+        "--threads", type=int, default=1,
+        help="Number of worker processes."
+    )
+    parser.add_argument(
+        "--summary", default="batch_summary.tsv",
+        help="Output TSV file of the status and build time of each report."
+    )
+    parser.add_argument(
+        "--max_bytes", type=int, default=None,
+        help="Size budget for each report, see `Report.write`."
+    )
+    parser.add_argument(
+        "--pack_data", action="store_true",
+        help="Embed chart data as compressed typed arrays."
+    )
+    parser.add_argument(
+        "--assets_dir", default=None,
+        help=(
+            "Directory in which to write scripts and stylesheets shared by the "
+            "reports, rather than inlining them in each report."
+        )
+    )
+    parser.add_argument(
+        "--assets_url", default=None,
+        help="URL of the shared assets, if not the path of `--assets_dir`."
+    )
+    return parser
@@ -3,14 +3,20 @@
 from bokeh.layouts import column
 from bokeh.models import (
     ColumnDataSource,
+    CustomJS,
     CustomJSTickFormatter,
+    CustomJSTransform,
     FixedTicker,
     LabelSet,
+    LinearColorMapper,
     Range1d,
     Span,
     WheelZoomTool
 )
 from bokeh.plotting import figure
+from bokeh.transform import transform
+import numpy as np
+import pandas as pd
 
 from ezcharts.plots import BokehPlot
 
@@ -25,6 +31,31 @@ NUCLEOTIDE_COLORS = {
     "-": "#003E5E"
 }
 
+# Swap the data drawn by the panels for the finest resolution level that keeps
+# the number of visible bins below a maximum, and toggle per-base labels.
+RESOLUTION_CALLBACK = """
+    const width = x_range.end - x_range.start;
+    let level = bin_widths.length - 1;
+    for (let i = 0; i < bin_widths.length; i++) {
+        if (width / bin_widths[i] <= max_bins) {
+            level = i;
+            break;
+        }
+    }
+    const current = source.tags[0];
+    if (current !== level) {
+        // the initial level is held only by the source, keep it for later
+        if (levels[current] === null) {
+            levels[current] = {data: source.data};
+        }
+        source.data = levels[level].data;
+        source.tags = [level];
+    }
+    for (const labels of label_sets) {
+        labels.visible = (level == 0 && width <= label_threshold);
+    }
+"""
+
 
 class BaseComposition(BokehPlot):
     """
@@ -60,7 +91,11 @@ class BaseComposition(BokehPlot):
         plotting_range=None,
         coverage_low_threshold=10,
         coverage_unique_threshold=6,
-        coverage_high_threshold=1000
+        coverage_high_threshold=1000,
+        multiresolution=False,
+        bin_widths=(1, 10, 100, 1000, 10000),
+        max_bins=2000,
+        label_threshold=200
     ):
         """
         Initialize base composition visualization.
@@ -116,6 +151,20 @@ class BaseComposition(BokehPlot):
         coverage_high_threshold : int, default 1000
             Minimum coverage value for using 'k' suffix formatting.
             Coverage values >= this threshold will be shown as '1k', '2.5k', etc.
+        multiresolution : bool, default False
+            Precompute binned summaries of the data at each of `bin_widths`
+            and show the finest level that keeps the visible number of bins
+            below `max_bins`, swapping levels as the plot is zoomed. Use this
+            for long sequences, where drawing every position is slow.
+        bin_widths : tuple of int, default (1, 10, 100, 1000, 10000)
+            Bin widths (in positions) of the resolution levels. Widths not
+            smaller than the number of positions are dropped, a width of 1
+            is always included.
+        max_bins : int, default 2000
+            Maximum number of bins to draw across the visible range.
+        label_threshold : int, default 200
+            Per-base labels are shown only when fewer than this many
+            positions are visible. Only used with `multiresolution`.
         """
         self.original_data = data.copy()  # Keep original data before filtering
         self.data = data.copy()
@@ -137,6 +186,12 @@ class BaseComposition(BokehPlot):
         self.coverage_low_threshold = coverage_low_threshold
         self.coverage_unique_threshold = coverage_unique_threshold
         self.coverage_high_threshold = coverage_high_threshold
+        self.multiresolution = multiresolution
+        self.bin_widths = bin_widths
+        self.max_bins = max_bins
+        self.label_threshold = label_threshold
+        # per-base labels, hidden when zoomed out with `multiresolution`
+        self._label_sets = list()
 
         # Validate existence of required columns
         self._validate_data()
@@ -148,6 +203,8 @@ class BaseComposition(BokehPlot):
             self._filter_plotting_range()
 
         self._prepare_data()
+        if self.multiresolution:
+            self._compute_levels()
 
         # Set view_range visible initially
         if view_range is None:
@@ -203,6 +260,8 @@ class BaseComposition(BokehPlot):
 
         # Build the visualization
         self._build_plots()
+        if self.multiresolution:
+            self._add_resolution_callback()
         # Show toolbar only on first plot
         self._configure_toolbars()
         # Add range boundary ticks if plotting_range specified
@@ -283,6 +342,151 @@ class BaseComposition(BokehPlot):
                 self.nucleotide_colors
             ).fillna('#666666')
 
+    def _compute_levels(self):
+        """Summarise the data in bins at each resolution level.
+
+        Bins are formed from consecutive positions, empty bins are dropped.
+        Counts of bases are summed, coverage and Q-scores are averaged.
+        Values are stored as float32 so they are embedded as compact typed
+        arrays. Each level is held in a data source shared by all panels.
+        Bases labelled per position are stored as small integer codes (see
+        `_label_spec`), blank in all but the finest level.
+        """
+        pos = self.data[self.position].to_numpy(dtype=float)
+        origin = np.nanmin(pos)
+        self.level_widths = sorted(
+            {1, *(w for w in self.bin_widths if w < len(pos))})
+
+        self.levels = list()
+        for width in self.level_widths:
+            _, idx = np.unique((pos - origin) // width, return_inverse=True)
+            n_bins = idx.max() + 1
+
+            def mean(values, idx=idx, n_bins=n_bins):
+                values = np.asarray(values, dtype=float)
+                valid = ~np.isnan(values)
+                total = np.bincount(
+                    idx[valid], weights=values[valid], minlength=n_bins)
+                count = np.bincount(idx[valid], minlength=n_bins)
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    return total / count
+
+            data = {
+                self.position: mean(pos),
+                '_bar_width': np.full(n_bins, width, dtype=np.float32),
+                '_stack_width': np.full(n_bins, 0.9 * width, dtype=np.float32)}
+            if self.show_coverage:
+                data[self.coverage] = mean(
+                    self.data[self.coverage]).astype(np.float32)
+            if self.has_qscore:
+                data[self.qscore] = mean(self.data[self.qscore]).astype(np.float32)
+            if self.show_composition:
+                counts = np.column_stack([
+                    np.bincount(
+                        idx, minlength=n_bins,
+                        weights=self.data[base].fillna(0).to_numpy(dtype=float))
+                    for base in self.base_columns])
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    props = counts / counts.sum(axis=1, keepdims=True)
+                for i, base in enumerate(self.base_columns):
+                    data[base] = props[:, i].astype(np.float32)
+            for col, (codes, factors) in self._label_codes().items():
+                data[f'_{col}_code'] = np.zeros(n_bins, dtype=codes.dtype)
+                if width == 1:
+                    data[f'_{col}_code'][idx] = codes
+            self.levels.append(ColumnDataSource(data))
+        self.level_source = None
+
+    def _label_codes(self):
+        """Integer codes of the labelled bases, and the bases they stand for.
+
+        :returns: dict of column to tuple of codes (0 being blank) and the
+            list of bases, for the reference and consensus bases labelled.
+        """
+        if not hasattr(self, '_label_cache'):
+            self._label_cache = dict()
+            columns = list()
+            if self.show_composition and self.reference_base in self.data.columns:
+                columns.append(self.reference_base)
+            if (
+                self.has_qscore
+                and self.consensus_base
+                and self.consensus_base in self.data.columns
+            ):
+                columns.append(self.consensus_base)
+            for col in columns:
+                codes, factors = pd.factorize(self.data[col])
+                dtype = np.int8 if len(factors) < 127 else np.int32
+                self._label_cache[col] = (
+                    (codes + 1).astype(dtype), [str(x) for x in factors])
+        return self._label_cache
+
+    def _label_spec(self, col):
+        """Return the label source, text and color of a column of bases.
+
+        With `multiresolution` labels are drawn from the shared level source,
+        from integer codes mapped to bases and colours in the browser, rather
+        than from a separate source of every position and its colour.
+        """
+        color_col = (
+            'reference_color' if col == self.reference_base else 'consensus_color')
+        if not self.multiresolution:
+            source = ColumnDataSource(self.data[[self.position, col, color_col]])
+            return dict(source=source, text=col, text_color=color_col)
+        _, factors = self._label_codes()[col]
+        code = f'_{col}_code'
+        text = CustomJSTransform(
+            args=dict(factors=[''] + factors),
+            v_func="return xs.map((x) => factors[x]);")
+        colors = LinearColorMapper(
+            palette=['#666666'] + [
+                self.nucleotide_colors.get(x, '#666666') for x in factors],
+            low=-0.5, high=len(factors) + 0.5)
+        return dict(
+            source=self._get_level_source(), text=transform(code, text),
+            text_color=transform(code, colors))
+
+    def _resolution_level(self, width):
+        """Index of the finest level showing at most `max_bins` in `width`."""
+        for i, bin_width in enumerate(self.level_widths):
+            if width / bin_width <= self.max_bins:
+                return i
+        return len(self.levels) - 1
+
+    def _get_level_source(self):
+        """Get the data source drawn by all panels, at the initial level."""
+        if self.level_source is None:
+            level = self._resolution_level(
+                self.view_range.end - self.view_range.start)
+            self.level_source = ColumnDataSource(
+                dict(self.levels[level].data), tags=[level])
+        return self.level_source
+
+    def _add_resolution_callback(self):
+        """Swap panel data between levels as the view range changes."""
+        callback = CustomJS(
+            args=dict(
+                x_range=self.view_range,
+                bin_widths=self.level_widths,
+                max_bins=self.max_bins,
+                label_threshold=self.label_threshold,
+                source=self._get_level_source(),
+                # the initial level is embedded once, in the source
+                levels=[
+                    None if i == self.level_source.tags[0] else level
+                    for i, level in enumerate(self.levels)],
+                label_sets=self._label_sets),
+            code=RESOLUTION_CALLBACK)
+        self.view_range.js_on_change('start', callback)
+        self.view_range.js_on_change('end', callback)
+        # there's no range change on first render, the panel data is already
+        # at the initial level but labels need hiding if too many are visible
+        width = self.view_range.end - self.view_range.start
+        for labels in self._label_sets:
+            labels.visible = (
+                self._resolution_level(width) == 0
+                and width <= self.label_threshold)
+
     def _build_plots(self):
         """Build all plot panels."""
         self.plots = []
@@ -347,7 +551,9 @@ class BaseComposition(BokehPlot):
         plot.line(
             x=self.position,
             y=self.coverage,
-            source=self.data,
+            source=(
+                self._get_level_source() if self.multiresolution
+                else self.data),
             line_width=2,
             color=self.color
         )
@@ -395,13 +601,23 @@ class BaseComposition(BokehPlot):
             output_backend="webgl"
         )
 
-        plot.vbar(
-            x=self.position,
-            top=self.qscore,
-            line_color="#FFFFFF",
-            source=self.data[[self.position, self.qscore]],
-            color=self.color
-        )
+        if self.multiresolution:
+            plot.vbar(
+                x=self.position,
+                top=self.qscore,
+                width='_bar_width',
+                line_color="#FFFFFF",
+                source=self._get_level_source(),
+                color=self.color
+            )
+        else:
+            plot.vbar(
+                x=self.position,
+                top=self.qscore,
+                line_color="#FFFFFF",
+                source=self.data[[self.position, self.qscore]],
+                color=self.color
+            )
 
         label_y_position = -7.5
         label_font_size = 12  # approx 1.5 units in plot
@@ -409,19 +625,17 @@ class BaseComposition(BokehPlot):
 
         # Add consensus base labels if available
         if self.consensus_base and self.consensus_base in self.data.columns:
-            plot.add_layout(LabelSet(
+            labels = LabelSet(
                 x=self.position,
                 y=label_y_position,
-                text=self.consensus_base,
-                source=ColumnDataSource(
-                    self.data[[self.position, self.consensus_base, 'consensus_color']]
-                ),
+                **self._label_spec(self.consensus_base),
                 angle=0,
-                text_color="consensus_color",
                 text_align="center",
                 text_font_size=f"{label_font_size}px",
                 text_font_style="bold"
-            ))
+            )
+            plot.add_layout(labels)
+            self._label_sets.append(labels)
 
         # Same q_threshold variable to calculate percentage bases above Q score
         hline = Span(
@@ -446,13 +660,18 @@ class BaseComposition(BokehPlot):
 
     def _create_composition_plot(self):
         """Create stacked bar plot for base composition."""
-        # Calculate proportions
-        base_counts = self.data[self.base_columns]
-        proportions = base_counts.div(base_counts.sum(axis=1), axis=0)
+        if self.multiresolution:
+            vbar_data = self._get_level_source()
+            bar_width = '_stack_width'
+        else:
+            # Calculate proportions
+            base_counts = self.data[self.base_columns]
+            proportions = base_counts.div(base_counts.sum(axis=1), axis=0)
 
-        # Prepare data for stacked bars
-        vbar_data = proportions.to_dict(orient="list")
-        vbar_data[self.position] = self.data[self.position].tolist()
+            # Prepare data for stacked bars
+            vbar_data = proportions.to_dict(orient="list")
+            vbar_data[self.position] = self.data[self.position].tolist()
+            bar_width = 0.9
 
         # Create plot
         plot = figure(
@@ -474,7 +693,7 @@ class BaseComposition(BokehPlot):
             self.base_columns,
             x=self.position,
             color=colors,
-            width=0.9,
+            width=bar_width,
             source=vbar_data,
             legend_label=self.base_columns
         )
@@ -484,19 +703,17 @@ class BaseComposition(BokehPlot):
         y_range_margin = 0.01  # padding to allow space for labels
 
         # Add reference base labels
-        plot.add_layout(LabelSet(
+        labels = LabelSet(
             x=self.position,
             y=label_y_position,
-            text=self.reference_base,
-            source=ColumnDataSource(
-                self.data[[self.position, self.reference_base, 'reference_color']]
-            ),
+            **self._label_spec(self.reference_base),
             angle=0,
-            text_color="reference_color",
             text_align="center",
             text_font_size=f"{label_font_size}px",
             text_font_style="bold"
-        ))
+        )
+        plot.add_layout(labels)
+        self._label_sets.append(labels)
 
         plot.y_range.start = label_y_position - y_range_margin
         plot.y_range.end = 1.1
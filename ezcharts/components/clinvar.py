@@ -10,6 +10,7 @@ from pysam import VariantFile
 
 from ezcharts.components.common import CLINVAR_BASE, NCBI_BASE
 from ezcharts.components.reports.comp import ComponentReport
+from ezcharts.components.switcher import SampleSwitcher
 from ezcharts.layout.base import Snippet
 from ezcharts.layout.snippets import DataTable, Tabs
 from ezcharts.layout.util import isolate_context
@@ -21,7 +22,7 @@ CATEGORICAL = pd_types.CategoricalDtype(ordered=True)
 class ClinVarTable(Snippet):
     """Generate modified bases summary plots."""
 
-    def __init__(self, theme='epi2melabs', **kwargs):
+    def __init__(self, theme='epi2melabs', switcher=False, **kwargs):
         """Create ClinVar data table.
 
         If multiple single-sample VCFs are provided, each will be
@@ -33,6 +34,8 @@ class ClinVarTable(Snippet):
             the report
         :param all_sites: A boolean specifying whether to include the every sites in
             the report
+        :param switcher: rather than a tab per sample, draw one table switched
+            between samples with a selector, see `SampleSwitcher`.
         """
         super().__init__(styles=None, classes=None)
 
@@ -54,11 +57,15 @@ class ClinVarTable(Snippet):
                     # we only got a single sample --> no dropdown
                     DataTable.from_pandas(
                         clinvar_df, export=True, use_index=False)
+                elif switcher:
+                    frames = dict(list(clinvar_df.groupby('Sample')))
+                    with SampleSwitcher(list(frames)) as samples:
+                        samples.add_table(frames, export=True)
                 else:
                     # several samples --> use a dropdown menu
                     tabs = Tabs()
                     with tabs.add_dropdown_menu():
-                        for sample_id, df_sample in clinvar_df.groupby('sample_name'):
+                        for sample_id, df_sample in clinvar_df.groupby('Sample'):
                             with tabs.add_dropdown_tab(sample_id):
                                 DataTable.from_pandas(
                                     df_sample, export=True, use_index=False)
@@ -1,7 +1,10 @@
 """An ezcharts component for common parsers."""
+import numpy as np
 import pandas as pd
 from pandas.api import types as pd_types
 
+from ezcharts import kernels, util
+
 # Categorical types
 CATEGORICAL = pd_types.CategoricalDtype(ordered=True)
 
@@ -38,10 +41,107 @@ CLINVAR_BASE = "https://www.ncbi.nlm.nih.gov/clinvar/variation/"
 NCBI_BASE = "https://www.ncbi.nlm.nih.gov/gene/"
 CLINVAR_DOCS_URL = "https://www.ncbi.nlm.nih.gov/clinvar/docs/clinsig/"
 
+# Columns of the fasta index used by plots
+FAIDX_PLOT_COLUMNS = ["chrom", "length"]
+
+logger = util.get_named_logger("Loaders")
+
+INT32 = np.iinfo(np.int32)
+
+
+def _narrow_int(values):
+    """Return int32 values if the values are within its range.
+
+    Narrower types are not used, as they would overflow in arithmetic far
+    more readily. Products and sums of int32 columns can still overflow,
+    so callers should upcast before such arithmetic, and columns of counts
+    are best left wide (see `compact_frame`).
+    """
+    if values.dtype.itemsize <= 4:
+        return None
+    if values.count() and (values.min() < INT32.min or values.max() > INT32.max):
+        return None
+    if isinstance(values.dtype, pd.api.extensions.ExtensionDtype):
+        return values.astype("Int32")
+    return values.astype(np.int32)
+
+
+def _narrow_float(values):
+    """Return float32 values if they represent the values closely enough.
+
+    Values are narrowed if every value is within 1e-6 relative and 1e-3
+    absolute error of the original, so large coordinates and tiny p-values
+    are left at 64 bits.
+    """
+    values = values.to_numpy()
+    with np.errstate(over='ignore', under='ignore', invalid='ignore'):
+        narrow = values.astype(np.float32)
+        error = np.abs(narrow.astype(np.float64) - values)
+        limit = np.minimum(1e-6 * np.abs(values), 1e-3)
+    finite = np.isfinite(values)
+    if np.any(np.isfinite(narrow) != finite):
+        return None
+    if np.any(error[finite] > limit[finite]):
+        return None
+    return narrow
+
+
+def compact_frame(df, keep=None, name="data", max_unique=0.5, wide=None):
+    """Reduce the memory used by a dataframe.
+
+    Integer columns are narrowed to 32 bits where this holds their values,
+    float columns where this represents their values closely (see
+    `_narrow_float`), and string columns with few distinct values are made
+    categorical. The memory used before and after is logged.
+
+    :param df: dataframe, which is left unchanged.
+    :param keep: columns to keep, other columns being dropped. Columns not
+        in the dataframe are ignored.
+    :param name: name of the data for logging.
+    :param max_unique: string columns with at most this fraction of distinct
+        values are made categorical.
+    :param wide: numeric columns left in their own type, such as counts
+        which are multiplied or summed.
+    :returns: the compacted dataframe.
+    """
+    before = df.memory_usage(deep=True).sum()
+    if keep is not None:
+        df = df[[col for col in df.columns if col in set(keep)]]
+    columns = dict()
+    for col, values in df.items():
+        if col in (wide or ()) and pd_types.is_numeric_dtype(values):
+            continue
+        if pd_types.is_bool_dtype(values) or isinstance(
+                values.dtype, pd.CategoricalDtype):
+            continue
+        if pd_types.is_integer_dtype(values):
+            narrow = _narrow_int(values)
+            if narrow is not None:
+                columns[col] = narrow
+        elif pd_types.is_float_dtype(values) and values.dtype == np.float64:
+            narrow = _narrow_float(values)
+            if narrow is not None:
+                columns[col] = pd.Series(narrow, index=values.index)
+        elif pd_types.is_object_dtype(values) or pd_types.is_string_dtype(values):
+            if len(values) and values.nunique() <= max_unique * len(values):
+                columns[col] = values.astype('category')
+    df = df.assign(**columns) if columns else df.copy()
+    after = df.memory_usage(deep=True).sum()
+    logger.info(
+        f"Loaded {name}: {len(df)} rows, {before / 2**20:.2f} MiB "
+        f"compacted to {after / 2**20:.2f} MiB.")
+    return df
+
 
 # Load faidx
-def fasta_idx(faidx, rename=None):
-    """Read faidx for the reference fasta."""
+def fasta_idx(faidx, rename=None, compact=False):
+    """Read faidx for the reference fasta.
+
+    :param faidx: path to a fasta index.
+    :param rename: dictionary used to rename the sequence IDs.
+    :param compact: narrow dtypes and keep only the columns used by plots,
+        see `compact_frame`.
+    """
     relevant_stats_cols_dtypes = {
         "chrom": CATEGORICAL,
         "length": int,
@@ -61,6 +161,8 @@ def fasta_idx(faidx, rename=None):
             df['chrom'] = df['chrom'].cat.rename_categories(rename)
     except pd.errors.EmptyDataError:
         df = pd.DataFrame(columns=relevant_stats_cols_dtypes)
+    if compact:
+        df = compact_frame(df, keep=FAIDX_PLOT_COLUMNS, name=faidx)
     return df
 
 
@@ -105,71 +207,32 @@ def add_missing_windows(intervals, faidx, value='value', winsize=25000):
         value: float,
     }
     # Ensure it is sorted
-    intervals = intervals.sort_values(['chrom', 'start'])
+    intervals = intervals.sort_values(['chrom', 'start']).reset_index(drop=True)
     # Get unique chromosomes
     chrs = faidx.query(f'length>={winsize}').chrom.unique().tolist()
-    # New intervals
-    final_intervals = []
-    # Add missing windows for each chromosome
+    if not chrs:
+        return pd.DataFrame(columns=intervals.columns).astype(
+            relevant_stats_cols_dtypes)
+    lengths = faidx.groupby('chrom', observed=True)['length'].max()
+    rows = intervals.groupby('chrom', observed=True, sort=False).indices
+    starts = intervals['start'].to_numpy()
+    ends = intervals['end'].to_numpy()
+    # Add leading, intermediate and trailing windows for each chromosome,
+    # recording the row of each existing interval and -1 for new windows
+    chrom, new_starts, new_ends, source = [], [], [], []
     for chr_id in chrs:
-        # Get chromosome entries
-        chr_entry = intervals.loc[intervals['chrom'] == chr_id].reset_index(drop=True)
-        # First window start
-        minval = chr_entry.start.min() if not chr_entry.empty \
-            else faidx[faidx['chrom'] == chr_id].length.max()
-        # Final window end
-        maxval = faidx[faidx['chrom'] == chr_id].length.max()
-        # Chromosome length
-        chr_len = faidx[faidx['chrom'] == chr_id].length.max()
-        # If the minimum value is != 0, add intermediate windows
-        if minval != 0:
-            # Create the breaks for the intervals
-            breaks = make_breaks(0, minval, winsize)
-            # Add leading intervals
-            final_intervals.append(
-                pd.DataFrame(data={
-                    'chrom': chr_id,
-                    'start': breaks[0:-1],
-                    'end': breaks[1:],
-                    value: 0}))
-        # Append precomputed intervals, checking for breaks
-        # in between regions.
-        for idx, region in chr_entry.iterrows():
-            # To DF
-            region = region.to_frame().T
-            # Add the first window as default
-            if idx == 0:
-                final_intervals.append(region)
-                continue
-            # If the new window start is not the end of the previous,
-            # then create new regions
-            if region.start.min() != final_intervals[-1].end.max():
-                # Create intervals
-                breaks = make_breaks(
-                    final_intervals[-1].end.max(),
-                    region.start.min(),
-                    winsize)
-                # Add heading    intervals
-                final_intervals.append(
-                    pd.DataFrame(data={
-                        'chrom': chr_id,
-                        'start': breaks[0:-1],
-                        'end': breaks[1:],
-                        value: 0}))
-            final_intervals.append(region)
-        # If the max value is less than the chromosome length, add these too
-        if maxval < chr_len:
-            # Create the breaks for the intervals
-            breaks = make_breaks(maxval, chr_len, winsize)
-            # Create vectors to populate the DF
-            chr_vec = [chr_id] * (len(breaks) - 1)
-            values = [0] * (len(breaks) - 1)
-            # Add tailing intervals
-            final_intervals.append(
-                pd.DataFrame(data={
-                    'chrom': chr_vec,
-                    'start': breaks[0:-1],
-                    'end': breaks[1:],
-                    value: values}))
-    return pd.concat(final_intervals).astype(
+        chr_rows = rows.get(chr_id, np.array([], dtype=int))
+        chr_starts, chr_ends, chr_source = kernels.fill_windows(
+            starts[chr_rows], ends[chr_rows], lengths[chr_id], winsize)
+        chrom.append(np.full(len(chr_source), chr_id, dtype=object))
+        new_starts.append(chr_starts)
+        new_ends.append(chr_ends)
+        source.append(np.append(chr_rows, -1)[chr_source])
+    source = np.concatenate(source)
+    final_intervals = intervals.reindex(source).reset_index(drop=True)
+    final_intervals['chrom'] = np.concatenate(chrom)
+    final_intervals['start'] = np.concatenate(new_starts)
+    final_intervals['end'] = np.concatenate(new_ends)
+    final_intervals.loc[source < 0, value] = 0
+    return final_intervals.astype(
         relevant_stats_cols_dtypes).reset_index(drop=True)
@@ -9,9 +9,10 @@ import os
 import pandas as pd
 from pandas.api import types as pd_types
 
-from ezcharts.components.common import fasta_idx
+from ezcharts.components.common import compact_frame, fasta_idx
 from ezcharts.components.ezchart import EZChart
 from ezcharts.components.reports.comp import ComponentReport
+from ezcharts.components.switcher import SampleSwitcher
 from ezcharts.layout.base import Snippet
 from ezcharts.layout.snippets import Tabs
 from ezcharts.plots.karyomap import karyomap
@@ -19,11 +20,19 @@ from ezcharts.plots.karyomap import karyomap
 # Categorical types
 CATEGORICAL = pd_types.CategoricalDtype(ordered=True)
 
+# Columns used by plots, kept with `compact=True`
+DML_PLOT_COLUMNS = [
+    "chrom", "pos", "diff", "fdr", "neg_log10_p", "cum_pos", "filename",
+    "sample_name"]
+DMR_PLOT_COLUMNS = [
+    "chrom", "start", "end", "length", "diff.Methy", "areaStat", "mean_pos",
+    "cum_pos", "filename", "sample_name"]
+
 
 class DMSummary(Snippet):
     """Generate differentially modified plots."""
 
-    def __init__(self, theme='epi2melabs', **kwargs):
+    def __init__(self, theme='epi2melabs', switcher=False, **kwargs):
         """Create depth summary componet.
 
         If dml/dmr contains results from multiple samples, each will be
@@ -35,6 +44,8 @@ class DMSummary(Snippet):
             DataFrame
         :param faidx: A path to a fasta fai index or
             DataFrame
+        :param switcher: rather than a tab per sample, draw one plot switched
+            between samples with a selector, see `SampleSwitcher`.
         """
         super().__init__(styles=None, classes=None)
 
@@ -62,17 +73,20 @@ class DMSummary(Snippet):
                 # If one sample, save one plot
                 if len(dml['sample_name'].unique()) == 1:
                     # we only got a single sample --> no dropdown
-                    EZChart(karyomap(
-                        dml, 'chrom', 'pos', 'fdr', ref_lengths=faidx), 'epi2melabs')
+                    EZChart(dml_plot(dml, faidx), 'epi2melabs')
+                elif switcher:
+                    plots = {
+                        sample_id: dml_plot(df_sample, faidx)
+                        for sample_id, df_sample in dml.groupby('sample_name')}
+                    with SampleSwitcher(list(plots)) as samples:
+                        samples.add_chart(plots)
                 else:
                     # several samples --> use a dropdown menu
                     tabs = Tabs()
                     with tabs.add_dropdown_menu():
                         for sample_id, df_sample in dml.groupby('sample_name'):
                             with tabs.add_dropdown_tab(sample_id):
-                                EZChart(karyomap(
-                                    df_sample, 'chrom', 'pos',
-                                    'fdr', ref_lengths=faidx), 'epi2melabs')
+                                EZChart(dml_plot(df_sample, faidx), 'epi2melabs')
             if "dmr" in kwargs:
                 if isinstance(kwargs["dmr"], pd.DataFrame):
                     dmr = kwargs["dmr"]
@@ -89,24 +103,43 @@ class DMSummary(Snippet):
                 # If one sample, save one plot
                 if len(dmr['sample_name'].unique()) == 1:
                     # we only got a single sample --> no dropdown
-                    EZChart(karyomap(
-                        dmr, 'chrom', 'start', 'areaStat',
-                        ref_lengths=faidx, stats='median'),
-                        'epi2melabs')
+                    EZChart(dmr_plot(dmr, faidx), 'epi2melabs')
+                elif switcher:
+                    plots = {
+                        sample_id: dmr_plot(df_sample, faidx)
+                        for sample_id, df_sample in dmr.groupby('sample_name')}
+                    with SampleSwitcher(list(plots)) as samples:
+                        samples.add_chart(plots)
                 else:
                     # several samples --> use a dropdown menu
                     tabs = Tabs()
                     with tabs.add_dropdown_menu():
                         for sample_id, df_sample in dmr.groupby('sample_name'):
                             with tabs.add_dropdown_tab(sample_id):
-                                EZChart(karyomap(
-                                    df_sample, 'chrom',
-                                    'start', 'areaStats',
-                                    ref_lengths=faidx, stats='median'), 'epi2melabs')
+                                EZChart(dmr_plot(df_sample, faidx), 'epi2melabs')
+
+
+def dml_plot(dml, faidx=None):
+    """Plot the FDR of differentially modified loci as a karyotype heatmap.
+
+    :param dml: loci loaded with `load_dml`.
+    :param faidx: fasta index of the reference, from `fasta_idx`.
+    """
+    return karyomap(dml, 'chrom', 'pos', 'fdr', ref_lengths=faidx)
+
+
+def dmr_plot(dmr, faidx=None):
+    """Plot the area statistic of differentially modified regions.
+
+    :param dmr: regions loaded with `load_dmr`.
+    :param faidx: fasta index of the reference, from `fasta_idx`.
+    """
+    return karyomap(
+        dmr, 'chrom', 'start', 'areaStat', ref_lengths=faidx, stats='median')
 
 
 # Load diff. modified sites
-def load_dml(dml, faidx=None, rename=None, order=None):
+def load_dml(dml, faidx=None, rename=None, order=None, compact=False):
     """Load dml file.
 
     Input is either a single directory with all the DSS DML outputs or
@@ -117,6 +150,8 @@ def load_dml(dml, faidx=None, rename=None, order=None):
     - rename: a dictionary used to rename the sequence IDs
     - order: a ordered karyotype (dictionary of "chrom" : int(position), e.g.
     {'chr1': 1, ..., 'chrY': 24})
+    - compact: narrow dtypes and keep only the columns used by plots (see
+    `compact_frame`)
     """
     relevant_stats_cols_dtypes = {
         "chr": CATEGORICAL,
@@ -202,11 +237,14 @@ def load_dml(dml, faidx=None, rename=None, order=None):
         except pd.errors.EmptyDataError:
             cols = relevant_stats_cols_dtypes.update({'filename': str})
             dfs.append(pd.DataFrame(columns=cols))
-    return pd.concat(dfs).reset_index(drop=True)
+    df = pd.concat(dfs).reset_index(drop=True)
+    if compact:
+        df = compact_frame(df, keep=DML_PLOT_COLUMNS, name=dml)
+    return df
 
 
 # Load diff. modified regions
-def load_dmr(dmr, faidx=None, rename=None, order=None):
+def load_dmr(dmr, faidx=None, rename=None, order=None, compact=False):
     """Load dmr file.
 
     Input is either a single directory with all the DSS DMR outputs or
@@ -217,6 +255,8 @@ def load_dmr(dmr, faidx=None, rename=None, order=None):
     - rename: a dictionary used to rename the sequence IDs
     - order: a ordered karyotype (dictionary of "chrom" : int(position), e.g.
     {'chr1': 1, ..., 'chrY': 24})
+    - compact: narrow dtypes and keep only the columns used by plots (see
+    `compact_frame`)
     """
     relevant_stats_cols_dtypes = {
         "chr": CATEGORICAL,
@@ -303,7 +343,10 @@ def load_dmr(dmr, faidx=None, rename=None, order=None):
         except pd.errors.EmptyDataError:
             cols = relevant_stats_cols_dtypes.update({'filename': str})
             dfs.append(pd.DataFrame(columns=cols))
-    return pd.concat(dfs).reset_index(drop=True)
+    df = pd.concat(dfs).reset_index(drop=True)
+    if compact:
+        df = compact_frame(df, keep=DMR_PLOT_COLUMNS, name=dmr)
+    return df
 
 
 def main(args):
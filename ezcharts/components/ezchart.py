@@ -2,13 +2,16 @@
 from abc import ABC, abstractmethod
 import json
 
+from bokeh.core.serialization import Serializer
+from bokeh.models import ColumnDataSource
 from dominate.tags import script
 from dominate.util import raw
 
 from ezcharts.layout.base import Snippet
-from ezcharts.layout.util import render_template
+from ezcharts.layout.islands import narrow_source, pack_plot
+from ezcharts.layout.util import render_element, render_template
 from ezcharts.plots import BokehPlot, Plot
-from ezcharts.plots.util import finalise
+from ezcharts.plots.util import decimate_plot, finalise
 
 
 def EZChart(
@@ -56,6 +59,21 @@ class _ReportChart(ABC, Snippet):
             className=class_name,
             style=style_str)
 
+    def nbytes(self):
+        """Return the size of the chart in a report, in bytes."""
+        return len(render_element(self).encode())
+
+    def reduce(self, factor=2):
+        """Reduce the data drawn by the chart, see `decimate_plot()`.
+
+        :returns: whether the chart was reduced.
+        """
+        return decimate_plot(self.plot, factor)
+
+    @abstractmethod
+    def pack_data(self):
+        """Embed the chart's data compactly, see `ezcharts.layout.islands`."""
+
 
 class _BokehChart(_ReportChart):
     """Wraps a Bokeh plot in a div."""
@@ -78,6 +96,20 @@ class _BokehChart(_ReportChart):
             additional_styles=additional_styles)
         self.plot = plot
 
+    def nbytes(self):
+        """Return the size of the serialised figure, in bytes.
+
+        The figure is serialised into the script that embeds all Bokeh plots
+        in a report, so is measured separately from the placeholder div.
+        """
+        rep = Serializer(deferred=False).encode(self.plot._fig)
+        return super().nbytes() + len(json.dumps(rep, separators=(',', ':')))
+
+    def pack_data(self):
+        """Narrow numeric columns of the figure's data sources to 32 bits."""
+        for source in self.plot._fig.select(type=ColumnDataSource):
+            narrow_source(source)
+
 
 class _EChart(_ReportChart):
     """Wraps an ECharts plot in a div."""
@@ -97,8 +129,36 @@ class _EChart(_ReportChart):
         super().__init__(
             width, height, class_name="echarts-chart-container",
             additional_styles=additional_styles)
+        self.plot = plot
+        self.theme = theme
+        self.width = width
+        self.packed = False
+        self._render_script()
+
+    def reduce(self, factor=2):
+        """Reduce the data drawn by the chart, see `decimate_plot()`."""
+        if not super().reduce(factor):
+            return False
+        self._render_script()
+        return True
+
+    def pack_data(self):
+        """Embed numeric dataset columns as compressed typed-array islands.
+
+        The report must include the `islands_js` resource to decode them.
+        """
+        self.packed = True
+        self._render_script()
 
+    def _render_script(self):
+        """Render the script initialising the chart, and any data islands."""
+        self.clear()
         with self:
+            specs = None
+            if self.packed:
+                options, specs = pack_plot(self.plot, self.uid)
+            else:
+                options = self.plot.to_json()
             script(raw(render_template(
                 """
                 var chart_{{ id }} = echarts.init(
@@ -106,7 +166,12 @@ class _EChart(_ReportChart):
                     theme='{{ t }}',
                     opts={renderer: '{{ c.renderer }}'});
                 var opt_{{ id }} = {{ j | replace('"',"'") | safe }};
+                {% if s %}
+                ezchartsIslands.inflate(opt_{{ id }}, {{ s | safe }}).then(
+                    function(opt){ chart_{{ id }}.setOption(opt); });
+                {% else %}
                 chart_{{ id }}.setOption(opt_{{ id }});
+                {% endif %}
                 {% if w.endswith('%') %}
                     window.addEventListener('resize', function(){
                         chart_{{ id }}.resize();
@@ -114,8 +179,8 @@ class _EChart(_ReportChart):
                 {% endif %}
                 chart_{{ id }}.resize()
                 """,
-                c=plot, j=plot.to_json(), t=theme,
-                w=width, id=self.uid)))
+                c=self.plot, j=options, s=specs, t=self.theme,
+                w=self.width, id=self.uid)))
 
 
 class EZChartTheme(script):
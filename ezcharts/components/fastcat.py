@@ -2,19 +2,26 @@
 import argparse
 import copy
 from importlib.resources import files
+import json
 import os
+import tempfile
 
 from bokeh.models import Title
+from dominate.tags import option, select
 import numpy as np
 import pandas as pd
 import sigfig
 
 import ezcharts as ezc
+from ezcharts.components.common import compact_frame
 from ezcharts.components.ezchart import EZChart
 from ezcharts.components.reports.comp import ComponentReport
+from ezcharts.components.switcher import SampleSwitcher
 from ezcharts.layout.base import Snippet
+from ezcharts.layout.resource import overlay_js
 from ezcharts.layout.snippets import DataTable, Grid, Tabs
 from ezcharts.plots import BokehPlot, util
+from ezcharts.plots._kde import fft_kde
 from ezcharts.plots.util import empty_plot
 
 
@@ -70,6 +77,10 @@ BAMSTATS_FLAGSTAT_COLS_DTYPES = {
 
 TIMES = ["start_time"]
 
+# Per-read columns used by plots, loaded by default with `compact=True`
+FASTCAT_PLOT_COLUMNS = ["sample_name", "read_length", "mean_quality"]
+BAMSTATS_PLOT_COLUMNS = FASTCAT_PLOT_COLUMNS + ["acc", "coverage"]
+
 
 def _intersect_columns(base, requested=None):
     # Take one of the dtype dictionaries and intersect with a list
@@ -115,12 +126,14 @@ class SeqSummary(Snippet):
         # [CW-5562]
         # Set an initial quantile x-axis max in the length plot so that long
         # read outliers are not visible. If None, all data is shown.
-        read_length_quantile_xend=None
+        read_length_quantile_xend=None,
+        switcher=False,
     ):
         """Create sequence summary component.
 
-        :param seq_summary: a path to a fastcat/bamstats read stats output file
-            or dataframe (or a tuple of such).
+        :param seq_summary: a path to a fastcat/bamstats read stats output file,
+            dataframe or `SampleSummary` (or a tuple of such), or a
+            `LiveSummary` of all samples.
         :param flagstat: a path to a bamstats flagstat output file or dataframe
             (or tuple of such).
         :sample_names: tuple of sample names. Required when other input arguments
@@ -133,6 +146,9 @@ class SeqSummary(Snippet):
         :param read_length_plot_binwidth: int bin widths for read length plot.
         :param read_length_quantile_xend: float quantile range end for x-axis length
          plot
+        :param switcher: for several samples, draw one set of plots and tables
+            switched between samples with a selector (see `SampleSwitcher`),
+            rather than a set for each sample in its own tab.
 
         """
         super().__init__(styles=None, classes=None)
@@ -144,14 +160,21 @@ class SeqSummary(Snippet):
         # we need at least seq_summary or histograms
         if seq_summary is None:
             raise ValueError("One of `seq_summary` must be provided.")
+        if isinstance(seq_summary, LiveSummary):
+            sample_names = tuple(sorted(seq_summary.samples))
+            seq_summary = tuple(seq_summary.samples[name] for name in sample_names)
+            if len(seq_summary) == 1:
+                seq_summary, = seq_summary
+                sample_names = None
         if not (
             isinstance(seq_summary, pd.DataFrame)
             or isinstance(seq_summary, str)
             or isinstance(seq_summary, tuple)
+            or isinstance(seq_summary, SampleSummary)
         ):
             raise ValueError(
                 "`seq_summary` must be a path to a fastcat/bamstats read stats output "
-                "file or dataframe (or a tuple of such)."
+                "file, dataframe or summary (or a tuple of such)."
             )
 
         # check sample_names is a tuple if files are provided in tuples.
@@ -171,6 +194,10 @@ class SeqSummary(Snippet):
             raise ValueError(
                 "`sample_names` must have the same length as `flagstat`.")
         with self:
+            if isinstance(seq_summary, tuple) and switcher:
+                self._draw_switcher(
+                    sample_names, seq_summary, flagstat, height, alignment_stats)
+                return
             if isinstance(seq_summary, tuple):
                 # several samples => use a dropdown
                 tabs = Tabs()
@@ -215,7 +242,15 @@ class SeqSummary(Snippet):
         # data is either a summary file, a dataframe (of a summary file),
         # or a directory (of histogram files).
         adata, cdata, qdata, ldata = None, None, None, None
-        if isinstance(data, pd.DataFrame):
+        if isinstance(data, SampleSummary):
+            empty = pd.DataFrame(columns=["start", "end", "count"])
+            ldata = data.histogram("length")
+            qdata = data.histogram("quality")
+            ldata = empty if ldata is None else ldata
+            qdata = empty if qdata is None else qdata
+            adata = data.histogram("accuracy")
+            cdata = data.histogram("coverage")
+        elif isinstance(data, pd.DataFrame):
             qdata, ldata = data, data
             adata = data if 'acc' in data.columns else None
             cdata = data if 'coverage' in data.columns else None
@@ -252,6 +287,48 @@ class SeqSummary(Snippet):
                     raise ValueError("Could not load input data.")
         return ldata, qdata, adata, cdata
 
+    def _summary_plots(self, ldata, qdata):
+        """Create quality, read length and yield plots.
+
+        :param ldata: pd.DataFrame containing length values.
+        :param qdata: pd.DataFrame containing quality values.
+        :returns: list of the three plots, empty plots where there is no data.
+        """
+        plots = [
+            read_quality_plot(qdata, color=self.color)
+            if not qdata.empty else empty_plot()]
+        if not ldata.empty:
+            len_args = {}
+            if self.read_length_quantile_xend:
+                len_args['quantile_limits'] = True
+                len_args['xlim'] = (0, self.read_length_quantile_xend)
+            plots.append(read_length_plot(
+                ldata, color=self.color,
+                binwidth=self.read_length_plot_binwidth, **len_args))
+            plots.append(base_yield_plot(ldata, color=self.color))
+        else:
+            plots += [empty_plot(), empty_plot()]
+        return plots
+
+    def _alignment_plots(self, adata, cdata):
+        """Create accuracy and coverage plots.
+
+        :param adata: pd.DataFrame containing accuracy values.
+        :param cdata: pd.DataFrame containing coverage values.
+        :returns: list of the two plots, None where there is no data.
+        """
+        plots = list()
+        for data, plot_function in (
+                (adata, mapping_accuracy_plot), (cdata, read_coverage_plot)):
+            plot = None
+            if data is not None:
+                try:
+                    plot = plot_function(data, color=self.color)
+                except Exception:
+                    pass
+            plots.append(plot)
+        return plots
+
     def _draw_summary_plots(
         self,
         ldata,
@@ -266,31 +343,8 @@ class SeqSummary(Snippet):
         :param height: height of the plot
         """
         with Grid(columns=3):
-            if not qdata.empty:
-                EZChart(
-                    read_quality_plot(qdata, color=self.color),
-                    self.theme,
-                    height=height,
-                )
-            else:
-                EZChart(empty_plot())
-            if not ldata.empty:
-                len_args = {}
-                if self.read_length_quantile_xend:
-                    len_args['quantile_limits'] = True
-                    len_args['xlim'] = (0, self.read_length_quantile_xend)
-                EZChart(
-                    read_length_plot(
-                        ldata, color=self.color,
-                        binwidth=self.read_length_plot_binwidth, **len_args),
-                    self.theme,
-                    height=height,
-                )
-                EZChart(
-                    base_yield_plot(ldata, color=self.color), self.theme, height=height)
-            else:
-                EZChart(empty_plot())
-                EZChart(empty_plot())
+            for plot in self._summary_plots(ldata, qdata):
+                EZChart(plot, self.theme, height=height)
 
     def _draw_alignment_plots(
         self,
@@ -305,20 +359,47 @@ class SeqSummary(Snippet):
         """
         if adata is not None or cdata is not None:
             with Grid(columns=2):
-                if adata is not None:
-                    try:
-                        EZChart(
-                            mapping_accuracy_plot(adata, color=self.color),
-                            self.theme, height=height)
-                    except Exception:
-                        pass
-                if cdata is not None:
-                    try:
-                        EZChart(
-                            read_coverage_plot(cdata, color=self.color),
-                            self.theme, height=height)
-                    except Exception:
-                        pass
+                for plot in self._alignment_plots(adata, cdata):
+                    if plot is not None:
+                        EZChart(plot, self.theme, height=height)
+
+    def _draw_switcher(
+            self, sample_names, seq_summary, flagstat, height, alignment_stats):
+        """Draw one set of plots and tables, switched between samples.
+
+        :param sample_names: tuple of sample names.
+        :param seq_summary: tuple of the data of each sample.
+        :param flagstat: tuple of the flagstats of each sample, a single
+            flagstat or None.
+        """
+        names = sorted(sample_names)
+        plots, aligned = dict(), dict()
+        for sample_name, data in zip(sample_names, seq_summary):
+            ldata, qdata, adata, cdata = self._load_summary_data(data)
+            plots[sample_name] = self._summary_plots(ldata, qdata)
+            if alignment_stats and (adata is not None or cdata is not None):
+                aligned[sample_name] = self._alignment_plots(adata, cdata)
+        samples = SampleSwitcher(names)
+        with samples:
+            with Grid(columns=3):
+                for i in range(3):
+                    samples.add_chart(
+                        {k: v[i] for k, v in plots.items()}, self.theme,
+                        height=height)
+            if aligned:
+                with Grid(columns=2):
+                    for i in range(2):
+                        if any(v[i] is not None for v in aligned.values()):
+                            samples.add_chart(
+                                {k: v[i] for k, v in aligned.items()},
+                                self.theme, height=height)
+            if isinstance(flagstat, tuple):
+                samples.add_table({
+                    k: v if isinstance(v, pd.DataFrame)
+                    else load_bamstats_flagstat(v)
+                    for k, v in zip(sample_names, flagstat)})
+        if flagstat is not None and not isinstance(flagstat, tuple):
+            self._draw_bamstat_table(flagstat)
 
     def _draw_bamstat_table(self, data):
         if not isinstance(data, pd.DataFrame):
@@ -338,21 +419,28 @@ class SeqCompare(Snippet):
         color=None,
         height="500px",
         alignment_stats=True,
+        single_figure=False,
     ):
         """Create sequence summary component.
 
-        :param seq_summary: a path to a fastcat/bamstats read stats output file
-            or dataframe (or a tuple of such).
+        :param seq_summary: a path to a fastcat/bamstats read stats output file,
+            dataframe or `SampleSummary` (or a tuple of such), or a
+            `LiveSummary` of all samples.
         :param flagstat: a path to a bamstats flagstat output file or dataframe
             (or tuple of such).
         :sample_names: tuple of sample names. Required when other input arguments
             are tuples.
         :param theme: String defining the visual theme for the plots.
+        :param single_figure: draw all samples on one figure per metric, with
+            a selector to show a single sample, rather than a figure per
+            sample and metric. The size of the report then grows with the
+            data of the samples alone, not with the number of figures.
         """
         super().__init__(styles=None, classes=None)
         self.theme = theme
         self.color = color
         self.alignment_stats = alignment_stats
+        self.single_figure = single_figure
         self.metrics = [
             'length',
             'yield',
@@ -378,14 +466,18 @@ class SeqCompare(Snippet):
         # we need at least seq_summary or histograms
         if seq_summary is None:
             raise ValueError("One of `seq_summary` must be provided.")
+        if isinstance(seq_summary, LiveSummary):
+            sample_names = tuple(sorted(seq_summary.samples))
+            seq_summary = tuple(seq_summary.samples[name] for name in sample_names)
         if not (
             isinstance(seq_summary, pd.DataFrame)
             or isinstance(seq_summary, str)
             or isinstance(seq_summary, tuple)
+            or isinstance(seq_summary, SampleSummary)
         ):
             raise ValueError(
                 "`seq_summary` must be a path to a fastcat/bamstats read stats output "
-                "file or dataframe (or a tuple of such)."
+                "file, dataframe or summary (or a tuple of such)."
             )
 
         # check sample_names is a tuple if files are provided in tuples.
@@ -412,7 +504,7 @@ class SeqCompare(Snippet):
             else:
                 # single sample
                 self._compare_summary_plots(
-                    tuple('Sample'), tuple(seq_summary), height=height)
+                    ('Sample',), (seq_summary,), height=height)
 
             # same again for flagstat
             if flagstat is not None:
@@ -459,6 +551,12 @@ class SeqCompare(Snippet):
                     else:
                         all_plots[metric] += [None]
             for (sample, data) in zip(samples, datasets):
+                if isinstance(data, SampleSummary):
+                    self._histogram_plots(
+                        all_plots, data.histogram("length"),
+                        data.histogram("quality"), data.histogram("accuracy"),
+                        data.histogram("coverage"))
+                    continue
                 try:
                     df = load_stats(data)
                     for (metric, col, plot_function) in zip(
@@ -487,40 +585,21 @@ class SeqCompare(Snippet):
                         ))
                     except Exception:
                         qdata, ldata
-                    if not ldata.empty:
-                        all_plots["length"] += [
-                            read_length_plot(ldata, color=self.color)
-                        ]
-                        all_plots["yield"] += [base_yield_plot(ldata, color=self.color)]
-                    else:
-                        all_plots["length"] += [empty_plot()]
-                        all_plots["yield"] += [empty_plot()]
-                    if not qdata.empty:
-                        all_plots["quality"] += [
-                            read_quality_plot(qdata, color=self.color)
-                        ]
-                    else:
-                        all_plots["quality"] += [empty_plot()]
-                    # Try loading BAMstats-specific hists and add their plots, if needed
-                    if self.alignment_stats:
-                        try:
-                            all_plots['accuracy'] += [
-                                mapping_accuracy_plot(
-                                    load_histogram(data, "accuracy"),
-                                    color=self.color
-                                )
-                            ]
-                        except Exception:
-                            all_plots['accuracy'] += [None]
-                        try:
-                            all_plots['coverage'] += [
-                                read_coverage_plot(
-                                    load_histogram(data, "coverage"),
-                                    color=self.color
-                                )
-                            ]
-                        except Exception:
-                            all_plots['coverage'] += [None]
+                    # Try loading BAMstats-specific hists
+                    adata, cdata = None, None
+                    try:
+                        adata = load_histogram(data, "accuracy")
+                    except Exception:
+                        pass
+                    try:
+                        cdata = load_histogram(data, "coverage")
+                    except Exception:
+                        pass
+                    self._histogram_plots(all_plots, ldata, qdata, adata, cdata)
+
+        if self.single_figure:
+            self._overlay_summary_plots(samples, all_plots, height)
+            return
 
         # Create tabs
         tabs = Tabs()
@@ -535,6 +614,66 @@ class SeqCompare(Snippet):
                     for plot in plots:
                         EZChart(plot, self.theme, height=height)
 
+    def _overlay_summary_plots(self, samples, all_plots, height):
+        """Draw the plots of all samples for each metric on a single figure.
+
+        :param samples: sample names.
+        :param all_plots: dict of lists of plots by metric, in sample order.
+        :param height: height of the figures.
+        """
+        figures = dict()
+        for metric in self.metrics:
+            pairs = sorted(
+                ((p, s) for p, s in zip(all_plots[metric], samples)
+                 if not self._is_empty_plot(p)),
+                key=lambda x: x[1])
+            if pairs:
+                plot = util.overlay_plots(*zip(*pairs), column="sample")
+                plot._fig.name = f"{self.uid}_{metric}"
+                figures[metric] = plot
+        if not figures:
+            return
+        overlay_js.require()
+        with select(
+            cls="form-select mb-3", id=f"{self.uid}_sample", aria_label="Sample",
+            data_figures=json.dumps([x._fig.name for x in figures.values()]),
+            onchange="ezchartsSelectLabel(this)"
+        ):
+            option("All samples", value="")
+            for sample in sorted(samples):
+                option(sample, value=str(sample))
+        tabs = Tabs()
+        for metric, plot in figures.items():
+            with tabs.add_tab(metric):
+                EZChart(plot, self.theme, height=height)
+
+    def _histogram_plots(self, all_plots, ldata, qdata, adata, cdata):
+        """Add the plots of a sample's histograms.
+
+        :param all_plots: dict of lists of plots by metric, to extend.
+        :param ldata: length histogram.
+        :param qdata: quality histogram.
+        :param adata: accuracy histogram, or None.
+        :param cdata: coverage histogram, or None.
+        """
+        if ldata is not None and not ldata.empty:
+            all_plots["length"] += [read_length_plot(ldata, color=self.color)]
+            all_plots["yield"] += [base_yield_plot(ldata, color=self.color)]
+        else:
+            all_plots["length"] += [empty_plot()]
+            all_plots["yield"] += [empty_plot()]
+        if qdata is not None and not qdata.empty:
+            all_plots["quality"] += [read_quality_plot(qdata, color=self.color)]
+        else:
+            all_plots["quality"] += [empty_plot()]
+        # add BAMstats-specific plots, if needed
+        if self.alignment_stats:
+            for metric, data, plot_function in (
+                    ("accuracy", adata, mapping_accuracy_plot),
+                    ("coverage", cdata, read_coverage_plot)):
+                all_plots[metric] += [
+                    None if data is None else plot_function(data, color=self.color)]
+
     def _is_empty_plot(self, plot):
         """Check if the plot is empty."""
         if not plot:
@@ -552,32 +691,16 @@ class SeqCompare(Snippet):
 
     def _coordinate_plots(self, plots, labels=None):
         """Coordinate the axes between the plots."""
-        max_by_plot = []
-        for plot in plots:
-            if not self._is_empty_plot(plot):
-                if isinstance(plot, BokehPlot):
-                    dimensions = plot._fig.renderers[0].data_source.to_df()
-                    if 'top' in dimensions.columns:
-                        col = 'top'
-                    else:
-                        col = 'y'
-                    y_val = dimensions[col].max()
-                else:
-                    dimensions = np.array(plot.dataset[0].dimensions)
-                    if 'y' in dimensions:
-                        y_col = np.where(dimensions == 'y')[0]
-                    else:
-                        y_col = np.where(dimensions == 'height')[0]
-                    y_val = np.max(plot.dataset[0].source, axis=0)[y_col]
-                max_by_plot.append(y_val)
-        # Set new values
+        # share the y-axis maximum, using the extents recorded by the plots
+        util.link_axes(
+            [plot for plot in plots if not self._is_empty_plot(plot)], axis="y")
+        # Set titles
         if labels:
             inputs = zip(plots, labels)
         else:
             inputs = zip(plots, [None] * len(plots))
         for (plot, label) in inputs:
             if not self._is_empty_plot(plot):
-                plot._fig.y_range.end = max(max_by_plot)
                 if label:
                     plot._fig.add_layout(
                         Title(text=label, text_font_size="1.5em"), 'above')
@@ -611,8 +734,10 @@ def base_yield_plot(data, color=None):
         # TODO: this assumes even bins
         thinning = 100
         length = data["start"]
+        # in 64 bits, as (compact) histograms may hold narrower types
         cumsum = np.cumsum(
-            data["start"][::-1].to_numpy() * data["count"][::-1].to_numpy()
+            data["start"][::-1].to_numpy(dtype=np.int64)
+            * data["count"][::-1].to_numpy(dtype=np.int64)
         )[::-1]
 
     mid = cumsum[0] / 2
@@ -637,6 +762,24 @@ def base_yield_plot(data, color=None):
     return plt
 
 
+def _sketch_histplot(sketch, edges, scale=1, color=None):
+    """Draw a histogram of the values of a `QuantileSketch`.
+
+    The counts of the sketch's buckets are spread over the bins (see
+    `QuantileSketch.histogram`), rather than each placed in the bin of a
+    single representative value, which leaves gaps and spikes in bins
+    narrower than the buckets.
+
+    :param sketch: `QuantileSketch` of the values.
+    :param edges: bin edges, in the units of the plot.
+    :param scale: units of the values per unit of the plot.
+    """
+    counts = sketch.histogram(np.asarray(edges) * scale)
+    return ezc.histplot(
+        data=(edges[:-1] + edges[1:]) / 2, weights=counts, bins=edges,
+        color=color)
+
+
 @ezc.plots.util.plot_wrapper
 def histogram_plot(
     data, col="count", binwidth=None, min_val=None,
@@ -645,14 +788,24 @@ def histogram_plot(
 ):
     """Create histogram summary plot.
 
-    :param data: fastcat/bamstats summary data or read-length histogram data.
+    :param data: fastcat/bamstats summary data, histogram data or a
+        `QuantileSketch` of the values.
     :param binwidth: width of each bin.
     :param min_val: the minimum value to plot.
     :param max_val: the maximum value to plot.
     :param title: title of the plot.
     """
     plt, mean_val, median_val = None, None, None
-    if "read_length" in data.columns:
+    if isinstance(data, util.QuantileSketch):
+        if min_val is None:
+            min_val = data.min
+        if max_val is None:
+            max_val = data.max + binwidth
+        mean_val = np.round(data.mean(), 1)
+        median_val = data.median()
+        plt = _sketch_histplot(
+            data, np.arange(min_val, max_val + binwidth, binwidth), color=color)
+    elif "read_length" in data.columns:
         # When min_val==0, "if not min_val" evaluates to True.
         # Instead use "if min_val is None"
         if min_val is None:
@@ -772,7 +925,8 @@ def read_length_plot(
 ):
     """Create a read length plot.
 
-    :param seq_summary: pd.DataFrame containing per-sequence summary information.
+    :param seq_summary: pd.DataFrame containing per-sequence summary information,
+        histogram data or a `QuantileSketch` of read lengths.
     :param xlim: viewable read length limits.
     :param quantile_limits: if True, xlim is interpreted as quantiles of the data rather
         than absolute values.
@@ -789,7 +943,21 @@ def read_length_plot(
     if min_len is None:
         min_len = 0
     # create data to plot depending on input type.
-    if "read_length" in data.columns:
+    if isinstance(data, util.QuantileSketch):
+        # approximate quantiles, and bucketed values in place of reads
+        mean_length = np.round(data.mean(), 1)
+        median_length = int(data.median())
+        max_ = int(data.max)
+        min_ = int(data.min)
+        read_lengths, _ = data.values()
+
+        if max_len is None:
+            max_len = 1 if quantile_limits else data.max
+
+        if quantile_limits:
+            min_len, max_len = data.quantile([min_len, max_len])
+            xlim = (min_len, max_len)
+    elif "read_length" in data.columns:
         # fastcat/bamstats
         mean_length = np.round(data.read_length.mean(), 1)
         median_length = int(data.read_length.median())
@@ -835,14 +1003,22 @@ def read_length_plot(
     if binwidth is not None:
         binwidth /= 1000
 
-    read_lengths = read_lengths / 1000
-    plt = ezc.histplot(
-        read_lengths,
-        bins=bins,
-        binwidth=binwidth,
-        weights=weights,
-        color=color
-    )
+    if isinstance(data, util.QuantileSketch):
+        # bins over the range of the data, as `histplot` would choose
+        if binwidth is not None:
+            edges = np.arange(min_ / 1000, max_ / 1000 + binwidth, binwidth)
+        else:
+            edges = np.linspace(min_ / 1000, max_ / 1000, bins + 1)
+        plt = _sketch_histplot(data, edges, scale=1000, color=color)
+    else:
+        read_lengths = read_lengths / 1000
+        plt = ezc.histplot(
+            read_lengths,
+            bins=bins,
+            binwidth=binwidth,
+            weights=weights,
+            color=color
+        )
     # customize the plot
     plt._fig.xaxis.axis_label = "Read length / kb"
     plt._fig.yaxis.axis_label = "Number of reads"
@@ -873,14 +1049,18 @@ def sum_hists(hists):
         .sum().reset_index()
 
 
-def load_fastcat(fpath, target_cols=None):
+def load_fastcat(fpath, target_cols=None, compact=False):
     """Load and prepare fastcat per-read stats.
 
     :param fpath: path to a fastcat stats file.
     :target_cols: columns to be loaded in the dataframe.
+    :param compact: narrow dtypes (see `compact_frame`) and, unless
+        `target_cols` is given, load only the columns used by plots.
 
     :returns: a dataframe
     """
+    if compact and target_cols is None:
+        target_cols = FASTCAT_PLOT_COLUMNS
     cols, time_cols = _intersect_columns(copy.copy(FASTCAT_COLS_DTYPES), target_cols)
     try:
         df = pd.read_csv(
@@ -889,17 +1069,23 @@ def load_fastcat(fpath, target_cols=None):
     except pd.errors.EmptyDataError:
         raise Exception(f"Empty input: {fpath}")
     df = _localize_time(df)
+    if compact:
+        df = compact_frame(df, name=fpath)
     return df
 
 
-def load_bamstats(fpath, target_cols=None):
+def load_bamstats(fpath, target_cols=None, compact=False):
     """Load and prepare bamstats per-read stats.
 
     :param fpath: path to a bamstats stats file.
     :target_cols: columns to be loaded in the dataframe.
+    :param compact: narrow dtypes (see `compact_frame`) and, unless
+        `target_cols` is given, load only the columns used by plots.
 
     :returns: a dataframe
     """
+    if compact and target_cols is None:
+        target_cols = BAMSTATS_PLOT_COLUMNS
     cols, time_cols = _intersect_columns(copy.copy(BAMSTATS_COLS_DTYPES), target_cols)
     try:
         df = pd.read_csv(
@@ -910,13 +1096,17 @@ def load_bamstats(fpath, target_cols=None):
     df = _localize_time(df)
     # to be consistent with fastcat
     df.rename(columns={"name": "read_id"}, inplace=True)
+    if compact:
+        df = compact_frame(df, name=fpath)
     return df
 
 
-def load_bamstats_flagstat(fpath):
+def load_bamstats_flagstat(fpath, compact=False):
     """Load and prepare bamstats flagstat output.
 
     :param fpath: path to a bamstats flagstat file.
+    :param compact: narrow dtypes (see `compact_frame`), leaving the counts
+        64-bit.
 
     :returns: a dataframe
     """
@@ -930,14 +1120,21 @@ def load_bamstats_flagstat(fpath):
     except pd.errors.EmptyDataError:
         raise Exception(f"Empty input: {fpath}")
     df["status"] = df["ref"].apply(lambda x: "Unmapped" if x == "*" else "Mapped")
+    if compact:
+        df = compact_frame(
+            df, name=fpath, wide=[
+                col for col, dtype in BAMSTATS_FLAGSTAT_COLS_DTYPES.items()
+                if dtype is int])
     return df
 
 
-def load_histogram(hist_dir, dtype="quality"):
+def load_histogram(hist_dir, dtype="quality", compact=False):
     """Load fastcat/bamstats histograms.
 
     :param hist_dir: pathname to input directory.
     :param dtype: histogram datatype to load.
+    :param compact: narrow dtypes (see `compact_frame`), leaving the counts
+        64-bit.
     """
     allowed = {
         "quality",
@@ -959,10 +1156,13 @@ def load_histogram(hist_dir, dtype="quality"):
         names=["start", "end", "count"],
         dtype={"start": dt, "end": dt, "count": int},
     )
+    if compact:
+        hist = compact_frame(
+            hist, name=os.path.join(hist_dir, f"{dtype}.hist"), wide=["count"])
     return hist
 
 
-def load_stats(fpath, target_cols=None):
+def load_stats(fpath, target_cols=None, compact=False):
     """Load and prepare fastcat or bamstats per-read stats.
 
     This function is intended to be used when the caller does not know (and care)
@@ -970,19 +1170,21 @@ def load_stats(fpath, target_cols=None):
 
     :params fpath: path to a fastcat or bamstats stats file.
     :param target_cols: list of columns to read from file.
+    :param compact: narrow dtypes, see `compact_frame`.
 
     :returns: a dataframe
     """
     target_cols_fastcat, target_cols_bamstats = target_cols, target_cols
     if target_cols is None:
-        target_cols_fastcat = ["sample_name", "read_length", "mean_quality"]
-        target_cols_bamstats = [
-            "sample_name", "read_length", "mean_quality", "acc", "coverage"]
+        target_cols_fastcat = FASTCAT_PLOT_COLUMNS
+        target_cols_bamstats = BAMSTATS_PLOT_COLUMNS
     df = None
     try:
-        df = load_bamstats(fpath, target_cols=target_cols_bamstats)
+        df = load_bamstats(
+            fpath, target_cols=target_cols_bamstats, compact=compact)
     except ValueError:
-        df = load_fastcat(fpath, target_cols=target_cols_fastcat)
+        df = load_fastcat(
+            fpath, target_cols=target_cols_fastcat, compact=compact)
     return df
 
 
@@ -1000,6 +1202,354 @@ def histogram_median(hist, x="start", y="count"):
     return hist[x][pos]
 
 
+def histogram_kde(hist, **kwargs):
+    """Estimate a density from histogram data.
+
+    Values are taken to lie at the midpoints of their bins and the bin
+    counts as frequencies, so the estimate approximates that of the values
+    themselves.
+
+    :param hist: pd.DataFrame with columns [start, end, count].
+    :param kwargs: passed to `ezcharts.plots._kde.fft_kde`.
+    :returns: tuple of density and support arrays.
+    """
+    midpoints = (hist["start"].to_numpy() + hist["end"].to_numpy()) / 2
+    return fft_kde(
+        midpoints, hist["count"].to_numpy(), frequency_weights=True, **kwargs)
+
+
+# bin widths of summary histograms; these are those of fastcat and bamstats
+# histograms, except for accuracy which is reduced to the precision of the
+# per-read stats
+HISTOGRAM_BINWIDTHS = {
+    "length": 1,
+    "quality": 0.02,
+    "accuracy": 0.01,
+    "coverage": 0.01,
+}
+# per-read stats column of each histogram
+HISTOGRAM_COLUMNS = {
+    "length": "read_length",
+    "quality": "mean_quality",
+    "accuracy": "acc",
+    "coverage": "coverage",
+}
+
+
+class SampleSummary:
+    """Histograms of the read statistics of a sample, with read and base totals.
+
+    Histograms are held sparsely as counts of integer bin indices, with the
+    bin widths of `HISTOGRAM_BINWIDTHS`, so that reads and fastcat/bamstats
+    histograms can be added to a summary as they are produced and the plots
+    drawn from the summary at any time. Histograms with finer bins are
+    rebinned. Base totals are exact, being sums of integer read lengths, and
+    the yield curve and N50 follow exactly from the length histogram.
+    Quantile sketches of each metric give quantiles of the unbinned values.
+
+    Summaries are merged by adding their counts, which is associative, so
+    summaries of chunks of a run can be made where the data is and reduced
+    before reporting. They are saved as JSON or compressed npz files.
+    """
+
+    def __init__(self):
+        """Initialize an empty summary."""
+        self.reads = 0
+        self.bases = 0
+        # metric -> (bin indices, counts)
+        self.histograms = dict()
+        # metric -> QuantileSketch
+        self.sketches = dict()
+
+    @classmethod
+    def from_dataframe(cls, data):
+        """Create a summary of per-read statistics, see `add_reads`."""
+        return cls().add_reads(data)
+
+    @classmethod
+    def from_file(cls, path):
+        """Create a summary of a per-read stats file or histograms, see `add`."""
+        return cls().add(path)
+
+    def _sketch(self, metric):
+        """Return the quantile sketch of a metric."""
+        return self.sketches.setdefault(metric, util.QuantileSketch())
+
+    def _add_bins(self, metric, bins, counts):
+        """Add counts of bins to a histogram."""
+        old_bins, old_counts = self.histograms.get(
+            metric, (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)))
+        bins, inverse = np.unique(
+            np.concatenate([old_bins, bins]), return_inverse=True)
+        counts = np.bincount(
+            inverse, weights=np.concatenate([old_counts, counts]),
+            minlength=len(bins)).astype(np.int64)
+        self.histograms[metric] = (bins, counts)
+
+    @staticmethod
+    def _bin(metric, values):
+        """Return the bin index of values."""
+        # round to absorb error in values written at the bin precision
+        scaled = np.asarray(values, dtype=float) / HISTOGRAM_BINWIDTHS[metric]
+        scaled = np.round(scaled, 6)
+        return np.floor(scaled).astype(np.int64)
+
+    def add_reads(self, data):
+        """Add per-read statistics.
+
+        :param data: pd.DataFrame of fastcat/bamstats per-read stats, as given
+            by `load_stats`.
+        :returns: the summary.
+        """
+        for metric, col in HISTOGRAM_COLUMNS.items():
+            if col not in data.columns:
+                continue
+            values = data[col].dropna().to_numpy()
+            self._add_bins(
+                metric, self._bin(metric, values), np.ones(len(values), dtype=np.int64))
+            self._sketch(metric).update(values)
+        if "read_length" in data.columns:
+            self.reads += len(data)
+            self.bases += int(data["read_length"].sum())
+        return self
+
+    def add_histogram(self, metric, hist):
+        """Add a fastcat/bamstats histogram.
+
+        :param metric: histogram metric, a key of `HISTOGRAM_BINWIDTHS`.
+        :param hist: pd.DataFrame with columns [start, end, count].
+        :returns: the summary.
+        """
+        self._add_bins(
+            metric, self._bin(metric, hist["start"]),
+            hist["count"].to_numpy(dtype=np.int64))
+        self._sketch(metric).update(hist["start"], hist["count"])
+        if metric == "length":
+            self.reads += int(hist["count"].sum())
+            self.bases += int(np.dot(
+                hist["start"].to_numpy(dtype=np.int64),
+                hist["count"].to_numpy(dtype=np.int64)))
+        return self
+
+    def add_histograms(self, hist_dir):
+        """Add a directory of fastcat/bamstats histograms.
+
+        :param hist_dir: directory of histograms, see `load_histogram`.
+        :returns: the summary.
+        """
+        self.add_histogram("quality", load_histogram(hist_dir, "quality"))
+        self.add_histogram("length", load_histogram(hist_dir, "length"))
+        for dtype in ("quality.unmap", "length.unmap", "accuracy", "coverage"):
+            if os.path.exists(os.path.join(hist_dir, f"{dtype}.hist")):
+                self.add_histogram(
+                    dtype.split(".")[0], load_histogram(hist_dir, dtype))
+        return self
+
+    def add(self, path):
+        """Add a per-read stats file or a directory of histograms.
+
+        :param path: path to a fastcat/bamstats per-read stats file or a
+            directory of histograms.
+        :returns: the summary.
+        """
+        if os.path.isdir(path):
+            return self.add_histograms(path)
+        return self.add_reads(load_stats(path))
+
+    def histogram(self, metric):
+        """Return a histogram as a frame, as given by `load_histogram`.
+
+        :param metric: histogram metric, a key of `HISTOGRAM_BINWIDTHS`.
+        :returns: pd.DataFrame with columns [start, end, count], or None if
+            the summary has no data for the metric.
+        """
+        if metric not in self.histograms:
+            return None
+        bins, counts = self.histograms[metric]
+        width = HISTOGRAM_BINWIDTHS[metric]
+        start, end = bins * width, (bins + 1) * width
+        if metric == "length":
+            start, end = start.astype(int), end.astype(int)
+        else:
+            start, end = start.round(10), end.round(10)
+        return pd.DataFrame(dict(start=start, end=end, count=counts))
+
+    def quantile(self, metric, q):
+        """Return approximate quantiles of a metric.
+
+        :param metric: histogram metric, a key of `HISTOGRAM_BINWIDTHS`.
+        :param q: quantile or array of quantiles, between 0 and 1.
+        """
+        if metric not in self.sketches:
+            return util.QuantileSketch().quantile(q)
+        return self.sketches[metric].quantile(q)
+
+    def merge(self, other):
+        """Add the counts of another summary to this one.
+
+        :param other: a `SampleSummary`.
+        :returns: the summary.
+        """
+        self.reads += other.reads
+        self.bases += other.bases
+        for metric, (bins, counts) in other.histograms.items():
+            self._add_bins(metric, bins, counts)
+        for metric, sketch in other.sketches.items():
+            self._sketch(metric).merge(sketch)
+        return self
+
+    def __add__(self, other):
+        """Return the merge of two summaries."""
+        return copy.deepcopy(self).merge(other)
+
+    def to_dict(self):
+        """Return the summary as a JSON serialisable dictionary."""
+        return dict(
+            reads=self.reads, bases=self.bases,
+            histograms={
+                metric: dict(bins=bins.tolist(), counts=counts.tolist())
+                for metric, (bins, counts) in self.histograms.items()},
+            sketches={
+                metric: sketch.to_dict()
+                for metric, sketch in self.sketches.items()})
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create a summary from the output of `to_dict`."""
+        summary = cls()
+        summary.reads = int(data["reads"])
+        summary.bases = int(data["bases"])
+        for metric, hist in data["histograms"].items():
+            summary.histograms[metric] = (
+                np.asarray(hist["bins"], dtype=np.int64),
+                np.asarray(hist["counts"], dtype=np.int64))
+        for metric, sketch in data.get("sketches", {}).items():
+            summary.sketches[metric] = util.QuantileSketch.from_dict(sketch)
+        return summary
+
+    def save(self, path):
+        """Write the summary to a file.
+
+        :param path: path of a `.npz` file, written as compressed arrays, or
+            of any other file, written as JSON.
+        """
+        if str(path).endswith(".npz"):
+            arrays = dict()
+
+            def flatten(data, prefix):
+                for key, value in data.items():
+                    if isinstance(value, dict):
+                        flatten(value, f"{prefix}{key}/")
+                    else:
+                        arrays[f"{prefix}{key}"] = np.asarray(value)
+
+            flatten(self.to_dict(), "")
+            np.savez_compressed(path, **arrays)
+        else:
+            with open(path, "w") as fh:
+                json.dump(self.to_dict(), fh)
+
+    @classmethod
+    def load(cls, path):
+        """Read a summary written by `save`."""
+        if not str(path).endswith(".npz"):
+            with open(path) as fh:
+                return cls.from_dict(json.load(fh))
+        data = dict()
+        with np.load(path) as arrays:
+            for name in arrays.files:
+                *parents, key = name.split("/")
+                node = data
+                for parent in parents:
+                    node = node.setdefault(parent, dict())
+                value = arrays[name]
+                node[key] = value.item() if value.ndim == 0 else value
+        data.setdefault("histograms", dict())
+        return cls.from_dict(data)
+
+
+class LiveSummary:
+    """Sample summaries of a run in progress, persisted between report builds.
+
+    The state file records the summary of each sample and the files that
+    have been added to it, so that each update reads only new files and the
+    cost of refreshing a report depends on the new data rather than on the
+    length of the run. Files are identified by path: a file which has
+    changed since it was added cannot be folded in again, and the state
+    should be rebuilt.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path):
+        """Load the state file, or start a new state if it does not exist.
+
+        :param path: path to the state file.
+        """
+        self.path = path
+        self.samples = dict()
+        self.files = dict()
+        if os.path.exists(path):
+            with open(path) as fh:
+                state = json.load(fh)
+            if state.get("version") != self.VERSION:
+                raise ValueError(f"Unsupported live summary state: {path}.")
+            self.samples = {
+                name: SampleSummary.from_dict(sample)
+                for name, sample in state["samples"].items()}
+            self.files = state["files"]
+
+    @staticmethod
+    def _signature(path):
+        """Return the total size and latest modification time of a path."""
+        paths = [path]
+        if os.path.isdir(path):
+            paths = [entry.path for entry in os.scandir(path) if entry.is_file()]
+        stats = [os.stat(p) for p in paths]
+        return [
+            sum(stat.st_size for stat in stats),
+            max((stat.st_mtime_ns for stat in stats), default=0)]
+
+    def update(self, sample_name, paths):
+        """Add the files of a sample which have not been added before.
+
+        :param sample_name: name of the sample.
+        :param paths: path, or iterable of paths, to fastcat/bamstats per-read
+            stats files or directories of histograms.
+        :returns: list of the paths that were added.
+        """
+        if isinstance(paths, (str, os.PathLike)):
+            paths = [paths]
+        summary = self.samples.setdefault(sample_name, SampleSummary())
+        seen = self.files.setdefault(sample_name, dict())
+        added = list()
+        for path in map(str, paths):
+            signature = self._signature(path)
+            if path in seen:
+                if seen[path] != signature:
+                    raise ValueError(
+                        f"{path} has changed since it was added to the live "
+                        "summary; remove the state file to rebuild it.")
+                continue
+            summary.add(path)
+            seen[path] = signature
+            added.append(path)
+        return added
+
+    def save(self):
+        """Write the state file, replacing it atomically."""
+        state = dict(
+            version=self.VERSION,
+            samples={
+                name: sample.to_dict() for name, sample in self.samples.items()},
+            files=self.files)
+        directory = os.path.dirname(os.path.abspath(self.path))
+        with tempfile.NamedTemporaryFile(
+                "w", dir=directory, suffix=".tmp", delete=False) as fh:
+            json.dump(state, fh)
+        os.replace(fh.name, self.path)
+
+
 def main(args):
     """Entry point to demonstrate a sequence summary component."""
     comp_title = "Sequence Summary"
@@ -1017,8 +1567,27 @@ def main(args):
     sample = tuple(args.sample) \
         if isinstance(args.sample, list) \
         else args.sample
+    if args.live_state is not None:
+        # fold new files into the state and plot from it
+        live = LiveSummary(args.live_state)
+        names = sample if isinstance(sample, tuple) else (sample,)
+        paths = seq_summary if isinstance(seq_summary, list) else [seq_summary]
+        if len(names) == 1:
+            live.update(names[0], paths)
+        else:
+            for name, path in zip(names, paths):
+                live.update(name, path)
+        live.save()
+        seq_summary, sample = live, None
     # Create summary
-    if args.by == 'sample':
+    if args.live_state is not None:
+        seq_sum = SeqSummary(
+            seq_summary,
+            flagstat=bam_flagstat,
+            alignment_stats=False if args.skip_alignment_stats else True,
+            color=args.color,
+        )
+    elif args.by == 'sample':
         seq_sum = SeqSummary(
             tuple(seq_summary),
             flagstat=bam_flagstat,
@@ -1033,6 +1602,7 @@ def main(args):
             sample_names=sample,
             alignment_stats=False if args.skip_alignment_stats else True,
             color=args.color,
+            single_figure=args.single_figure,
         )
 
     # Write report
@@ -1078,6 +1648,13 @@ def argparser():
         help="Read statistics TSV from bamstats.",
         nargs='+'
     )
+    parser.add_argument(
+        "--single_figure",
+        action="store_true",
+        help=(
+            "With `--by metric`, draw all samples on one figure per metric, "
+            "with a sample selector.")
+    )
     parser.add_argument(
         "--skip_alignment_stats",
         action="store_true",
@@ -1087,6 +1664,12 @@ def argparser():
         "--color",
         help="Plot color."
     )
+    parser.add_argument(
+        "--live_state",
+        help=(
+            "State file of a live run. Only inputs not seen by previous runs "
+            "are read, and the report is drawn from the accumulated state.")
+    )
     parser.add_argument(
         "--output", default="seq_summary_report.html", help="Output HTML file."
     )
@@ -6,9 +6,10 @@ import os
 import pandas as pd
 from pandas.api import types as pd_types
 
-from ezcharts.components.common import fasta_idx, MOD_CONVERT
+from ezcharts.components.common import compact_frame, fasta_idx, MOD_CONVERT
 from ezcharts.components.ezchart import EZChart
 from ezcharts.components.reports.comp import ComponentReport
+from ezcharts.components.switcher import SampleSwitcher
 from ezcharts.layout.base import Snippet
 from ezcharts.layout.snippets import DataTable, Tabs
 from ezcharts.plots.karyomap import karyomap
@@ -16,11 +17,16 @@ from ezcharts.plots.karyomap import karyomap
 # Categorical types
 CATEGORICAL = pd_types.CategoricalDtype(ordered=True)
 
+# bedMethyl columns used by plots, kept with `compact=True`
+BEDMETHYL_PLOT_COLUMNS = [
+    "chrom", "start", "end", "mod", "score", "strand", "Nvalid", "fraction",
+    "total_mean_pos", "filename", "sample_name"]
+
 
 class MKSummary(Snippet):
     """Generate modified bases summary plots."""
 
-    def __init__(self, theme='epi2melabs', **kwargs):
+    def __init__(self, theme='epi2melabs', switcher=False, **kwargs):
         """Create depth summary componet.
 
         If dml/dmr contains results from multiple samples, each will be
@@ -32,6 +38,8 @@ class MKSummary(Snippet):
             DataFrame
         :param faidx: A path to a fasta fai index or
             DataFrame
+        :param switcher: rather than a tab per sample, draw one table and plot
+            switched between samples with a selector, see `SampleSwitcher`.
         """
         super().__init__(styles=None, classes=None)
 
@@ -61,6 +69,10 @@ class MKSummary(Snippet):
                 if len(summary['sample_name'].unique()) == 1:
                     # we only got a single sample --> no dropdown
                     DataTable.from_pandas(summary, use_index=False)
+                elif switcher:
+                    frames = dict(list(summary.groupby('sample_name')))
+                    with SampleSwitcher(list(frames)) as samples:
+                        samples.add_table(frames)
                 else:
                     # several samples --> use a dropdown menu
                     tabs = Tabs()
@@ -86,26 +98,42 @@ class MKSummary(Snippet):
                 # If one sample, save one plot
                 if len(bedmethyl['sample_name'].unique()) == 1:
                     # we only got a single sample --> no dropdown
-                    EZChart(karyomap(
-                        bedmethyl, 'chrom', 'start',
-                        'score', ref_lengths=faidx), 'epi2melabs')
+                    EZChart(bedmethyl_plot(bedmethyl, faidx), 'epi2melabs')
+                elif switcher:
+                    plots = {
+                        sample_id: bedmethyl_plot(df_sample, faidx)
+                        for sample_id, df_sample in bedmethyl.groupby('sample_name')}
+                    with SampleSwitcher(list(plots)) as samples:
+                        samples.add_chart(plots)
                 else:
                     # several samples --> use a dropdown menu
                     tabs = Tabs()
                     with tabs.add_dropdown_menu():
                         for sample_id, df_sample in bedmethyl.groupby('sample_name'):
                             with tabs.add_dropdown_tab(sample_id):
-                                EZChart(karyomap(
-                                    df_sample, 'chrom',
-                                    'pos', 'fdr', ref_lengths=faidx), 'epi2melabs')
+                                EZChart(
+                                    bedmethyl_plot(df_sample, faidx), 'epi2melabs')
+
+
+def bedmethyl_plot(bedmethyl, faidx=None):
+    """Plot the modification score along the genome as a karyotype heatmap.
+
+    :param bedmethyl: sites loaded with `load_bedmethyl`.
+    :param faidx: fasta index of the reference, from `fasta_idx`.
+    """
+    return karyomap(bedmethyl, 'chrom', 'start', 'score', ref_lengths=faidx)
 
 
 # Load mod bedMethyl file
-def load_modkit_summary(summary_dir):
+def load_modkit_summary(summary_dir, compact=False):
     """Load bedmethyl file.
 
     Input is either a single directory with all the modkit summaries or
     a single modkit summary file.
+
+    Optional inputs can be:
+    - compact: narrow dtypes (see `compact_frame`). All columns are shown in
+    the summary table, so are kept.
     """
     # Col names
     relevant_stats_cols_dtypes = {
@@ -176,10 +204,13 @@ def load_modkit_summary(summary_dir):
         except pd.errors.EmptyDataError:
             cols = relevant_stats_cols_dtypes.update({'filename': str})
             dfs.append(pd.DataFrame(columns=cols))
-    return pd.concat(dfs).reset_index(drop=True)
+    df = pd.concat(dfs).reset_index(drop=True)
+    if compact:
+        df = compact_frame(df, name=summary_dir)
+    return df
 
 
-def load_bedmethyl(bedmethyl_input, faidx=None, split_all=False):
+def load_bedmethyl(bedmethyl_input, faidx=None, split_all=False, compact=False):
     """Load modkit bedmethyl file.
 
     Input is either a single directory with all the modkit bedmethyls or
@@ -187,6 +218,8 @@ def load_bedmethyl(bedmethyl_input, faidx=None, split_all=False):
 
     Optional inputs can be:
     - faidx: A faidx dataframe with 'chrom' 'length' cols (add missing intervals)
+    - compact: narrow dtypes and keep only the columns used by plots (see
+    `compact_frame`)
     """
     # Col names
     long_cols_dtypes = {
@@ -293,7 +326,10 @@ def load_bedmethyl(bedmethyl_input, faidx=None, split_all=False):
             else:
                 cols = short_cols_dtypes.update({'filename': str})
             dfs.append(pd.DataFrame(columns=cols))
-    return pd.concat(dfs).reset_index(drop=True)
+    df = pd.concat(dfs).reset_index(drop=True)
+    if compact:
+        df = compact_frame(df, keep=BEDMETHYL_PLOT_COLUMNS, name=bedmethyl_input)
+    return df
 
 
 def main(args):
@@ -6,9 +6,11 @@ import os
 import pandas as pd
 from pandas.api import types as pd_types
 
-from ezcharts.components.common import add_missing_windows, fasta_idx
+from ezcharts.components.common import (
+    add_missing_windows, compact_frame, fasta_idx)
 from ezcharts.components.ezchart import EZChart
 from ezcharts.components.reports.comp import ComponentReport
+from ezcharts.components.switcher import SampleSwitcher
 from ezcharts.layout.base import Snippet
 from ezcharts.layout.snippets import DataTable, Tabs
 from ezcharts.plots.relational import lineplot
@@ -16,11 +18,15 @@ from ezcharts.plots.relational import lineplot
 # Categorical types
 CATEGORICAL = pd_types.CategoricalDtype(ordered=True)
 
+# Region columns used by plots, kept with `compact=True`
+REGIONS_PLOT_COLUMNS = [
+    "chrom", "start", "end", "depth", "total_mean_pos", "filename", "sample_name"]
+
 
 class DepthSummary(Snippet):
     """Generate modified bases summary plots."""
 
-    def __init__(self, theme='epi2melabs', **kwargs):
+    def __init__(self, theme='epi2melabs', switcher=False, **kwargs):
         """Create depth summary componet.
 
         If dml/dmr contains results from multiple samples, each will be
@@ -32,6 +38,8 @@ class DepthSummary(Snippet):
             DataFrame
         :param faidx: A path to a fasta fai index or
             DataFrame
+        :param switcher: rather than a tab per sample, draw one table and plot
+            switched between samples with a selector, see `SampleSwitcher`.
         """
         super().__init__(styles=None, classes=None)
 
@@ -46,7 +54,8 @@ class DepthSummary(Snippet):
 
             # Make modkit summary table
             if "mosdepth_summary" in kwargs:
-                if isinstance(kwargs["mosdepth_summary"], pd.DataFrame):
+                # as returned by `load_mosdepth_summary`
+                if isinstance(kwargs["mosdepth_summary"], tuple):
                     summary = kwargs["mosdepth_summary"]
                 else:
                     summary = load_mosdepth_summary(kwargs["mosdepth_summary"])
@@ -63,6 +72,10 @@ class DepthSummary(Snippet):
                 if len(summary[0]['sample_name'].unique()) == 1:
                     # we only got a single sample --> no dropdown
                     DataTable.from_pandas(summary[0], use_index=False)
+                elif switcher:
+                    frames = dict(list(summary[0].groupby('sample_name')))
+                    with SampleSwitcher(list(frames)) as samples:
+                        samples.add_table(frames)
                 else:
                     # several samples --> use a dropdown menu
                     tabs = Tabs()
@@ -90,33 +103,35 @@ class DepthSummary(Snippet):
                 # If one sample, save one plot
                 if len(bed['sample_name'].unique()) == 1:
                     # we only got a single sample --> no dropdown
-                    plt = lineplot(
-                        data=bed, x='total_mean_pos',
-                        y='depth', hue='chrom')
-                    # Remove markers
-                    for s in plt.series:
-                        s.showSymbol = False
-                    EZChart(plt, 'epi2melabs')
+                    EZChart(depth_plot(bed), 'epi2melabs')
+                elif switcher:
+                    plots = {
+                        sample_id: depth_plot(df_sample)
+                        for sample_id, df_sample in bed.groupby('sample_name')}
+                    with SampleSwitcher(list(plots)) as samples:
+                        samples.add_chart(plots)
                 else:
                     # several samples --> use a dropdown menu
                     tabs = Tabs()
                     with tabs.add_dropdown_menu():
                         for sample_id, df_sample in bed.groupby('sample_name'):
                             with tabs.add_dropdown_tab(sample_id):
-                                # we only got a single sample --> no dropdown
-                                plt = lineplot(
-                                    data=df_sample, x='total_mean_pos',
-                                    y='depth', hue='chrom')
-                                # Remove markers
-                                for s in plt.series:
-                                    s.showSymbol = False
-                                EZChart(plt, 'epi2melabs')
+                                EZChart(depth_plot(df_sample), 'epi2melabs')
+
+
+def depth_plot(bed):
+    """Plot depth along the genome, with a line for each chromosome.
+
+    :param bed: regions loaded with `load_mosdepth_regions`.
+    """
+    return lineplot(
+        data=bed, x='total_mean_pos', y='depth', hue='chrom', marker=False)
 
 
 # Load region mosdepth output file
 def load_mosdepth_regions(
         mosdepth, faidx=None, subset=None,
-        karyo=None, winsize=25000, min_size=0):
+        karyo=None, winsize=25000, min_size=0, compact=False):
     """Load mosdepth results into dataframe.
 
     Input is either a single directory with all the mosdepth outputs or
@@ -128,6 +143,8 @@ def load_mosdepth_regions(
     - karyo: A ordered karyotype (dictionary of "chrom" : int(position), e.g.
     {'chr1': 1, ..., 'chrY': 24})
     - subset: A subset of sequences to use as a list
+    - compact: narrow dtypes and keep only the columns used by plots (see
+    `compact_frame`)
     """
     relevant_stats_cols_dtypes = {
         "chrom": CATEGORICAL,
@@ -221,11 +238,20 @@ def load_mosdepth_regions(
             cols = relevant_stats_cols_dtypes.update({'filename': str})
             dfs.append(pd.DataFrame(columns=cols)) \
                 .astype({"chrom": CATEGORICAL})
-    return pd.concat(dfs).reset_index(drop=True)
+    df = pd.concat(dfs).reset_index(drop=True)
+    if compact:
+        df = compact_frame(df, keep=REGIONS_PLOT_COLUMNS, name=mosdepth)
+    return df
+
 
+def load_mosdepth_summary(summary, compact=False):
+    """Load mosdepth results into dataframe.
 
-def load_mosdepth_summary(summary):
-    """Load mosdepth results into dataframe."""
+    :param summary: a mosdepth summary file, or a directory of such files.
+    :param compact: narrow dtypes, see `compact_frame`. All columns are
+        shown in the summary table, so are kept.
+    :returns: tuple of dataframes of the total and region statistics.
+    """
     relevant_stats_cols_dtypes = {
         "chrom": CATEGORICAL,
         "length": int,
@@ -276,9 +302,12 @@ def load_mosdepth_summary(summary):
             cols = relevant_stats_cols_dtypes.update({'filename': str})
             dfs_tot.append(pd.DataFrame(columns=cols))
             dfs_reg.append(pd.DataFrame(columns=cols))
-    return (
+    dfs = (
         pd.concat(dfs_tot).reset_index(drop=True),
         pd.concat(dfs_reg).reset_index(drop=True))
+    if compact:
+        dfs = tuple(compact_frame(df, name=summary) for df in dfs)
+    return dfs
 
 
 def main(args):
@@ -6,7 +6,6 @@ from dominate.tags import script
 from dominate.util import raw
 
 from ezcharts.components.reports.comp import ComponentReport
-from ezcharts.components.theme import LAB_head_resources
 from ezcharts.layout.base import Snippet
 from ezcharts.layout.resource import ScriptResource
 from ezcharts.layout.util import inline, render_template
@@ -30,6 +29,8 @@ class NextClade(Snippet):
             data = fh.read()
 
         with self:
+            # the nextclade web component, once per report
+            NXTComponent.require()
             script(raw(render_template(
                 template=(
                     """
@@ -50,9 +51,7 @@ NXTComponent = ScriptResource(
 def main(args):
     """Entry point to create a report from nextclade."""
     nxt = NextClade(args.json)
-    report = ComponentReport(
-        'Nextclade', nxt,
-        head_resources=[*LAB_head_resources, NXTComponent])
+    report = ComponentReport('Nextclade', nxt)
     report.write(args.output)
 
 
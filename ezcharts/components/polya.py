@@ -8,6 +8,7 @@ import pysam
 from scipy import stats
 
 import ezcharts as ezc
+from ezcharts import kernels
 
 
 def _get_percent(num, den):
@@ -15,13 +16,19 @@ def _get_percent(num, den):
     return (num / den) * 100 if den != 0 else 0
 
 
+def _length_histogram(lengths, binwidth=1, min_val=0, max_val=0):
+    """Return the bin edges and counts of a histogram of lengths."""
+    lengths = np.asarray(lengths)
+    if len(lengths) > 0:
+        min_val = int(lengths.min())
+        max_val = int(lengths.max())
+    bins = np.arange(min_val, max_val + binwidth + 1, binwidth)
+    return bins, kernels.histogram(lengths, bins)
+
+
 def _generate_histogram_data(lengths, binwidth=1, min_val=0, max_val=0):
     """Generate histogram data."""
-    if len(lengths) > 0:
-        min_val = int(min(lengths))
-        max_val = int(max(lengths))
-    values, bins = np.histogram(
-        lengths, bins=range(min_val, max_val + binwidth + 1, binwidth))
+    bins, values = _length_histogram(lengths, binwidth, min_val, max_val)
     return list(map(list, zip(bins, values)))
 
 
@@ -324,8 +331,18 @@ def _calculate_polya_statistics(lengths, lower_bound, upper_bound):
     in_bounds = lengths[(lengths >= lower_bound) & (lengths <= upper_bound)]
     with_polya = lengths[lengths >= lower_bound]
     mean = lengths.mean()
-    median = np.median(lengths)
-    mode = float(lengths.mode().iloc[0]) if not lengths.mode().empty else 0
+    bins, counts = _length_histogram(lengths)
+    if pd.api.types.is_integer_dtype(lengths):
+        # unit bins hold every value, so read the median and mode from them
+        cumulative = np.cumsum(counts)
+        lo, hi = np.searchsorted(
+            cumulative, [(len(lengths) - 1) // 2, len(lengths) // 2],
+            side='right')
+        median = (bins[lo] + bins[hi]) / 2
+        mode = float(bins[np.argmax(counts)])
+    else:
+        median = np.median(lengths)
+        mode = float(lengths.mode().iloc[0]) if not lengths.mode().empty else 0
 
     # Only calculate CI, std and kurtosis when we have more than one read
     # and not all values are zero
@@ -342,7 +359,7 @@ def _calculate_polya_statistics(lengths, lower_bound, upper_bound):
             kurtosis = None
 
     return {
-        'histogram': _generate_histogram_data(lengths),
+        'histogram': list(map(list, zip(bins, counts))),
         'percent_in_bounds': _get_percent(len(in_bounds), len(lengths)),
         'total_area': lengths.sum(),
         'area_with': with_polya.sum(),
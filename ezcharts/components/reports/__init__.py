@@ -1,22 +1,37 @@
 """Re-usable report components."""
+import hashlib
+import json
+import os
 from typing import List, Type
+from urllib.parse import urlparse
 
+from bokeh.document import Document
 from bokeh.embed import components
-from dominate.tags import body, footer, head, header, main, style, title
+from dominate.tags import (
+    body, footer, head, header, link, main, script, style, title)
 from dominate.util import raw
 
-from ezcharts.components.ezchart import _BokehChart
+import ezcharts
+from ezcharts import util
+from ezcharts.components.ezchart import _BokehChart, _EChart, _ReportChart
 from ezcharts.layout.base import Snippet
 from ezcharts.layout.resource import (
-    base_body_resources, base_head_resources, Resource)
+    base_body_resources, base_head_resources, islands_js, Resource)
 from ezcharts.layout.snippets.document import DefaultBody, DefaultHead
-from ezcharts.layout.util import write_report
+from ezcharts.layout.snippets.section import Section
+from ezcharts.layout.snippets.table import DataTable
+from ezcharts.layout.util import (
+    render_element, render_elements, rendered, write_asset, write_report)
+
+# rows kept by tables truncated to meet a report's size budget
+TABLE_PREVIEW_ROWS = 100
 
 
 class Report(Snippet):
     """A basic report."""
 
     TAG: str = 'html'
+    logger = util.get_named_logger("Report")
 
     def __init__(
         self,
@@ -24,9 +39,18 @@ class Report(Snippet):
         head_tag: Type[head] = DefaultHead,
         body_tag: Type[body] = DefaultBody,
         head_resources: List[Resource] = base_head_resources,
-        body_resources: List[Resource] = base_body_resources
+        body_resources: List[Resource] = base_body_resources,
+        deterministic_ids: bool = False
     ) -> None:
-        """Create tag."""
+        """Create tag.
+
+        :param deterministic_ids: number the IDs of snippets created within the
+            report (i.e. within its `with` contexts) rather than generating
+            random IDs, such that building the same report twice gives identical
+            HTML (excepting Bokeh plots).
+        """
+        if deterministic_ids:
+            self.uid_counters = dict()
         super().__init__(
             styles=None,
             classes=None)
@@ -37,29 +61,93 @@ class Report(Snippet):
             # Enables scroll spy globals for us!
             self.body = body_tag()
 
+        # resources with the elements they rendered, for `size_breakdown()`
+        self.resources = list()
+        # resources required by components, see `register_resource()`
+        self.registered_resources = dict()
         with self.head:
             title(report_title)
             for resource in head_resources:
-                resource()
+                self.resources.append((resource, resource()))
 
         with self.body:
             self.header = header()
             self.main = main()
             self.footer = footer()
             for resource in body_resources:
-                resource()
+                self.resources.append((resource, resource()))
+        # sizes of the components of the report, recorded by `write()`
+        self.sizes = None
+
+    def write(
+            self, path, cache_dir=None, threads=1, max_bytes=None, sizes=False,
+            pack_data=False, assets_dir=None, assets_url=None):
+        """Write a report to file.
+
+        :param path: output file.
+        :param cache_dir: directory in which to cache the rendered HTML of
+            sections created with a `cache_key`. Sections found in the cache
+            are not rendered again, use this with `deterministic_ids`.
+        :param threads: number of processes in which to render the outermost
+            sections of the report, where these are independent and large
+            (e.g. many tables) rendering in parallel is faster.
+        :param max_bytes: size budget for the report. Where the report would
+            be larger, the largest charts and tables are reduced in turn until
+            it fits: charts thin or re-bin their data (see
+            `ezcharts.plots.util.decimate_plot`) and tables are truncated to a
+            preview of `TABLE_PREVIEW_ROWS` rows.
+        :param sizes: record the size of each chart, table and resource in
+            `self.sizes` and log the largest. This is implied by `max_bytes`.
+        :param pack_data: embed the numeric data of eCharts datasets as
+            compressed typed arrays, decoded by the browser, rather than as
+            JSON, and narrow numeric columns of Bokeh plots to 32 bits (see
+            `ezcharts.layout.islands`). Float data is stored to single
+            precision. Charts in cached sections are not packed.
+        :param assets_dir: directory in which to write the report's scripts
+            and stylesheets (e.g. eCharts, BokehJS and the theme CSS) as
+            separate files, under names including a hash of their content,
+            rather than inlining them. The report refers to them with
+            `<script src>` and `<link>` tags, so many reports can share one
+            copy which browsers cache. Assets served over HTTP(S) are loaded
+            with subresource integrity and `crossorigin="anonymous"`. Assets
+            referred to by a relative path or a file:// URL are linked without
+            these, as browsers treat each local file as a distinct origin and
+            would block the CORS request an integrity check requires when the
+            report is opened from disk.
+        :param assets_url: URL (or path) of the directory of assets, used in
+            place of the path of `assets_dir` relative to the report. If given
+            without `assets_dir` no assets are written, they are expected to
+            have been written already (e.g. with another report).
+        """
+        self._emit_registered_resources()
+
+        if cache_dir is not None:
+            self.render_cached_sections(cache_dir)
+
+        if pack_data:
+            charts = self.get_charts()
+            for chart in charts:
+                chart.pack_data()
+            if any(isinstance(chart, _EChart) for chart in charts):
+                with self.head:
+                    self.resources.append((islands_js, islands_js()))
+
+        if assets_dir is not None or assets_url is not None:
+            if assets_url is None:
+                assets_url = os.path.relpath(
+                    assets_dir, os.path.dirname(os.path.abspath(path)))
+                assets_url = assets_url.replace(os.sep, '/')
+            self._externalise_resources(assets_dir, assets_url)
+
+        if max_bytes is not None or sizes:
+            breakdown = self.size_breakdown()
+            if max_bytes is not None:
+                self._fit_budget(breakdown, max_bytes)
 
-    def write(self, path):
-        """Write a report to file."""
         # check if the report contains `Bokeh` plots
         bokeh_charts = self.get_bokeh_charts()
         if bokeh_charts:
-            # get the script + divs for all the plots; then place the div in the
-            # corresponding `_BokehChart` div
-            bokeh_script, bokeh_divs = components([x.plot._fig for x in bokeh_charts])
-            for chart, bokeh_div in zip(bokeh_charts, bokeh_divs):
-                with chart:
-                    raw(bokeh_div)
+            bokeh_script = self._embed_bokeh_charts(bokeh_charts)
             # add the script to the header
             with self.head:
                 # make sure the plots fill out the enclosing div
@@ -73,19 +161,253 @@ class Report(Snippet):
                 )
                 raw(bokeh_script)
 
+        if threads > 1:
+            sections = self.get_sections()
+            for section, html in zip(sections, render_elements(sections, threads)):
+                self._replace(section, html)
+
         write_report(path, self)
 
-    def get_bokeh_charts(self):
-        """Return all children of the report that are of type `_BokehChart`."""
-        bokeh_charts = []
+        if max_bytes is not None or sizes:
+            self.sizes = [
+                dict(kind=kind, name=name, bytes=nbytes)
+                for kind, name, nbytes, _ in breakdown]
+            self._log_sizes(os.path.getsize(path))
+
+    def register_resource(self, resource):
+        """Register a resource to be included once in the head of the report.
+
+        Components call `Resource.require()` rather than this directly.
+
+        :param resource: a `Resource`.
+        """
+        self.registered_resources.setdefault(resource.key, resource)
+
+    def _emit_registered_resources(self):
+        """Add registered resources to the head, skipping duplicate content."""
+        # resources required by elements built before they joined the report,
+        # which rendered them in place
+        stack = [self]
+        while stack:
+            element = stack.pop()
+            for resource, inlined in getattr(element, 'required_resources', ()):
+                self.register_resource(resource)
+                if inlined.parent is not None:
+                    inlined.parent.remove(inlined)
+            stack.extend(getattr(element, 'children', ()))
+        seen = {
+            hashlib.sha256(render_element(element).encode()).digest()
+            for _, element in self.resources if element is not None}
+        for resource in self.registered_resources.values():
+            element = resource()
+            digest = hashlib.sha256(render_element(element).encode()).digest()
+            if digest in seen:
+                continue
+            seen.add(digest)
+            self.head.add(element)
+            self.resources.append((resource, element))
+        self.registered_resources.clear()
+
+    def _externalise_resources(self, assets_dir, assets_url):
+        """Replace inlined scripts and stylesheets with links to asset files.
+
+        :param assets_dir: directory in which to write the assets, or None.
+        :param assets_url: URL of the directory of assets. Subresource
+            integrity is added only for HTTP(S) URLs.
+        """
+        remote = urlparse(assets_url).scheme in ('http', 'https')
+        for i, (resource, element) in enumerate(self.resources):
+            # subclasses (e.g. chart themes) hold data rather than code
+            if type(element) not in (script, style) or element.parent is None:
+                continue
+            content = ''.join(child.render() for child in element.children)
+            name = os.path.basename(resource.path or resource.func.__name__)
+            name = os.path.splitext(name)[0] + (
+                '.js' if type(element) is script else '.css')
+            fname, integrity = write_asset(content, name, assets_dir)
+            url = f"{assets_url.rstrip('/')}/{fname}"
+            # integrity checks need CORS, which local files do not permit
+            attrs = dict()
+            if remote:
+                attrs = dict(integrity=integrity, crossorigin='anonymous')
+            if type(element) is script:
+                tag = script(src=url, **attrs)
+            else:
+                tag = link(rel='stylesheet', href=url, **attrs)
+            siblings = element.parent.children
+            siblings[siblings.index(element)] = tag
+            tag.parent, element.parent = element.parent, None
+            self.resources[i] = (resource, tag)
+
+    def size_breakdown(self):
+        """Measure the charts, tables, resources and cached sections of the report.
+
+        Bokeh figures are measured as serialised into the script that embeds
+        them, everything else as rendered HTML.
+
+        :returns: list of tuples of the kind of component, a name, its size in
+            bytes and the component, largest first.
+        """
+        breakdown = list()
+        for resource, element in self.resources:
+            name = resource.path or getattr(resource.func, '__name__', 'resource')
+            nbytes = len(render_element(element).encode()) if element is not None else 0
+            breakdown.append(('resource', name, nbytes, element))
+
+        stack = [self]
+        while stack:
+            element = stack.pop()
+            if isinstance(element, (_ReportChart, DataTable)):
+                kind = 'table' if isinstance(element, DataTable) else 'chart'
+                name = element.attributes.get('id', type(element).__name__)
+                breakdown.append((kind, name, element.nbytes(), element))
+            elif isinstance(element, rendered):
+                # a cached section
+                nbytes = len(render_element(element).encode())
+                breakdown.append(('section', 'cached', nbytes, element))
+            elif getattr(element, 'children', None):
+                stack.extend(reversed(element.children))
+        breakdown.sort(key=lambda x: x[2], reverse=True)
+        return breakdown
+
+    def _fit_budget(self, breakdown, max_bytes):
+        """Reduce the largest charts and tables until the report fits a budget.
+
+        :param breakdown: the output of `size_breakdown()`, updated in place.
+        :param max_bytes: size budget for the report.
+        """
+        bokeh_bytes = sum(
+            nbytes for _, _, nbytes, element in breakdown
+            if isinstance(element, _BokehChart))
+        total = len(render_element(self).encode()) + bokeh_bytes
+        exhausted = set()
+        while total > max_bytes:
+            candidates = [
+                (i, component) for i, component in enumerate(breakdown)
+                if component[0] in ('chart', 'table') and i not in exhausted]
+            if not candidates:
+                self.logger.warning(
+                    f"Report is {total} bytes after reducing all charts and "
+                    f"tables, over its budget of {max_bytes} bytes.")
+                break
+            i, (kind, name, nbytes, element) = max(
+                candidates, key=lambda x: x[1][2])
+            if kind == 'table':
+                exhausted.add(i)
+                if not element.truncate(TABLE_PREVIEW_ROWS):
+                    continue
+            elif not element.reduce():
+                exhausted.add(i)
+                continue
+            reduced = element.nbytes()
+            self.logger.info(f"Reduced {kind} {name} from {nbytes} to {reduced} bytes.")
+            breakdown[i] = (kind, name, reduced, element)
+            total -= nbytes - reduced
+        breakdown.sort(key=lambda x: x[2], reverse=True)
+
+    def _log_sizes(self, total, n=10):
+        """Log the total size of the report and its largest components."""
+        self.logger.info(f"Report is {total} bytes, the largest components are:")
+        for entry in self.sizes[:n]:
+            self.logger.info(
+                f"  {entry['bytes']:>12} {entry['kind']:<8} {entry['name']}")
+
+    @staticmethod
+    def _replace(element, html):
+        """Replace an element of the report with its rendered HTML."""
+        siblings = element.parent.children
+        siblings[siblings.index(element)] = rendered(html)
+
+    @staticmethod
+    def _embed_bokeh_charts(bokeh_charts):
+        """Place divs for Bokeh plots in their charts and return the script."""
+        figures = [x.plot._fig for x in bokeh_charts]
+        if all(fig.document is None for fig in figures):
+            # `components` would add the figures to a document one at a time,
+            # collecting all the document's models each time. Add them at once.
+            document = Document()
+            with document.models.freeze():
+                for fig in figures:
+                    document.add_root(fig)
+        # get the script + divs for all the plots; then place the div in the
+        # corresponding `_BokehChart` div
+        bokeh_script, bokeh_divs = components(figures)
+        for chart, bokeh_div in zip(bokeh_charts, bokeh_divs):
+            with chart:
+                raw(bokeh_div)
+        return bokeh_script
+
+    def render_cached_sections(self, cache_dir):
+        """Replace sections that have a `cache_key` with their rendered HTML.
+
+        The HTML is read from `cache_dir` if present, else the section is
+        rendered and saved. Sections are cached by their ID and `cache_key`.
+
+        :param cache_dir: cache directory, created if it does not exist.
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        for section in self.get_sections(cached=True):
+            key = json.dumps(
+                [ezcharts.__version__, section.attributes['id'], section.cache_key],
+                default=str)
+            fname = os.path.join(
+                cache_dir, hashlib.sha256(key.encode()).hexdigest() + '.html')
+            if os.path.exists(fname):
+                with open(fname, 'r', encoding='utf-8') as fh:
+                    html = fh.read()
+            else:
+                bokeh_charts = self.get_bokeh_charts(section)
+                if bokeh_charts:
+                    # Bokeh scripts wait for the page to load, so can sit
+                    # with their plots rather than in the header
+                    bokeh_script = self._embed_bokeh_charts(bokeh_charts)
+                    with section:
+                        raw(bokeh_script)
+                html = render_element(section)
+                # write then move so a partial file is never read back
+                with open(fname + '.tmp', 'w', encoding='utf-8') as fh:
+                    fh.write(html)
+                os.replace(fname + '.tmp', fname)
+            self._replace(section, html)
+
+    def get_sections(self, cached=False):
+        """Return the outermost sections of the report.
+
+        :param cached: only return sections that have a `cache_key`.
+        """
+        sections = []
+        stack = [self]
+        while stack:
+            s = stack.pop()
+            if isinstance(s, Section) and not (cached and s.cache_key is None):
+                sections.append(s)
+            elif getattr(s, 'children', None):
+                stack.extend(reversed(s.children))
+        return sections
+
+    def get_charts(self, root=None):
+        """Return all children of the report that are eCharts or Bokeh charts.
+
+        :param root: only search this element of the report.
+        """
+        charts = []
 
         def _get_charts_in_children(s):
             if not hasattr(s, 'children') or not s.children:
                 return
             for child in s.children:
-                if isinstance(child, _BokehChart):
-                    bokeh_charts.append(child)
+                if isinstance(child, _ReportChart):
+                    charts.append(child)
                 _get_charts_in_children(child)
 
-        _get_charts_in_children(self)
-        return bokeh_charts
+        _get_charts_in_children(self if root is None else root)
+        return charts
+
+    def get_bokeh_charts(self, root=None):
+        """Return all children of the report that are of type `_BokehChart`.
+
+        :param root: only search this element of the report.
+        """
+        return [
+            chart for chart in self.get_charts(root)
+            if isinstance(chart, _BokehChart)]
@@ -148,13 +148,15 @@ class BasicReport(Report):
         report_title,
         logo: Type[html_tag] = EPI2MELabsLogo,
         head_resources: List[Resource] = LAB_head_resources,
-        body_resources: List[Resource] = LAB_body_resources
+        body_resources: List[Resource] = LAB_body_resources,
+        deterministic_ids: bool = False
     ) -> None:
         """Create tag."""
         super().__init__(
             report_title=report_title,
             head_resources=head_resources,
-            body_resources=body_resources)
+            body_resources=body_resources,
+            deterministic_ids=deterministic_ids)
         with self.header:
             self.nav = LabsNavigation(logo=logo, groups=['main', 'meta'])
 
@@ -166,13 +168,17 @@ class BasicReport(Report):
         self,
         title: str,
         link: str,
-        overflow: bool = False
+        overflow: bool = False,
+        cache_key=None
     ) -> Section:
-        """Add a section to the main_content region."""
+        """Add a section to the main_content region.
+
+        :param cache_key: see `Section`.
+        """
         href = self.get_uid('Section')
         self.nav.add_link('main', link, f'#{href}')
         with self.main_content:
-            return Section(href, title, overflow=overflow)
+            return Section(href, title, overflow=overflow, cache_key=cache_key)
 
 
 class LabsReport(BasicReport):
@@ -188,13 +194,15 @@ class LabsReport(BasicReport):
         logo: Type[html_tag] = EPI2MELabsLogo,
         head_resources: List[Resource] = LAB_head_resources,
         body_resources: List[Resource] = LAB_body_resources,
-        created_date: Optional[str] = None
+        created_date: Optional[str] = None,
+        deterministic_ids: bool = False
     ) -> None:
         """Create tag."""
         super().__init__(
             report_title=report_title,
             head_resources=head_resources,
-            body_resources=body_resources)
+            body_resources=body_resources,
+            deterministic_ids=deterministic_ids)
 
         with self.header:
             self.nav.add_link('meta', 'Versions', '#versions')
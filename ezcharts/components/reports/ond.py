@@ -134,13 +134,15 @@ class BasicReport(Report):
         report_title,
         logo: Type[html_tag] = ONDLogo,
         head_resources: List[Resource] = OND_head_resources,
-        body_resources: List[Resource] = OND_body_resources
+        body_resources: List[Resource] = OND_body_resources,
+        deterministic_ids: bool = False
     ) -> None:
         """Create tag."""
         super().__init__(
             report_title=report_title,
             head_resources=head_resources,
-            body_resources=body_resources)
+            body_resources=body_resources,
+            deterministic_ids=deterministic_ids)
         with self.header:
             self.nav = LabsNavigation(logo=logo, groups=['main', 'meta'])
 
@@ -155,14 +157,20 @@ class BasicReport(Report):
         overflow: bool = False,
         display_link: bool = True,
         transparent: bool = False,
+        cache_key=None
     ) -> Section:
-        """Add a section to the main_content region."""
+        """Add a section to the main_content region.
+
+        :param cache_key: see `Section`.
+        """
         href = link.lower().replace(' ', '_')
         if display_link is True:
             self.nav.add_link('main', link, f'#{href}')
 
         with self.main_content:
-            return Section(href, title, overflow=overflow, transparent=transparent)
+            return Section(
+                href, title, overflow=overflow, transparent=transparent,
+                cache_key=cache_key)
 
 
 class ONDReport(BasicReport):
@@ -177,13 +185,15 @@ class ONDReport(BasicReport):
         head_resources: List[Resource] = OND_head_resources,
         body_resources: List[Resource] = OND_body_resources,
         created_date: Optional[str] = None,
-        default_content: bool = True
+        default_content: bool = True,
+        deterministic_ids: bool = False
     ) -> None:
         """Create tag."""
         super().__init__(
             report_title=report_title,
             head_resources=head_resources,
-            body_resources=body_resources)
+            body_resources=body_resources,
+            deterministic_ids=deterministic_ids)
 
         if default_content is True:
             with self.header:
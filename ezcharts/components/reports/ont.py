@@ -174,13 +174,15 @@ class BasicReport(Report):
         logo: Type[html_tag] = ONTLogo,
         head_resources: List[Resource] = ONT_head_resources,
         body_resources: List[Resource] = ONT_body_resources,
-        to_print: bool = False
+        to_print: bool = False,
+        deterministic_ids: bool = False
     ) -> None:
         """Create tag."""
         super().__init__(
             report_title=report_title,
             head_resources=head_resources,
-            body_resources=body_resources)
+            body_resources=body_resources,
+            deterministic_ids=deterministic_ids)
 
         with self.header:
             self.nav = LabsNavigation(
@@ -197,14 +199,20 @@ class BasicReport(Report):
         overflow: bool = False,
         display_link: bool = True,
         transparent: bool = False,
+        cache_key=None
     ) -> Section:
-        """Add a section to the main_content region."""
+        """Add a section to the main_content region.
+
+        :param cache_key: see `Section`.
+        """
         href = link.lower().replace(' ', '_')
         if display_link is True:
             self.nav.add_link('main', link, f'#{href}')
 
         with self.main_content:
-            return Section(href, title, overflow=overflow, transparent=transparent)
+            return Section(
+                href, title, overflow=overflow, transparent=transparent,
+                cache_key=cache_key)
 
 
 class ONTReport(BasicReport):
@@ -220,14 +228,16 @@ class ONTReport(BasicReport):
         body_resources: List[Resource] = ONT_body_resources,
         default_content: bool = True,
         page_number: Optional[tuple] = None,
-        to_print: bool = False
+        to_print: bool = False,
+        deterministic_ids: bool = False
     ) -> None:
         """Create tag."""
         super().__init__(
             report_title=report_title,
             head_resources=head_resources,
             body_resources=body_resources,
-            to_print=to_print)
+            to_print=to_print,
+            deterministic_ids=deterministic_ids)
 
         if default_content is True:
             with self.header:
@@ -0,0 +1,126 @@
+"""Switch one set of charts and tables between samples, client-side."""
+import json
+
+from dominate.tags import option, script, select
+from dominate.util import raw
+
+from ezcharts.components.ezchart import EZChart
+from ezcharts.layout.base import Snippet
+from ezcharts.layout.resource import overlay_js, switcher_js
+from ezcharts.layout.snippets import DataTable
+from ezcharts.plots import BokehPlot
+from ezcharts.plots.util import empty_plot, overlay_plots
+
+
+class SampleSwitcher(Snippet):
+    """A sample selector for a single set of charts and tables.
+
+    Rather than a copy of every chart and table for each sample, revealed by
+    a dropdown (as with `Tabs`), the data of each sample is embedded once in
+    a store keyed by sample and the charts and tables are updated from it as
+    a sample is selected. eCharts are given the options of the sample, Bokeh
+    plots of all samples are overlaid (see `overlay_plots`) with all but the
+    selected sample hidden, and the rows of tables are replaced.
+
+    Charts and tables are created in the current dominate context, so may be
+    laid out within the switcher as any other elements, e.g.::
+
+        switcher = SampleSwitcher(["a", "b"])
+        with switcher:
+            with Grid():
+                switcher.add_chart({"a": plot_a, "b": plot_b})
+            switcher.add_table({"a": df_a, "b": df_b})
+    """
+
+    TAG = 'div'
+
+    def __init__(self, samples):
+        """Create the selector.
+
+        :param samples: names of the samples, the first being shown initially.
+        """
+        super().__init__(styles=None, classes=None)
+        self.samples = [str(sample) for sample in samples]
+        self.slots = list()
+        with self:
+            overlay_js.require()
+            switcher_js.require()
+            with select(
+                cls="form-select mb-3", aria_label="Sample", data_switcher=self.uid,
+                onchange="ezchartsSwitcher.show(this)"
+            ):
+                for sample in self.samples:
+                    option(sample, value=sample)
+            self._store = script()
+
+    def add_chart(self, plots, theme='epi2melabs', **kwargs):
+        """Add a chart showing the plot of the selected sample.
+
+        :param plots: dict of plots by sample. Samples without a plot (or with
+            None) show an empty plot.
+        :param theme: theme of the chart.
+        :param kwargs: passed to `EZChart`.
+        :returns: the chart.
+        """
+        plots = {str(k): v for k, v in plots.items() if v is not None}
+        bokeh_plots = {k: v for k, v in plots.items() if isinstance(v, BokehPlot)}
+        first = self.samples[0]
+        if bokeh_plots:
+            plot = overlay_plots(
+                list(bokeh_plots.values()), list(bokeh_plots), alpha=None,
+                recolor=False)
+            plot._fig.name = f"{self.uid}_{len(self.slots)}"
+            for renderer in plot._fig.renderers:
+                renderer.visible = renderer.tags[0] == first
+            for title in plot._fig.above:
+                if title.tags:
+                    title.text = title.tags[0].get(first, '')
+            chart = EZChart(plot, theme, **kwargs)
+            self.slots.append(dict(kind='bokeh', target=plot._fig.name))
+        else:
+            empty = empty_plot()
+            chart = EZChart(plots.get(first, empty), theme, **kwargs)
+            self.slots.append(dict(
+                kind='echarts', target=chart.uid,
+                data={k: plots.get(k, empty).to_json() for k in self.samples}))
+        self._render_store()
+        return chart
+
+    def add_table(self, frames, **kwargs):
+        """Add a table showing the rows of the selected sample.
+
+        :param frames: dict of `pd.DataFrame` by sample, with the same columns.
+            Samples without a frame show an empty table.
+        :param kwargs: passed to `DataTable.from_pandas`. The index of the
+            frames is not shown.
+        :returns: the table.
+        """
+        frames = {str(k): v for k, v in frames.items()}
+        first = frames.get(self.samples[0])
+        if first is None:
+            first = next(iter(frames.values())).iloc[:0]
+        table = DataTable.from_pandas(first, use_index=False, **kwargs)
+        # cells as added by `DataTable.add_row`
+        rows = {
+            k: [[str(x) for x in row] for row in frame.itertuples(index=False)]
+            for k, frame in frames.items()}
+        self.slots.append(dict(kind='table', target=table.uid, data=rows))
+        self._render_store()
+        return table
+
+    def _render_store(self):
+        """Render the script registering the data of each sample."""
+        slots = list()
+        for slot in self.slots:
+            if slot['kind'] == 'echarts':
+                # options are JavaScript (they may contain functions), not JSON
+                data = '{' + ','.join(
+                    f"{json.dumps(k)}: {v}" for k, v in slot['data'].items()) + '}'
+            else:
+                data = json.dumps(slot.get('data')).replace('</', '<\\/')
+            slots.append(
+                f"{{kind: {json.dumps(slot['kind'])}, "
+                f"target: {json.dumps(slot['target'])}, data: {data}}}")
+        self._store.clear()
+        self._store.add(raw(
+            f"ezchartsSwitcher.register('{self.uid}', [{', '.join(slots)}]);"))
@@ -0,0 +1,44 @@
+// Decode the packed data islands written by `ezcharts.layout.islands`.
+//
+// An island is a `<script type="application/octet-stream">` holding a base64
+// encoded, deflated buffer of little-endian Int32 or Float32 values.
+const ezchartsIslands = (() => {
+    const types = {i4: Int32Array, f4: Float32Array};
+
+    const decode = async (id) => {
+        const island = document.getElementById(id);
+        const text = atob(island.textContent.trim());
+        const bytes = new Uint8Array(text.length);
+        for (let i = 0; i < text.length; i++) {
+            bytes[i] = text.charCodeAt(i);
+        }
+        const stream = new Blob([bytes]).stream().pipeThrough(
+            new DecompressionStream('deflate'));
+        const buffer = await new Response(stream).arrayBuffer();
+        return new types[island.dataset.dtype](buffer);
+    };
+
+    // Rebuild a dataset source from its columns, each either a list of
+    // values or the ID of an island, as rows (prefixed by a header if any).
+    const source = async (spec) => {
+        const columns = await Promise.all(spec.columns.map(
+            (column) => typeof column === 'string' ? decode(column) : column));
+        const rows = spec.header ? [spec.header] : [];
+        for (let i = 0; i < spec.length; i++) {
+            rows.push(columns.map((column) => column[i]));
+        }
+        return rows;
+    };
+
+    // Fill in the dataset sources of eCharts options from their islands.
+    const inflate = async (option, specs) => {
+        const datasets = Array.isArray(option.dataset)
+            ? option.dataset : [option.dataset];
+        await Promise.all(Object.entries(specs).map(async ([index, spec]) => {
+            datasets[index].source = await source(spec);
+        }));
+        return option;
+    };
+
+    return {decode, inflate};
+})();
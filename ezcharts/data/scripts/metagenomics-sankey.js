@@ -21,11 +21,40 @@ const getData = () => "replace_me"
 /* ----------------------------------------------------------------------------
 | Helper methods
 |---------------------------------------------------------------------------- */
+/**
+    * Expands flat per-sample arrays of taxa into nested taxonomy objects.
+    *
+    * Each sample has arrays of name index, parent index (-1 for roots), rank
+    * index and count per taxon, parents preceding their children.
+    *
+    * @param {object} encoded
+    */
+const expandTrees = (encoded) => {
+    const samples = {}
+    Object.entries(encoded.samples).forEach(([sample_name, tree]) => {
+        const roots = {}
+        const nodes = tree.count.map((count, i) => ({
+            rank: encoded.ranks[tree.rank[i]],
+            count: count,
+            children: {}
+        }))
+        tree.parent.forEach((parent, i) => {
+            const siblings = parent < 0 ? roots : nodes[parent].children
+            siblings[encoded.names[tree.name[i]]] = nodes[i]
+        })
+        samples[sample_name] = roots
+    })
+    return samples
+}
+
 const parseData = (_data) =>
-    JSON.parse(_data);
+    expandTrees(JSON.parse(_data));
 
-const normaliseName = (name) =>
-    name.split(' ').join('-')
+// Gradients are referenced by ID, so these must be unique in the page and
+// valid in `url(#...)`: names may hold spaces and parentheses (e.g. pruned
+// "Other (parent)" nodes), and several sankeys may show the same taxa.
+let gradientCount = 0;
+const gradientId = () => `ezcharts-sankey-grad-${gradientCount++}`;
 
 /* ----------------------------------------------------------------------------
 | Graph methods
@@ -405,10 +434,11 @@ const updateVisualisation = (svg, graph, depth, colourScale, parsed, counts) =>
             enter => {
                 const container = enter.append("g")
                     .style("mix-blend-mode", "multiply")
+                    .each(d => { d.gradientId = gradientId(); })
 
                 container
                     .append("linearGradient")
-                    .attr("id", d => `${d.source.name}-${normaliseName(d.target.name)}-grad`)
+                    .attr("id", d => d.gradientId)
                     .attr("gradientUnits", "userSpaceOnUse")
                     .attr("x1", d => d.source.x1)
                     .attr("x2", d => d.target.x0)
@@ -422,7 +452,7 @@ const updateVisualisation = (svg, graph, depth, colourScale, parsed, counts) =>
                 container
                     .append("path")
                     .attr("d", safeSankeyPathGen())
-                    .attr("stroke", (d) => `url(#${d.source.name}-${normaliseName(d.target.name)}-grad`)
+                    .attr("stroke", (d) => `url(#${d.gradientId})`)
                     .attr("stroke-opacity", 0.1)
                     .call(enter => enter.transition(t)
                         .attr("stroke-width", d => Math.max(1, d.width)))
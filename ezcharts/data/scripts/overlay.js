@@ -0,0 +1,30 @@
+// Show the data of one label (e.g. a sample) on figures drawn by
+// `ezcharts.plots.util.overlay_plots`. Renderers are tagged with the label
+// whose data they draw, and titles may be tagged with their text for each
+// label. An empty label shows the data of all labels.
+const ezchartsShowLabel = (names, label) => {
+    for (const doc of Bokeh.documents) {
+        for (const name of names) {
+            const fig = doc.get_model_by_name(name);
+            if (!fig) {
+                continue;
+            }
+            for (const renderer of fig.renderers) {
+                if (renderer.tags.length) {
+                    renderer.visible = label === '' || renderer.tags[0] === label;
+                }
+            }
+            for (const title of fig.above) {
+                const texts = title.tags[0];
+                if (texts && typeof texts === 'object') {
+                    title.text = texts[label] ?? '';
+                }
+            }
+        }
+    }
+};
+
+// Handle the change of a `<select>` listing the figures in `data-figures`.
+const ezchartsSelectLabel = (select) => {
+    ezchartsShowLabel(JSON.parse(select.dataset.figures), select.value);
+};
@@ -0,0 +1,44 @@
+// Switch the charts and tables of an `ezcharts.components.switcher.SampleSwitcher`
+// between samples, from the data of each sample registered with the switcher.
+const ezchartsSwitcher = (() => {
+    const switchers = {};
+
+    const register = (id, slots) => {
+        switchers[id] = slots;
+    };
+
+    // Replace the rows of a `DataTable`, re-creating the datatable over them.
+    const showRows = (id, rows) => {
+        const name = `${id}_table`;
+        const options = window[name].options;
+        window[name].destroy();
+        const body = document.querySelector(`#${id}_inner tbody`);
+        body.replaceChildren(...rows.map((row) => {
+            const tr = document.createElement('tr');
+            for (const cell of row) {
+                const td = document.createElement('td');
+                td.innerHTML = cell;
+                tr.appendChild(td);
+            }
+            return tr;
+        }));
+        window[name] = new simpleDatatables.DataTable(`#${id}_inner`, options);
+    };
+
+    const show = (select) => {
+        const sample = select.value;
+        for (const slot of switchers[select.dataset.switcher] || []) {
+            if (slot.kind === 'echarts') {
+                const chart = echarts.getInstanceByDom(
+                    document.getElementById(slot.target));
+                chart.setOption(slot.data[sample], true);
+            } else if (slot.kind === 'bokeh') {
+                ezchartsShowLabel([slot.target], sample);
+            } else if (slot.kind === 'table') {
+                showRows(slot.target, slot.data[sample] || []);
+            }
+        }
+    };
+
+    return {register, show};
+})();
@@ -0,0 +1,293 @@
+"""Kernels for loops that do not map cleanly onto NumPy operations.
+
+Each kernel has two implementations: one built from whole-array NumPy
+operations, and an explicit loop that is compiled with numba when numba is
+installed. The public functions are bound to the compiled loops if numba
+could be imported and to the NumPy implementations otherwise. Both give
+identical results, which is checked by `tests/test_kernels.py`; without
+numba the loops still run, slowly, as plain Python.
+"""
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+__all__ = ["HAVE_NUMBA", "histogram", "fill_windows", "grouped_median"]
+
+HAVE_NUMBA = numba is not None
+
+
+def _jit(func):
+    """Compile a function with numba, if it is installed."""
+    if numba is None:
+        return func
+    return numba.njit(cache=True, nogil=True)(func)
+
+
+# Histograms
+
+def _histogram_numpy(values, edges, weights=None):
+    """Histogram values into bins, see `histogram`."""
+    values = np.asarray(values, dtype=float)
+    edges = np.asarray(edges, dtype=float)
+    n_bins = len(edges) - 1
+    lo, hi = edges[0], edges[-1]
+    keep = (values >= lo) & (values <= hi)
+    values = values[keep]
+    # guess assuming even bins and correct by a bin either way, as
+    # `np.histogram` does, checking the result for uneven bins
+    with np.errstate(invalid='ignore', divide='ignore'):
+        index = ((values - lo) / (hi - lo) * n_bins).astype(np.intp)
+    np.clip(index, 0, n_bins - 1, out=index)
+    index -= values < edges[index]
+    index += (index < n_bins - 1) & (values >= edges[index + 1])
+    if not np.all(
+            (edges[index] <= values)
+            & ((values < edges[index + 1]) | (index == n_bins - 1))):
+        index = np.searchsorted(edges, values, side='right') - 1
+        # as with `np.histogram` the last bin is closed
+        index[index == n_bins] = n_bins - 1
+    if weights is None:
+        return np.bincount(index, minlength=n_bins)
+    weights = np.asarray(weights)[keep]
+    counts = np.bincount(index, weights=weights, minlength=n_bins)
+    return counts.astype(_weight_dtype(weights))
+
+
+@_jit
+def _bin_index(value, edges):
+    """Return the bin of a value, or -1 for values outside the bins."""
+    n_bins = edges.shape[0] - 1
+    lo, hi = edges[0], edges[n_bins]
+    if not (value >= lo and value <= hi):  # also catches NaN
+        return -1
+    if value == hi:
+        return n_bins - 1
+    # guess assuming even bins, then walk to the right bin
+    index = min(int((value - lo) / (hi - lo) * n_bins), n_bins - 1)
+    while index > 0 and value < edges[index]:
+        index -= 1
+    while index < n_bins - 1 and value >= edges[index + 1]:
+        index += 1
+    return index
+
+
+@_jit
+def _bin_counts_loop(values, edges, out):
+    for i in range(values.shape[0]):
+        index = _bin_index(values[i], edges)
+        if index >= 0:
+            out[index] += 1
+
+
+@_jit
+def _bin_weights_loop(values, edges, weights, out):
+    for i in range(values.shape[0]):
+        index = _bin_index(values[i], edges)
+        if index >= 0:
+            out[index] += weights[i]
+
+
+def _weight_dtype(weights):
+    """Return the dtype in which to sum weights."""
+    return np.int64 if weights.dtype.kind in 'biu' else np.float64
+
+
+def _histogram_loop(values, edges, weights=None):
+    """Histogram values into bins, see `histogram`."""
+    values = np.ascontiguousarray(values, dtype=float)
+    edges = np.ascontiguousarray(edges, dtype=float)
+    if weights is None:
+        out = np.zeros(len(edges) - 1, dtype=np.intp)
+        _bin_counts_loop(values, edges, out)
+        return out
+    weights = np.asarray(weights)
+    dtype = _weight_dtype(weights)
+    out = np.zeros(len(edges) - 1, dtype=dtype)
+    _bin_weights_loop(
+        values, edges, np.ascontiguousarray(weights, dtype=dtype), out)
+    return out
+
+
+# Gaps between intervals
+
+def _fill_windows_numpy(starts, ends, length, winsize):
+    """Fill the gaps between intervals with windows, see `fill_windows`."""
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    n = len(starts)
+    # gap i precedes interval i, and the last gap follows the last interval
+    gap_lo = np.concatenate([[0], ends])
+    gap_hi = np.concatenate([starts, [length]])
+    n_fill = np.where(gap_hi > gap_lo, -((gap_lo - gap_hi) // winsize), 0)
+    before = np.cumsum(n_fill) - n_fill
+    first = before + np.arange(n + 1)
+    out_starts = np.empty(n_fill.sum() + n, dtype=np.int64)
+    out_ends = np.empty_like(out_starts)
+    source = np.full_like(out_starts, -1)
+
+    positions = first[:n] + n_fill[:n]
+    out_starts[positions] = starts
+    out_ends[positions] = ends
+    source[positions] = np.arange(n)
+
+    gap = np.repeat(np.arange(n + 1), n_fill)
+    step = np.arange(len(gap)) - before[gap]
+    window_starts = gap_lo[gap] + step * winsize
+    out_starts[first[gap] + step] = window_starts
+    out_ends[first[gap] + step] = np.minimum(window_starts + winsize, gap_hi[gap])
+    return out_starts, out_ends, source
+
+
+@_jit
+def _window_count_loop(starts, ends, length, winsize):
+    total = starts.shape[0]
+    previous = 0
+    for i in range(starts.shape[0] + 1):
+        hi = starts[i] if i < starts.shape[0] else length
+        if hi > previous:
+            total += (hi - previous + winsize - 1) // winsize
+        if i < starts.shape[0]:
+            previous = ends[i]
+    return total
+
+
+@_jit
+def _window_fill_loop(
+        starts, ends, length, winsize, out_starts, out_ends, source):
+    pos = 0
+    previous = 0
+    for i in range(starts.shape[0] + 1):
+        hi = starts[i] if i < starts.shape[0] else length
+        lo = previous
+        while lo < hi:
+            out_starts[pos] = lo
+            out_ends[pos] = min(lo + winsize, hi)
+            source[pos] = -1
+            lo += winsize
+            pos += 1
+        if i < starts.shape[0]:
+            out_starts[pos] = starts[i]
+            out_ends[pos] = ends[i]
+            source[pos] = i
+            pos += 1
+            previous = ends[i]
+
+
+def _fill_windows_loop(starts, ends, length, winsize):
+    """Fill the gaps between intervals with windows, see `fill_windows`."""
+    starts = np.ascontiguousarray(starts, dtype=np.int64)
+    ends = np.ascontiguousarray(ends, dtype=np.int64)
+    total = _window_count_loop(starts, ends, length, winsize)
+    out_starts = np.empty(total, dtype=np.int64)
+    out_ends = np.empty_like(out_starts)
+    source = np.empty_like(out_starts)
+    _window_fill_loop(
+        starts, ends, length, winsize, out_starts, out_ends, source)
+    return out_starts, out_ends, source
+
+
+# Medians of groups
+
+def _grouped_median_numpy(groups, values, n_groups):
+    """Return the median of the values of each group, see `grouped_median`."""
+    groups = np.asarray(groups, dtype=np.int64)
+    values = np.asarray(values, dtype=float)
+    order = np.lexsort((values, groups))
+    values = values[order]
+    counts = np.bincount(groups, minlength=n_groups)
+    first = np.cumsum(counts) - counts
+    out = np.full(n_groups, np.nan)
+    has = counts > 0
+    lo = first[has] + (counts[has] - 1) // 2
+    hi = first[has] + counts[has] // 2
+    out[has] = (values[lo] + values[hi]) / 2
+    return out
+
+
+@_jit
+def _median_loop(groups, values, out):
+    n_groups = out.shape[0]
+    counts = np.zeros(n_groups, dtype=np.int64)
+    for i in range(groups.shape[0]):
+        counts[groups[i]] += 1
+    first = np.zeros(n_groups + 1, dtype=np.int64)
+    for g in range(n_groups):
+        first[g + 1] = first[g] + counts[g]
+    fill = first[:-1].copy()
+    bucketed = np.empty(values.shape[0], dtype=np.float64)
+    for i in range(groups.shape[0]):
+        bucketed[fill[groups[i]]] = values[i]
+        fill[groups[i]] += 1
+    for g in range(n_groups):
+        k = counts[g]
+        if k == 0:
+            out[g] = np.nan
+            continue
+        part = np.sort(bucketed[first[g]:first[g + 1]])
+        out[g] = (part[(k - 1) // 2] + part[k // 2]) / 2
+
+
+def _grouped_median_loop(groups, values, n_groups):
+    """Return the median of the values of each group, see `grouped_median`."""
+    out = np.empty(n_groups, dtype=np.float64)
+    _median_loop(
+        np.ascontiguousarray(groups, dtype=np.int64),
+        np.ascontiguousarray(values, dtype=np.float64), out)
+    return out
+
+
+if HAVE_NUMBA:
+    _histogram, _fill_windows, _grouped_median = (
+        _histogram_loop, _fill_windows_loop, _grouped_median_loop)
+else:
+    _histogram, _fill_windows, _grouped_median = (
+        _histogram_numpy, _fill_windows_numpy, _grouped_median_numpy)
+
+
+def histogram(values, edges, weights=None):
+    """Count (or sum the weights of) values falling into bins.
+
+    Bins are half open except the last, which includes its right edge, and
+    values outside the bins are ignored, as for `np.histogram`.
+
+    :param values: values to bin.
+    :param edges: increasing bin edges.
+    :param weights: optional weights of the values. Integer weights give
+        integer sums.
+    :returns: array of counts or summed weights of each bin.
+    """
+    return _histogram(values, edges, weights)
+
+
+def fill_windows(starts, ends, length, winsize):
+    """Fill the gaps around sorted intervals on a sequence with windows.
+
+    Gaps before the first interval, between intervals and after the last
+    interval up to the sequence length are split into windows of `winsize`,
+    the last window of each gap being shortened to fit.
+
+    :param starts: interval starts, in increasing order.
+    :param ends: interval ends.
+    :param length: length of the sequence.
+    :param winsize: size of the windows.
+    :returns: tuple of `(starts, ends, source)` arrays of the combined
+        intervals and windows, where `source` gives the index of each
+        interval in the input and -1 for added windows.
+    """
+    return _fill_windows(starts, ends, length, winsize)
+
+
+def grouped_median(groups, values, n_groups):
+    """Return the median of the values of each group.
+
+    :param groups: group index, from `0` to `n_groups - 1`, of each value.
+    :param values: values, without NaNs.
+    :param n_groups: number of groups.
+    :returns: array of medians, NaN for empty groups.
+    """
+    return _grouped_median(groups, values, n_groups)
@@ -6,6 +6,27 @@ from uuid import uuid4
 
 from dominate.tags import html_tag
 
+from ezcharts.layout.util import context_ancestors
+
+
+def _uid_context(element):
+    """Find the ID counters and scope for an element.
+
+    The element and the `with` contexts within which it is being created are
+    searched, with their ancestors (see `context_ancestors`), for the report
+    holding the counters and the innermost section scoping the IDs.
+
+    :param element: the element for which to generate an ID.
+    :returns: tuple of the dict of counters, or None for random IDs, and the
+        scope, or None.
+    """
+    scope = None
+    for tag in context_ancestors(element):
+        if getattr(tag, 'uid_counters', None) is not None:
+            return tag.uid_counters, scope
+        scope = scope or getattr(tag, 'uid_scope', None)
+    return None, None
+
 
 @dataclass
 class IDataClassMixin:
@@ -30,6 +51,12 @@ class Snippet(html_tag):
     """Base snippet."""
 
     TAG: str = 'div'
+    # IDs are random unless a report numbering the IDs of the snippets created
+    # within it has `uid_counters`, a dict of counters per scope and name. IDs
+    # of snippets created within a section with a `uid_scope` are numbered
+    # independently of those created outside it.
+    uid_counters = None
+    uid_scope = None
 
     def __init__(
         self,
@@ -58,4 +85,10 @@ class Snippet(html_tag):
                 "`name` cannot contain characters other than"
                 "alphanumeric, '_', and '-'."
             )
-        return name + '_' + str(uuid4()).replace("-", "")
+        counters, scope = _uid_context(self)
+        if counters is None:
+            return name + '_' + str(uuid4()).replace("-", "")
+        prefix = name + '_' + (f'{scope}_' if scope else '')
+        count = counters.get(prefix, 0)
+        counters[prefix] = count + 1
+        return prefix + str(count)
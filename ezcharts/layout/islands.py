@@ -0,0 +1,175 @@
+"""Compressed, typed-array data islands for chart data.
+
+Numeric columns of eCharts dataset sources are packed as little-endian Int32
+or Float32 buffers, deflated and base64 encoded into `<script
+type="application/octet-stream">` elements, rather than inlined in the chart
+options as decimal JSON. The `islands_js` loader (`data/scripts/islands.js`)
+decodes them with `DecompressionStream` and rebuilds the dataset sources before
+the options are set.
+
+Bokeh already embeds numeric columns as binary (base64) buffers, which BokehJS
+decodes itself, so its columns are only narrowed to 32-bit types.
+"""
+import base64
+import json
+import zlib
+
+from dominate.tags import script
+import numpy as np
+
+from ezcharts.plots.util import JSCode
+
+# sources with fewer rows than this are left inlined
+MIN_ROWS = 100
+INT32 = np.iinfo(np.int32)
+
+
+def narrow_dtype(values):
+    """Choose the 32-bit type in which to pack a column of numbers.
+
+    Integers (and floats with integral values) within the range of Int32 are
+    packed as Int32, and other floats as Float32. Integers outside the range
+    of Int32 are not narrowed, as Float32 would not hold them exactly.
+
+    :param values: array of values.
+    :returns: "i4", "f4", or None for values which should be left unchanged:
+        non-numeric (or boolean) values, large integers, and columns which
+        are not one-dimensional, such as the rows of a `MultiLine`.
+    """
+    try:
+        values = np.asarray(values)
+    except ValueError:
+        # ragged rows, e.g. of a `MultiLine`
+        return None
+    if values.ndim != 1 or values.dtype.kind not in 'iuf':
+        return None
+    integral = values.dtype.kind in 'iu' or (
+        np.all(np.isfinite(values)) and np.all(np.mod(values, 1) == 0))
+    if not integral:
+        return 'f4'
+    fits = len(values) == 0 or (
+        values.min() >= INT32.min and values.max() <= INT32.max)
+    return 'i4' if fits else None
+
+
+def pack_column(values):
+    """Pack a column of numbers into a deflated little-endian buffer.
+
+    :param values: array of values.
+    :returns: tuple of the type (see `narrow_dtype`) and the deflated buffer,
+        or None for values which are not packed.
+    """
+    dtype = narrow_dtype(values)
+    if dtype is None:
+        return None
+    return dtype, zlib.compress(np.asarray(values).astype(f'<{dtype}').tobytes())
+
+
+def narrow_source(source):
+    """Narrow the numeric columns of a Bokeh `ColumnDataSource` to 32 bits.
+
+    Bokeh embeds numeric arrays as base64 encoded binary of their own type,
+    so this halves the size of 64-bit columns. Columns for which
+    `narrow_dtype` gives None are left unchanged.
+
+    :param source: `ColumnDataSource`, modified in place.
+    """
+    data = dict()
+    for name, values in source.data.items():
+        dtype = narrow_dtype(values)
+        data[name] = values if dtype is None else np.asarray(values).astype(dtype)
+    source.data = data
+
+
+def _columns(source):
+    """Split a dataset source into an optional header row and columns.
+
+    :returns: tuple of header and columns, or None for sources other than
+        two-dimensional arrays and lists of equal length rows.
+    """
+    if isinstance(source, np.ndarray):
+        return (None, list(source.T)) if source.ndim == 2 else None
+    if not isinstance(source, (list, tuple)) or not source:
+        return None
+    if not all(isinstance(row, (list, tuple)) for row in source):
+        return None
+    if len({len(row) for row in source}) != 1:
+        return None
+    header = None
+    if all(isinstance(x, str) for x in source[0]):
+        header, source = list(source[0]), source[1:]
+    columns = list()
+    for column in zip(*source):
+        array = np.asarray(column)
+        # keep mixed columns (e.g. numbers and None) as they are
+        columns.append(array if array.dtype.kind in 'iuf' else list(column))
+    return header, columns
+
+
+def _plain(value):
+    """Convert numpy scalars to Python values for JSON."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class DataIsland(script):
+    """A packed column of numbers in a non-executed script element."""
+
+    tagname = 'script'
+
+    def __init__(self, island_id, dtype, payload):
+        """Create tag.
+
+        :param island_id: ID of the element.
+        :param dtype: "i4" or "f4", see `pack_column`.
+        :param payload: deflated buffer.
+        """
+        super().__init__(
+            base64.b64encode(payload).decode(), type='application/octet-stream',
+            id=island_id, data_dtype=dtype)
+
+
+def pack_plot(plot, prefix):
+    """Pack the dataset sources of an eCharts plot into data islands.
+
+    Islands are created in the current dominate context, so this should be
+    called within the element that will hold the chart's script.
+
+    :param plot: an eChart `Plot`, which is left unchanged.
+    :param prefix: prefix of the IDs of the islands.
+    :returns: tuple of the options as JSON, without the packed sources, and
+        the specifications of the packed sources (keyed by dataset index) to
+        pass to `ezchartsIslands.inflate()` as JSON, or None if no sources
+        were packed.
+    """
+    # axis labels are sized from the data, so must be fixed before the
+    # sources are removed
+    plot.finalise()
+    datasets = plot.dataset if isinstance(plot.dataset, list) else [plot.dataset]
+    specs, sources = dict(), dict()
+    for index, dataset in enumerate(datasets):
+        source = getattr(dataset, 'source', None)
+        if source is None or len(source) < MIN_ROWS:
+            continue
+        split = _columns(source)
+        if split is None:
+            continue
+        header, columns = split
+        spec = dict(header=header, length=len(columns[0]), columns=list())
+        for number, column in enumerate(columns):
+            packed = pack_column(column) if isinstance(column, np.ndarray) else None
+            if packed is None:
+                spec['columns'].append([_plain(x) for x in column])
+                continue
+            island_id = f"{prefix}_island_{index}_{number}"
+            DataIsland(island_id, *packed)
+            spec['columns'].append(island_id)
+        specs[index] = spec
+        sources[index] = source
+    try:
+        for index in sources:
+            datasets[index].source = None
+        options = JSCode._clean(plot.json(exclude_unset=True))
+    finally:
+        for index, source in sources.items():
+            datasets[index].source = source
+    return options, (json.dumps(specs) if specs else None)
@@ -6,7 +6,7 @@ from bokeh.resources import INLINE as bk_inline
 from dominate.tags import dom_tag, script, style
 from dominate.util import raw
 
-from ezcharts.layout.util import inline
+from ezcharts.layout.util import context_ancestors, context_elements, inline
 
 
 class Resource:
@@ -45,6 +45,40 @@ class Resource:
             else None
         )
 
+    @property
+    def key(self):
+        """Identity of the resource, its path or else its function."""
+        return self.path if self.path is not None else self.func
+
+    def require(self):
+        """Include the resource once in the report being built.
+
+        The resource is registered with the enclosing report, which emits
+        each unique resource once in its head when it is written. Where the
+        element being built is not (yet) part of a report, the resource is
+        rendered in place, as by calling it, so that the element works on its
+        own, e.g. in a plain `dominate` document. Should the element then join
+        a report, the report replaces the rendered copy with the registered
+        resource when it is written.
+
+        :returns: the rendered resource, or None if registered with a report.
+        """
+        report = enclosing_report()
+        if report is not None:
+            report.register_resource(self)
+            return None
+        element = self()
+        contexts = context_elements()
+        if contexts:
+            # noted on the outermost element, which may join a report
+            root = contexts[-1]
+            while root.parent is not None:
+                root = root.parent
+            if not hasattr(root, 'required_resources'):
+                root.required_resources = list()
+            root.required_resources.append((self, element))
+        return element
+
     def __call__(self):
         """Render the resource."""
         if self.path is not None:
@@ -56,6 +90,14 @@ class Resource:
         return loaded
 
 
+def enclosing_report():
+    """Return the report enclosing the current dominate context, or None."""
+    for element in context_ancestors():
+        if hasattr(element, 'register_resource'):
+            return element
+    return None
+
+
 def VendorResource(path=None, loader=inline, tag=None, func=None):
     """Fetch a vendor resource."""
     if path is not None:
@@ -111,6 +153,24 @@ echarts_js = VendorResource(
     tag=script,
     loader=inline)
 
+# decodes the data islands of charts packed with `Report.write(pack_data=True)`
+islands_js = ScriptResource(
+    path='islands.js',
+    tag=script,
+    loader=inline)
+
+# shows one label of figures drawn by `ezcharts.plots.util.overlay_plots`
+overlay_js = ScriptResource(
+    path='overlay.js',
+    tag=script,
+    loader=inline)
+
+# switches charts and tables of `ezcharts.components.switcher.SampleSwitcher`
+switcher_js = ScriptResource(
+    path='switcher.js',
+    tag=script,
+    loader=inline)
+
 bootstrap_js = VendorResource(
     path='bootstrap-5.3.0/js/bootstrap.bundle.min.js',
     tag=script,
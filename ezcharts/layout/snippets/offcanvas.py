@@ -1,6 +1,5 @@
 """Get default cards layouts."""
 from typing import Optional, Type
-from uuid import uuid4
 
 from dominate.tags import button, div, h5, html_tag
 
@@ -41,7 +40,7 @@ class OffCanvas(Snippet):
             self.add_offcanvas(
                 title,
                 label,
-                f"OffCanvas_{str(uuid4()).replace('-', '')}",
+                self.get_uid('OffCanvas'),
                 body)
 
     def add_offcanvas(
@@ -1,4 +1,5 @@
 """Get default section layouts."""
+import re
 from typing import Optional, Type
 
 from dominate.tags import h2, html_tag
@@ -37,14 +38,23 @@ class Section(Snippet):
         classes: ISectionClasses = ISectionClasses(),
         overflow: bool = False,
         transparent: bool = False,
+        cache_key=None
     ) -> None:
-        """Create styled section."""
+        """Create styled section.
+
+        :param cache_key: a value identifying the inputs to the section's
+            content, e.g. a hash of its data. If given, the rendered section
+            can be cached and reused by `Report.write`.
+        """
+        self.cache_key = cache_key
         super().__init__(
             styles=styles,
             classes=classes,
             className=classes.container_trans if transparent else classes.container,
             style=styles.overflow if overflow else None,
             id=section_id)
+        # number the IDs of snippets created within the section by themselves
+        self.uid_scope = re.sub(r"[^a-zA-Z0-9_\-]", "_", str(section_id))
 
         if section_title and section_title_tag:
             with self:
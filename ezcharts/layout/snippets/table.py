@@ -1,13 +1,19 @@
 """Get default table layouts."""
+import base64
 from collections.abc import Iterable
+import csv
+import html
+import io
+import re
 from typing import List, Optional, Union
+import zlib
 
-from dominate.tags import button, script, table, tbody, td, th, thead, tr
+from dominate.tags import button, p, script, table, tbody, td, th, thead, tr
 from dominate.util import raw
 import pandas as pd
 
 from ezcharts.layout.base import IClasses, Snippet
-from ezcharts.layout.util import cls, render_template
+from ezcharts.layout.util import cls, render_element, render_template
 
 
 class ITableClasses(IClasses):
@@ -69,27 +75,104 @@ class DataTable(Snippet):
                                     th(_header, scope="col")
                 self.body = tbody()
 
-            # Prepare table
-            datatable_render = """
-                var {{ id }}_table = new simpleDatatables.DataTable( \
-                    '#{{ id }}_inner', { \
-                    searchable: {{ searchable }}, \
-                    pageLength: {{ page_length }}, \
-                    sortable: {{ sortable }},
-                    paging: {{ paging }} \
-                })"""
-
+            self._options = dict(
+                paging=paging, searchable=searchable, sortable=sortable,
+                page_length=page_length, file_name=file_name, export=export)
+            # all rows of a truncated table, for export
+            self._full_data = None
             if export:
-                datatable_render, exportCSVButton = self._export_table(datatable_render)
-            else:
-                exportCSVButton = None
+                self._export_button()
+            self._script = script(self._render_script())
+
+    def _render_script(self):
+        """Render the script initialising the table."""
+        # Prepare table
+        datatable_render = """
+            var {{ id }}_table = new simpleDatatables.DataTable( \
+                '#{{ id }}_inner', { \
+                searchable: {{ searchable }}, \
+                pageLength: {{ page_length }}, \
+                sortable: {{ sortable }},
+                paging: {{ paging }} \
+            })"""
+
+        options = self._options
+        if self._full_data is not None:
+            datatable_render = self._export_full_data(datatable_render)
+        elif options['export']:
+            datatable_render = self._export_table(datatable_render)
+
+        return raw(render_template(
+            datatable_render,
+            id=self.uid, paging=str(options['paging']).lower(),
+            searchable=str(options['searchable']).lower(),
+            sortable=str(options['sortable']).lower(),
+            page_length=options['page_length'],
+            button_id=f"{self.uid}_exportButton", file_name=options['file_name']))
+
+    @property
+    def n_rows(self):
+        """Number of rows in the table body."""
+        return len(self.body.children)
+
+    def nbytes(self):
+        """Return the size of the table in a report, in bytes."""
+        return len(render_element(self).encode())
+
+    def truncate(self, n_rows):
+        """Keep only the first rows of the table, as a preview.
+
+        A note of the number of rows dropped is added below the table. All
+        rows are kept as a deflated CSV in the report, which the table's
+        export button (added if the table has none) downloads.
+
+        :param n_rows: number of rows to keep.
+        :returns: whether any rows were dropped.
+        """
+        total = self.n_rows
+        if total <= n_rows:
+            return False
+        payload = zlib.compress(self.to_csv().encode(), 9)
+        del self.body.children[n_rows:]
+        with self:
+            p(
+                f"Showing the first {n_rows} of {total} rows; the table was "
+                "truncated to limit the size of the report. Export CSV to "
+                "download all rows.",
+                className=cls("text-muted", "small"))
+            if not self._options['export']:
+                self._options['export'] = True
+                self._export_button()
+            self._full_data = script(
+                base64.b64encode(payload).decode(),
+                type='application/octet-stream', id=f"{self.uid}_data")
+        # the script binds to the export button so must follow it
+        self.children.remove(self._script)
+        self.children.append(self._script)
+        self._script.clear()
+        self._script.add(self._render_script())
+        return True
+
+    def to_csv(self):
+        """Return the text of the table's cells as CSV.
 
-            script(raw(render_template(
-                datatable_render,
-                id=self.uid, paging=str(paging).lower(),
-                searchable=str(searchable).lower(), sortable=str(sortable).lower(),
-                page_length=page_length,
-                button_id=exportCSVButton, file_name=file_name)))
+        Only the last row of a multi-level header is included.
+
+        :returns: CSV text.
+        """
+        def text(cell):
+            return ''.join(
+                x if isinstance(x, str) else
+                html.unescape(re.sub(r'<[^<>]*>', '', x.render(pretty=False)))
+                for x in cell.children)
+
+        out = io.StringIO()
+        writer = csv.writer(out, lineterminator='\n')
+        if self.head.children:
+            writer.writerow(text(x) for x in self.head.children[-1].children)
+        for row in self.body.children:
+            writer.writerow(text(x) for x in row.children)
+        return out.getvalue()
 
     def _is_multilevel_header(self, headers: list) -> bool:
         """Check if header list is a multi-level header (i.e. a list of lists).
@@ -129,20 +212,44 @@ class DataTable(Snippet):
                     td(raw(str(column)))
         return row
 
-    def _export_table(self, datatable_render) -> str:
+    def _export_button(self):
         """Add a button for exporting the datatable."""
-        # Add button
-        exportCSVButton = f"{self.uid}_exportButton"
-        button(
-            "Export CSV", id=exportCSVButton, type="button",
+        return button(
+            "Export CSV", id=f"{self.uid}_exportButton", type="button",
             className=cls("btn btn-outline-primary"))
-        datatable_render = datatable_render + \
+
+    def _export_table(self, datatable_render) -> str:
+        """Add the export button's handler to the datatable script."""
+        return datatable_render + \
             """
             document.getElementById('{{ button_id }}').addEventListener('click',\
             () => {{ id }}_table.export({ \
             type: 'csv', download: true, filename: '{{file_name}}'}))
             """
-        return datatable_render, exportCSVButton
+
+    def _export_full_data(self, datatable_render) -> str:
+        """Add a handler to the datatable script exporting all rows.
+
+        The rows of a truncated table are decoded from its deflated CSV.
+        """
+        return datatable_render + \
+            """
+            document.getElementById('{{ button_id }}').addEventListener('click',\
+            async () => { \
+                const text = atob(\
+                    document.getElementById('{{ id }}_data').textContent.trim()); \
+                const bytes = Uint8Array.from(text, (c) => c.charCodeAt(0)); \
+                const stream = new Blob([bytes]).stream().pipeThrough(\
+                    new DecompressionStream('deflate')); \
+                const csv = await new Response(stream).blob(); \
+                const link = document.createElement('a'); \
+                link.href = URL.createObjectURL(\
+                    new Blob([csv], {type: 'text/csv'})); \
+                link.download = '{{ file_name }}.csv'; \
+                link.click(); \
+                URL.revokeObjectURL(link.href); \
+            })
+            """
 
     @classmethod
     def from_pandas(
@@ -1,16 +1,28 @@
 """Useful reusable functions."""
+import base64
+from concurrent.futures import ProcessPoolExecutor
 import contextlib
+import functools
+import hashlib
 from importlib.resources import files
 import json
+import multiprocessing
 import os
 from typing import Dict
 import warnings
 
+from dominate import dom_tag
 from dominate.tags import script, style
 from dominate.util import container, raw, text
 from jinja2 import BaseLoader, Environment
 import sass
 
+try:
+    # not public API, see `context_ancestors()`
+    from dominate.dom_tag import _get_thread_context
+except ImportError:
+    _get_thread_context = None
+
 warnings.simplefilter("always", DeprecationWarning)
 
 
@@ -22,12 +34,22 @@ def load_json(
         return json.load(content)
 
 
+@functools.lru_cache(maxsize=None)
+def _read_file(path, mtime):
+    """Read a file, cached by path and modification time."""
+    with open(path, 'r', encoding='utf-8') as content:
+        return content.read()
+
+
 def inline(
     path: str
 ) -> text:
-    """Return a file as a string."""
-    with open(path, 'r', encoding='utf-8') as content:
-        return raw(content.read())
+    """Return a file as a string.
+
+    File contents are cached for the life of the process, so that reports
+    built one after another (see `ezcharts.batch`) read assets once.
+    """
+    return raw(_read_file(path, os.stat(path).st_mtime_ns))
 
 
 def resolve_import(path):
@@ -39,13 +61,22 @@ def resolve_import(path):
     return [[path]]
 
 
-def transpile(path):
-    """Compile scss to css."""
-    compiled = sass.compile(
+@functools.lru_cache(maxsize=None)
+def _compile_scss(path, mtime):
+    """Compile scss, cached by path and modification time."""
+    return sass.compile(
         filename=path,
         output_style='compressed',
         importers=[(0, resolve_import)])
-    return raw(compiled)
+
+
+def transpile(path):
+    """Compile scss to css.
+
+    Compiled stylesheets are cached for the life of the process, as for
+    `inline`. Changes to imported files alone are not detected.
+    """
+    return raw(_compile_scss(path, os.stat(path).st_mtime_ns))
 
 
 def inline_script(path):
@@ -65,6 +96,88 @@ def write_report(path, document):
         out.write(document.render())
 
 
+def write_asset(content, name, assets_dir=None):
+    """Write a shared asset under a name that includes a hash of its content.
+
+    Assets with the same content are written once: an existing file of the
+    same name is left in place.
+
+    :param content: text of the asset.
+    :param name: file name, e.g. "echarts.min.js", to which the hash is added.
+    :param assets_dir: directory in which to write the asset, created if it
+        does not exist. If None, nothing is written.
+    :returns: tuple of the file name and the subresource integrity value of
+        the asset.
+    """
+    data = content.encode()
+    stem, ext = os.path.splitext(name)
+    fname = f"{stem}.{hashlib.sha256(data).hexdigest()[:16]}{ext}"
+    integrity = "sha384-" + base64.b64encode(hashlib.sha384(data).digest()).decode()
+    if assets_dir is not None:
+        os.makedirs(assets_dir, exist_ok=True)
+        dest = os.path.join(assets_dir, fname)
+        if not os.path.exists(dest):
+            # write then move, as reports may be written concurrently
+            tmp = f"{dest}.{os.getpid()}.tmp"
+            with open(tmp, 'wb') as fh:
+                fh.write(data)
+            os.replace(tmp, dest)
+    return fname, integrity
+
+
+class rendered(text):
+    """The rendered HTML of a block element, standing in for the element."""
+
+    is_inline = False
+
+    def __init__(self, html):
+        """Create tag."""
+        super().__init__(html, escape=False)
+
+
+def render_element(element):
+    """Render an element exactly as it would be rendered within its document."""
+    indent_level, pretty = 0, True
+    parent = element.parent
+    while parent is not None:
+        indent_level += 1
+        pretty = pretty and parent.is_pretty
+        parent = parent.parent
+    return ''.join(element._render([], indent_level, '  ', pretty, False))
+
+
+# elements to render, set before forking worker processes which inherit them
+_fork_elements = None
+
+
+def _render_forked(index):
+    """Render an element inherited from the parent process."""
+    return render_element(_fork_elements[index])
+
+
+def render_elements(elements, threads=1):
+    """Render elements of a document, in parallel if `threads` > 1.
+
+    Worker processes are forked so that they inherit the document, which need
+    not be picklable (and is slow to pickle), and only send back HTML. Where
+    fork is not available the elements are rendered in this process.
+    """
+    global _fork_elements
+    if (
+        threads > 1 and len(elements) > 1
+        and 'fork' in multiprocessing.get_all_start_methods()
+    ):
+        _fork_elements = elements
+        try:
+            with ProcessPoolExecutor(
+                max_workers=threads, mp_context=multiprocessing.get_context('fork')
+            ) as executor:
+                return list(executor.map(_render_forked, range(len(elements))))
+        finally:
+            _fork_elements = None
+    return [render_element(element) for element in elements]
+
+
 def render_template(template, **kwargs):
     """Render a jinja2 template."""
     rtemplate = Environment(
@@ -104,3 +217,34 @@ def isolate_context():
         yield
     # remove everything that has been added to `c`
     c.clear()
+
+
+def context_elements():
+    """Return the elements of the current `dominate` contexts, innermost first.
+
+    `dominate` keeps the stack of `with` contexts of each thread privately.
+    Should it be unavailable (the version of `dominate` is pinned in the
+    requirements) only the innermost context, which is public, is returned.
+    """
+    contexts = getattr(dom_tag.dom_tag, '_with_contexts', None)
+    if _get_thread_context is None or contexts is None:
+        current = dom_tag.get_current(None)
+        return [] if current is None else [current]
+    return [frame.tag for frame in reversed(contexts.get(_get_thread_context(), ()))]
+
+
+def context_ancestors(element=None):
+    """Iterate over an element, its ancestors and those of the current contexts.
+
+    Elements created within nested `with` blocks are only added to their
+    parents as the blocks exit, so finding e.g. the report enclosing an
+    element being built needs each element of the context stack, searched
+    innermost first, along with its ancestors.
+
+    :param element: element to search first, e.g. one being created.
+    """
+    for tag in ([element] if element is not None else []) + context_elements():
+        while tag is not None:
+            yield tag
+            # the element may not have been initialised yet
+            tag = getattr(tag, 'parent', None)
@@ -1,6 +1,9 @@
 """Plotting functionality via echarts."""
 
+import copy
+
 from bokeh.plotting import figure
+import numpy as np
 import pandas as pd
 import sigfig
 
@@ -73,11 +76,16 @@ class AxisLabelFormatter(JSCode):
 class Plot(EChartsOption):
     """EChart plotting interface."""
 
+    # private state, kept out of the options and their serialisation.
+    # These must be set with object.__setattr__ to sidestep pydantic.
+    __slots__ = ('_axis_extents', '_axis_grid')
     _logger = ezutil.get_named_logger("EChrtPlotr")
 
     def __init__(self, *args, **kwargs):
         """Initialize a plot with defaults."""
         super().__init__(*args, **kwargs)
+        object.__setattr__(self, '_axis_extents', dict())
+        object.__setattr__(self, '_axis_grid', None)
         self.toolbox = {
             "show": True,
             "feature": {
@@ -88,6 +96,24 @@ class Plot(EChartsOption):
             }
         }
 
+    def __deepcopy__(self, memo):
+        """Copy the options along with the private state."""
+        new = self.__class__.__new__(self.__class__)
+        memo[id(self)] = new
+        state = copy.deepcopy(self.__getstate__(), memo)
+        if hasattr(new, '__setstate__'):
+            new.__setstate__(state)
+            object.__setattr__(
+                new, '_axis_grid',
+                copy.deepcopy(getattr(self, '_axis_grid', None), memo))
+        else:
+            # plain __slots__ models (see `_slots.py`) hold everything in slots
+            for name, value in state[1].items():
+                object.__setattr__(new, name, value)
+        # cached extents are keyed on the identity of the original datasets
+        object.__setattr__(new, '_axis_extents', dict())
+        return new
+
     @property
     def logger(self):
         """Return logger for class."""
@@ -123,6 +149,26 @@ class Plot(EChartsOption):
         """
         self.fix_axis_labels()
 
+    @property
+    def x_extent(self):
+        """Extent of the x-axis data of the datasets, or None."""
+        return self._limiter(0)
+
+    @property
+    def y_extent(self):
+        """Extent of the y-axis data of the datasets, or None."""
+        return self._limiter(1)
+
+    def _limiter(self, data_idx):
+        """Get the extent of a column of the datasets as a `util.Limiter`."""
+        try:
+            extent = self._axis_extent(data_idx, value_axis=True)
+        except IndexError:
+            return None
+        if extent is None:
+            return None
+        return util.Limiter(extent[:2])
+
     def _axes_dimensions(self):
         """Get axes for each dimension."""
         axes = list()
@@ -132,9 +178,64 @@ class Plot(EChartsOption):
             axes.append([self.yAxis, 1])
         return axes
 
+    @staticmethod
+    def _source_column(source, idx):
+        """Get a column of a dataset source as a numpy array."""
+        if isinstance(source, np.ndarray) and source.ndim == 2:
+            return source[:, idx]
+        # `source` could be a list of lists, or column-oriented; we'll
+        # transform it into a `pd.DataFrame` so that we can do column-wise
+        # indexing while preserving dtypes
+        return pd.DataFrame(source).iloc[:, idx].to_numpy()
+
+    def _axis_extent(self, data_idx, value_axis):
+        """Summarise the values for an axis, as needed to size its labels.
+
+        For value axes returns the minimum and maximum of the values along
+        with a handful of candidate tick values between them, for other axes
+        the distinct values. Results are cached against the datasets
+        used to compute them.
+        """
+        # Warning: Just taking the raw datasource here.
+        # Any plots with transformed data may not have axes setup correctly.
+        sources = [
+            ds.source for ds in (self.dataset or list())
+            if ds.source is not None]
+        key = (value_axis, tuple((id(x), len(x)) for x in sources))
+        cache = getattr(self, '_axis_extents', None)
+        if cache is None:
+            cache = dict()
+            object.__setattr__(self, '_axis_extents', cache)
+        cached = cache.get(data_idx)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        columns = [self._source_column(x, data_idx) for x in sources]
+        if value_axis:
+            values = np.concatenate(
+                [pd.to_numeric(x, errors='coerce') for x in columns]
+                or [np.array([])])
+            values = values[np.isfinite(values)]
+            if len(values) == 0:
+                extent = None
+            else:
+                lo, hi = values.min(), values.max()
+                ticks = np.linspace(lo, hi, 6)
+                if np.issubdtype(values.dtype, np.integer):
+                    ticks = np.round(ticks).astype(values.dtype)
+                extent = (lo, hi, ticks)
+        else:
+            extent = pd.unique(np.concatenate(
+                [pd.unique(x).astype(object) for x in columns]
+                or [np.array([], dtype=object)]))
+        cache[data_idx] = (key, extent)
+        return extent
+
     def fix_axis_labels(self):
         """Try to place axis labels so that they don't overlap tick labels."""
-        if hasattr(self, 'grid') and self.grid is not None:
+        own_grid = self.grid is not None and self.grid is getattr(
+            self, '_axis_grid', None)
+        if hasattr(self, 'grid') and self.grid is not None and not own_grid:
             self.logger.warning(
                 "Cannot correct axis labels in complicated scenarios.")
             return
@@ -145,22 +246,13 @@ class Plot(EChartsOption):
 
         # to make space for axis labels we shrink the plot by setting a grid
         # and changing the margins of its sole component
-        self.grid = dict()
+        if not own_grid:
+            self.grid = dict()
+            object.__setattr__(self, '_axis_grid', self.grid)
 
         for axis, data_idx in axes:
             axis.nameLocation = 'middle'  # 'cos eCharts its weird
 
-            # Get all the raw values from each dataset that contains a source.
-            # Warning: Just taking the raw datasource here.
-            # Any plots with transformed data may not have axes setup correctly.
-            raw_vals = []
-            for ds in self.dataset:
-                if ds.source is not None:
-                    # `ds.source` could be a numpy array or just a list of lists; we'll
-                    # transform it into a `pd.DataFrame` so that we can do column-wise
-                    # indexing while preserving dtypes
-                    raw_vals.extend(pd.DataFrame(ds.source).iloc[:, data_idx])
-
             # Allow formatter to be set by user.
             if axis.axisLabel is None:
                 axis.axisLabel = dict(formatter=AxisLabelFormatter())
@@ -168,19 +260,29 @@ class Plot(EChartsOption):
                 axis.axisLabel.formatter = AxisLabelFormatter()
 
             if axis.type == 'value':
-                is_sci = axis.axisLabel.formatter.apply(raw_vals)
-                # If using sci. notation, there will be 4-5 characters in the label
-                if is_sci:
-                    max_n_label_digits = 5
+                extent = self._axis_extent(data_idx, value_axis=True)
+                if extent is None:
+                    axis.axisLabel.formatter.apply()
+                    max_n_label_digits = 1
                 else:
-                    round_vals = [
-                        sigfig.round(val, sigfigs=1) for val in raw_vals]
-                    max_n_label_digits = max([len(str(x)) for x in round_vals])
+                    lo, hi, ticks = extent
+                    # the formatter only considers the extremes
+                    is_sci = axis.axisLabel.formatter.apply([lo, hi])
+                    # If using sci. notation, there will be 4-5 characters in
+                    # the label, else estimate from a few candidate ticks
+                    if is_sci:
+                        max_n_label_digits = 5
+                    else:
+                        max_n_label_digits = max(
+                            len(str(sigfig.round(val, sigfigs=1)))
+                            for val in (lo, hi, *ticks))
             else:
                 axis.axisLabel.formatter.apply()
-                max_n_label_digits = max([len(str(x)) for x in raw_vals])
+                extent = self._axis_extent(data_idx, value_axis=False)
+                max_n_label_digits = max(
+                    (len(str(x)) for x in extent), default=1)
 
-            if axis == self.xAxis:
+            if data_idx == 0:
                 name_offset = 25
                 try:
                     rotation = axis.axisLabel.rotate
@@ -190,8 +292,7 @@ class Plot(EChartsOption):
                     # Rotation makes axis labels project downwards more
                     name_offset = 25 + max_n_label_digits * 4
                     self.grid.bottom = name_offset + 15
-
-            elif axis == self.yAxis:
+            else:
                 name_offset = 20 + max_n_label_digits * 6
                 self.grid.left = name_offset + 10
 
@@ -234,12 +335,34 @@ class BokehPlot:
         self._fig.xaxis.major_tick_line_color = axis_color
         self._fig.yaxis.major_tick_line_color = axis_color
         self._fig.title.text_font_size = "18px"
+        # extents of the data drawn, see `accumulate_extents()`
+        self.x_extent = util.Limiter()
+        self.y_extent = util.Limiter()
 
     @property
     def logger(self):
         """Return logger for class."""
         return self._logger
 
+    def accumulate_extents(self, x=None, y=None):
+        """Record the extent of data drawn on the figure.
+
+        Plotting functions call this as they add glyphs so that the
+        extents are available without reading back the data sources,
+        e.g. for `util.link_axes()`. Non-numeric (categorical) data is
+        ignored.
+
+        :param x: x-axis values drawn.
+        :param y: y-axis values drawn.
+        """
+        for limiter, data in ((self.x_extent, x), (self.y_extent, y)):
+            if data is None:
+                continue
+            data = np.asarray(data)
+            if np.issubdtype(data.dtype, np.number):
+                limiter.accumulate(data)
+        return self
+
 
 class _NoAxisFixPlot(Plot):
     def __init__(self, *args, **kwargs):
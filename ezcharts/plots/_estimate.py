@@ -0,0 +1,222 @@
+"""Grouped estimates with error intervals, computed for all groups at once.
+
+This stands in for seaborn's `EstimateAggregator`, which is called once per
+group and bootstraps by resampling each group in a Python loop. Here values
+are sorted by group once and estimates, spreads and percentiles are read
+from the sorted values with array operations. Bootstrap samples are drawn
+for all groups together, in batches of samples to bound memory. Estimators
+or error bars given as functions, and sampling units, are handed to
+seaborn group by group.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+from seaborn._statistics import EstimateAggregator
+
+from ezcharts import kernels
+
+
+__all__ = ["grouped_estimate"]
+
+# number of values drawn at once while bootstrapping
+BOOTSTRAP_BATCH = 2 ** 22
+# beyond this many draws, bootstrap intervals of means and sums are replaced by
+# their normal approximation, which the bootstrap tends to for large groups
+MAX_BOOTSTRAP_DRAWS = 2 ** 25
+
+ESTIMATORS = ("mean", "median", "sum", "min", "max", "std", "var")
+# numpy functions that defer to the pandas methods of the same name, so
+# ignore NaNs like the named estimators
+_NUMPY_ESTIMATORS = {
+    np.mean: "mean", np.sum: "sum", np.min: "min", np.max: "max"}
+
+
+def _errorbar_spec(errorbar):
+    """Return the method and level of an errorbar argument."""
+    if errorbar is None or callable(errorbar):
+        return errorbar, None
+    if isinstance(errorbar, str):
+        return errorbar, {"ci": 95, "pi": 95, "se": 1, "sd": 1}[errorbar]
+    method, level = errorbar
+    return method, level
+
+
+def _lerp(a, b, t):
+    """Interpolate between a and b, as `np.percentile` does."""
+    diff = b - a
+    return np.where(t >= 0.5, b - diff * (1 - t), a + diff * t)
+
+
+class _SortedGroups:
+    """Values sorted by group, with the extents of each group."""
+
+    def __init__(self, values, codes, n_groups):
+        order = np.lexsort((values, codes))
+        self.values = values[order]
+        self.codes = codes[order]
+        self.n_groups = n_groups
+        self.counts = np.bincount(codes, minlength=n_groups)
+        self.first = np.cumsum(self.counts) - self.counts
+
+    def percentile(self, q):
+        """Return a percentile of each group, NaN for empty groups."""
+        out = np.full(self.n_groups, np.nan)
+        has = self.counts > 0
+        index = q / 100 * (self.counts[has] - 1)
+        lo = np.floor(index).astype(np.int64)
+        hi = np.minimum(lo + 1, self.counts[has] - 1)
+        out[has] = _lerp(
+            self.values[self.first[has] + lo], self.values[self.first[has] + hi],
+            index - lo)
+        return out
+
+
+def _estimate(estimator, values, codes, n_groups):
+    """Return an estimate for each group of values.
+
+    :param values: values, grouped together for min and max.
+    :param codes: group of each value, sorted for min and max.
+    """
+    counts = np.bincount(codes, minlength=n_groups)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if estimator == "sum":
+            return np.bincount(codes, weights=values, minlength=n_groups)
+        if estimator == "median":
+            return kernels.grouped_median(codes, values, n_groups)
+        if estimator in ("min", "max"):
+            out = np.full(n_groups, np.nan)
+            has = counts > 0
+            reduce = np.minimum if estimator == "min" else np.maximum
+            out[has] = reduce.reduceat(values, (np.cumsum(counts) - counts)[has])
+            return out
+        mean = np.bincount(codes, weights=values, minlength=n_groups) / counts
+        if estimator == "mean":
+            return mean
+        squares = np.bincount(
+            codes, weights=(values - mean[codes]) ** 2, minlength=n_groups)
+        var = np.where(counts > 1, squares, np.nan) / (counts - 1)
+        return var if estimator == "var" else np.sqrt(var)
+
+
+def _bootstrap(groups, estimator, n_boot, rng):
+    """Return bootstrap estimates, with a row for each sample."""
+    n = len(groups.values)
+    batch = max(1, BOOTSTRAP_BATCH // max(n, 1))
+    boots = np.empty((n_boot, groups.n_groups))
+    starts = groups.first[groups.codes]
+    sizes = groups.counts[groups.codes]
+    for start in range(0, n_boot, batch):
+        size = min(batch, n_boot - start)
+        # resample each group from within itself, for several samples at once
+        draws = starts + rng.integers(0, sizes, size=(size, n))
+        if estimator == "median":
+            # values are sorted within groups, so sorting the draws sorts
+            # each group of the samples and medians can be read off directly
+            draws.sort(axis=1)
+            has = groups.counts > 0
+            first, count = groups.first[has], groups.counts[has]
+            boots[start:start + size] = np.nan
+            boots[start:start + size, has] = (
+                groups.values[draws[:, first + (count - 1) // 2]]
+                + groups.values[draws[:, first + count // 2]]) / 2
+            continue
+        # give each sample its own groups, which keeps the codes sorted
+        codes = groups.codes + groups.n_groups * np.arange(size)[:, None]
+        boots[start:start + size] = _estimate(
+            estimator, groups.values[draws].ravel(), codes.ravel(),
+            size * groups.n_groups).reshape(size, groups.n_groups)
+    return boots
+
+
+def _grouped_estimate_seaborn(
+        values, codes, n_groups, estimator, errorbar, n_boot, seed, units):
+    """Estimate group by group with seaborn."""
+    agg = EstimateAggregator(estimator, errorbar, n_boot=n_boot, seed=seed)
+    out = np.full((3, n_groups), np.nan)
+    data = pd.DataFrame({"y": values})
+    if units is not None:
+        data["units"] = units
+    for code, group in data.groupby(codes):
+        res = agg(group, "y")
+        out[:, code] = res["y"], res["ymin"], res["ymax"]
+    return out
+
+
+def grouped_estimate(
+        values, codes, n_groups, estimator="mean", errorbar=("ci", 95),
+        n_boot=1000, seed=None, units=None, max_draws=MAX_BOOTSTRAP_DRAWS):
+    """Estimate a statistic and error interval for groups of values.
+
+    This matches seaborn's `EstimateAggregator` applied to each group: error
+    intervals are NaN for groups of fewer than two values and estimates are
+    NaN (zero for sums) for empty groups. NaN values are ignored. Bootstrap
+    intervals use different random samples to seaborn's.
+
+    :param values: values to aggregate.
+    :param codes: group, from `0` to `n_groups - 1`, of each value.
+    :param n_groups: number of groups.
+    :param estimator: name of a statistic, see `ESTIMATORS`, or a function
+        mapping a Series to a value.
+    :param errorbar: None, a method name ("ci", "pi", "se" or "sd"), a tuple
+        of a method name and level, or a function mapping a Series to an
+        interval. As in seaborn, "ci" gives a bootstrap confidence interval.
+    :param n_boot: number of bootstrap samples.
+    :param seed: seed or generator for bootstrap samples.
+    :param units: sampling units of the values, for the bootstrap.
+    :param max_draws: number of values to draw for bootstrap intervals of
+        means or sums, above which the normal approximation is used instead.
+        None to always bootstrap.
+    :returns: array of estimates, lower and upper bounds, of shape
+        `(3, n_groups)`.
+    """
+    values = np.asarray(values, dtype=float)
+    codes = np.asarray(codes, dtype=np.int64)
+    estimator = _NUMPY_ESTIMATORS.get(estimator, estimator)
+    method, level = _errorbar_spec(errorbar)
+    seaborn = (
+        estimator not in ESTIMATORS or callable(method)
+        or units is not None and method == "ci")
+    if seaborn:
+        return _grouped_estimate_seaborn(
+            values, codes, n_groups, estimator, errorbar, n_boot, seed, units)
+
+    present = ~np.isnan(values)
+    groups = _SortedGroups(values[present], codes[present], n_groups)
+    estimate = _estimate(estimator, groups.values, groups.codes, n_groups)
+    lower = upper = np.full(n_groups, np.nan)
+    single = groups.counts < 2
+    if method in ("sd", "se"):
+        std = _estimate("std", groups.values, groups.codes, n_groups)
+        half = level * (std if method == "sd" else std / np.sqrt(groups.counts))
+        lower, upper = estimate - half, estimate + half
+    elif method == "pi":
+        edge = (100 - level) / 2
+        lower, upper = groups.percentile(edge), groups.percentile(100 - edge)
+    elif method == "ci" and not np.all(single):
+        edge = (100 - level) / 2
+        draws = n_boot * len(groups.values)
+        normal = (
+            max_draws is not None and draws > max_draws
+            and estimator in ("mean", "sum"))
+        if normal:
+            std = _estimate("std", groups.values, groups.codes, n_groups)
+            half = stats.norm.ppf(1 - edge / 100) * std / np.sqrt(groups.counts)
+            if estimator == "sum":
+                half = half * groups.counts
+            lower, upper = estimate - half, estimate + half
+        else:
+            rng = seed
+            if not isinstance(seed, np.random.Generator):
+                if isinstance(seed, np.random.RandomState):
+                    seed = seed.randint(2 ** 32)
+                rng = np.random.default_rng(seed)
+            boots = _bootstrap(groups, estimator, n_boot, rng)
+            lower, upper = np.full((2, n_groups), np.nan)
+            lower[~single], upper[~single] = np.nanpercentile(
+                boots[:, ~single], [edge, 100 - edge], axis=0)
+    elif method is not None and method != "ci":
+        raise ValueError(f"Unknown errorbar method: {method}.")
+    lower = np.where(single, np.nan, lower)
+    upper = np.where(single, np.nan, upper)
+    return np.array([estimate, lower, upper])
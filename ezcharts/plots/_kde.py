@@ -0,0 +1,160 @@
+"""Gaussian kernel density estimation by linear binning and FFT.
+
+`scipy.stats.gaussian_kde`, which seaborn's `KDE` uses, evaluates every
+kernel at every grid point. Here the (weighted) data are instead spread
+onto a fine regular grid by linear binning and convolved with the kernel
+by FFT, so the cost is linear in the number of values. The bandwidth is
+chosen by the same rules as scipy, and the evaluation grid defaults to
+seaborn's, so the two estimates agree to within the binning error.
+"""
+
+import numpy as np
+from scipy import fft as sp_fft
+from scipy import special, stats
+
+
+__all__ = ["fft_kde"]
+
+# kernels are truncated this many bandwidths from their centre
+KERNEL_CUTOFF = 8
+# the binning grid is refined so that a bandwidth spans this many bins
+BINS_PER_BANDWIDTH = 16
+MAX_BINS = 2 ** 22
+
+
+def _bandwidth(x, weights, frequency_weights, bw_method, bw_adjust):
+    """Return the kernel standard deviation, as chosen by scipy."""
+    if callable(bw_method):
+        if frequency_weights:
+            raise ValueError(
+                "`bw_method` cannot be a function with frequency weights.")
+        kde = stats.gaussian_kde(x, bw_method=bw_method, weights=weights)
+        return np.sqrt(kde.covariance.squeeze()) * bw_adjust
+    total = weights.sum()
+    mean = np.dot(weights, x) / total
+    squares = np.dot(weights, (x - mean) ** 2)
+    if frequency_weights:
+        neff, var = total, squares / (total - 1)
+    else:
+        neff = total ** 2 / np.dot(weights, weights)
+        var = squares / (total - np.dot(weights, weights) / total)
+    if bw_method is None or bw_method == "scott":
+        factor = neff ** -0.2
+    elif bw_method == "silverman":
+        factor = (neff * 3 / 4) ** -0.2
+    elif np.isscalar(bw_method) and not isinstance(bw_method, str):
+        factor = bw_method
+    else:
+        raise ValueError(
+            "`bw_method` should be 'scott', 'silverman', a scalar or a function.")
+    return np.sqrt(var) * factor * bw_adjust
+
+
+def _support(x, bw, gridsize, cut, clip):
+    """Return seaborn's evaluation grid."""
+    clip_lo = -np.inf if clip[0] is None else clip[0]
+    clip_hi = np.inf if clip[1] is None else clip[1]
+    lo = max(x.min() - bw * cut, clip_lo)
+    hi = min(x.max() + bw * cut, clip_hi)
+    return np.linspace(lo, hi, gridsize)
+
+
+def _linear_bin(x, weights, start, delta, n_bins):
+    """Spread weights between the two nearest points of a regular grid."""
+    position = (x - start) / delta
+    index = np.clip(np.floor(position).astype(np.int64), 0, n_bins - 2)
+    frac = position - index
+    return (
+        np.bincount(index, weights=weights * (1 - frac), minlength=n_bins)
+        + np.bincount(index + 1, weights=weights * frac, minlength=n_bins))
+
+
+def _convolve(binned, kernel, half):
+    """Convolve binned data with a kernel centred at index `half`."""
+    size = sp_fft.next_fast_len(len(binned) + half, real=True)
+    wrapped = np.zeros(size)
+    wrapped[:half + 1] = kernel[half:]
+    wrapped[size - half:] = kernel[:half]
+    out = sp_fft.irfft(
+        sp_fft.rfft(binned, size) * sp_fft.rfft(wrapped), size)
+    return out[:len(binned)]
+
+
+def fft_kde(
+        x, weights=None, *, frequency_weights=False, bw_method="scott",
+        bw_adjust=1, gridsize=200, cut=3, clip=None, cumulative=False,
+        support=None):
+    """Estimate a univariate density with a Gaussian kernel.
+
+    The arguments follow seaborn's `KDE`, which this approximates.
+
+    :param x: values.
+    :param weights: weights of the values. As for scipy these are
+        importance weights, so the effective sample size used for the
+        bandwidth is `sum(weights) ** 2 / sum(weights ** 2)`, unless
+        `frequency_weights` is set.
+    :param frequency_weights: treat weights as counts of each value, for
+        example of histogram bins, so that the estimate is that of the data
+        with each value repeated.
+    :param bw_method: "scott", "silverman", a scalar factor of the data
+        standard deviation, or a function of a `gaussian_kde`.
+    :param bw_adjust: factor by which to scale the bandwidth.
+    :param gridsize: number of points in the evaluation grid.
+    :param cut: distance, in bandwidths, by which the grid extends beyond
+        the data.
+    :param clip: pair of limits to which the grid is restricted.
+    :param cumulative: estimate the cumulative distribution, from the
+        start of the grid.
+    :param support: evenly spaced points at which to evaluate the estimate,
+        in place of the grid given by `gridsize`, `cut` and `clip`.
+    :returns: tuple of density and support arrays.
+    """
+    x = np.asarray(x, dtype=float).ravel()
+    weights = np.ones_like(x) if weights is None else \
+        np.asarray(weights, dtype=float).ravel()
+    keep = np.isfinite(x) & (weights > 0)
+    x, weights = x[keep], weights[keep]
+    if len(x) == 0:
+        raise ValueError("No data for kernel density estimation.")
+    bw = _bandwidth(x, weights, frequency_weights, bw_method, bw_adjust)
+    if not np.isfinite(bw) or bw <= 0:
+        raise ValueError(
+            "Data has no variance, so its density cannot be estimated.")
+
+    if support is None:
+        clip = (None, None) if clip is None else clip
+        support = _support(x, bw, gridsize, cut, clip)
+    support = np.asarray(support, dtype=float)
+    if len(support) > 1:
+        spacing = (support[-1] - support[0]) / (len(support) - 1)
+        if not np.allclose(np.diff(support), spacing):
+            raise ValueError("`support` must be evenly spaced.")
+    else:
+        spacing = bw
+
+    # bin on a grid which includes the support and extends over all the data
+    refine = int(np.ceil(spacing * BINS_PER_BANDWIDTH / bw))
+    lo = min(support[0], x.min())
+    hi = max(support[-1], x.max())
+    refine = max(1, min(refine, int(MAX_BINS * spacing / (hi - lo + spacing))))
+    delta = spacing / refine
+    offset = int(np.ceil((support[0] - lo) / delta))
+    start = support[0] - offset * delta
+    n_bins = int(np.ceil((hi - start) / delta)) + 2
+    binned = _linear_bin(x, weights, start, delta, n_bins)
+
+    half = min(n_bins, int(np.ceil(KERNEL_CUTOFF * bw / delta)))
+    z = np.arange(-half, half + 1) * delta / bw
+    if cumulative:
+        kernel = special.ndtr(z)
+        values = _convolve(binned, kernel, half)
+        # beyond the truncated kernel, bins to the left count in full
+        before = np.concatenate([np.zeros(half + 1), np.cumsum(binned)])
+        values += before[:n_bins]
+    else:
+        kernel = np.exp(-0.5 * z ** 2) / (np.sqrt(2 * np.pi) * bw)
+        values = _convolve(binned, kernel, half)
+    values = values[offset::refine][:len(support)] / weights.sum()
+    if cumulative:
+        values -= values[0]
+    return np.clip(values, 0, None), support
@@ -0,0 +1,344 @@
+# flake8: noqa
+# generated by datamodel-codegen:
+#   filename:  schema.json.clean
+#   timestamp: 2026-10-19T02:20:44+00:00
+
+from __future__ import annotations
+
+from ezcharts.plots.util import JSCode
+
+from typing import Any
+
+from ezcharts.plots._base import BaseModel
+
+
+class SubtextStyle(BaseModel):
+    fontStyle: str | None = None
+    color: Any | None = None
+
+
+class Title(BaseModel):
+    text: str | None = None
+    subtext: str | None = None
+    left: str | float | None = None
+    itemGap: float | None = None
+    subtextStyle: SubtextStyle | None = None
+
+
+class SaveAsImage(BaseModel):
+    show: bool | None = None
+    name: str | None = None
+
+
+class DataZoom(BaseModel):
+    show: bool | None = None
+
+
+class DataView(BaseModel):
+    show: bool | None = None
+    readOnly: bool | None = None
+
+
+class Restore(DataZoom):
+    pass
+
+
+class Feature(BaseModel):
+    saveAsImage: SaveAsImage | None = None
+    dataZoom: DataZoom | None = None
+    dataView: DataView | None = None
+    restore: Restore | None = None
+
+
+class Toolbox(BaseModel):
+    show: bool | None = None
+    feature: Feature | None = None
+
+
+class AxisPointer(BaseModel):
+    type: str | None = None
+
+
+class Tooltip(BaseModel):
+    show: bool | None = None
+    trigger: str | None = None
+    formatter: str | Any | None = None
+    axisPointer: AxisPointer | None = None
+
+
+class Legend(BaseModel):
+    show: bool | None = None
+    data: Any | None = None
+    orient: str | None = None
+    left: str | float | None = None
+    top: str | float | None = None
+
+
+class Grid(BaseModel):
+    left: str | float | None = None
+    right: str | float | None = None
+    top: str | float | None = None
+    bottom: str | float | None = None
+    width: str | float | None = None
+    height: str | float | None = None
+    containLabel: bool | None = None
+
+
+class AxisLabel(BaseModel):
+    show: bool | None = None
+    interval: str | float | None = None
+    rotate: float | None = None
+    formatter: str | Any | None = None
+    fontSize: float | None = None
+
+
+class AxisTick(BaseModel):
+    show: bool | None = None
+    alignWithLabel: bool | None = None
+
+
+class AxisLine(BaseModel):
+    show: bool | None = None
+    onZero: bool | None = None
+
+
+class SplitLine(DataZoom):
+    pass
+
+
+class XAxis(BaseModel):
+    show: bool | None = None
+    type: str | None = None
+    name: str | None = None
+    nameLocation: str | None = None
+    nameGap: float | None = None
+    gridIndex: float | None = None
+    min: str | float | None = None
+    max: str | float | None = None
+    interval: float | None = None
+    position: str | None = None
+    data: Any | None = None
+    axisLabel: AxisLabel | None = None
+    axisTick: AxisTick | None = None
+    axisLine: AxisLine | None = None
+    splitLine: SplitLine | None = None
+    scale: bool | None = None
+
+
+class YAxis(XAxis):
+    pass
+
+
+class Dataset(BaseModel):
+    id: str | None = None
+    dimensions: Any | None = None
+    source: Any | None = None
+    fromDatasetIndex: float | None = None
+    transform: Any | None = None
+
+
+class InRange(BaseModel):
+    color: Any | None = None
+
+
+class VisualMap(BaseModel):
+    type: str | None = 'continuous'
+    min: float | None = None
+    max: float | None = None
+    calculable: bool | None = None
+    left: str | float | None = None
+    top: str | float | None = None
+    orient: str | None = None
+    show: bool | None = None
+    seriesIndex: float | None = None
+    text: Any | None = None
+    inRange: InRange | None = None
+    dimension: float | None = None
+
+
+class ItemStyle(BaseModel):
+    color: Any | None = None
+    borderColor: Any | None = None
+    borderWidth: float | None = None
+    borderJoin: str | None = None
+    borderCap: str | None = None
+    shadowBlur: float | None = None
+    shadowColor: Any | None = None
+
+
+class Label(BaseModel):
+    show: bool | None = None
+    rotate: str | float | None = None
+    minAngle: float | None = None
+    fontSize: float | None = None
+    interval: str | float | None = None
+    formatter: str | Any | None = None
+    position: str | None = None
+
+
+class Emphasis(BaseModel):
+    itemStyle: ItemStyle | None = None
+    focus: str | None = None
+
+
+class Tooltip1(BaseModel):
+    formatter: str | Any | None = None
+
+
+class Series(BaseModel):
+    id: str | None = None
+    name: str | None = None
+    datasetIndex: float | None = None
+    xAxisIndex: float | None = None
+    yAxisIndex: float | None = None
+    itemStyle: ItemStyle | None = None
+    label: Label | None = None
+    emphasis: Emphasis | None = None
+    encode: Any | None = None
+    data: Any | None = None
+    symbolSize: float | None = None
+    tooltip: Tooltip1 | None = None
+    type: str | None = 'line'
+    smooth: bool | None = None
+    showSymbol: bool | None = None
+
+
+class Emphasis1(Emphasis):
+    pass
+
+
+class Series1(BaseModel):
+    id: str | None = None
+    name: str | None = None
+    datasetIndex: float | None = None
+    xAxisIndex: float | None = None
+    yAxisIndex: float | None = None
+    itemStyle: ItemStyle | None = None
+    label: Label | None = None
+    emphasis: Emphasis1 | None = None
+    encode: Any | None = None
+    data: Any | None = None
+    symbolSize: float | None = None
+    tooltip: Tooltip1 | None = None
+    type: str | None = 'bar'
+    stack: str | None = None
+
+
+class Emphasis2(Emphasis):
+    pass
+
+
+class Series2(BaseModel):
+    id: str | None = None
+    name: str | None = None
+    datasetIndex: float | None = None
+    xAxisIndex: float | None = None
+    yAxisIndex: float | None = None
+    itemStyle: ItemStyle | None = None
+    label: Label | None = None
+    emphasis: Emphasis2 | None = None
+    encode: Any | None = None
+    data: Any | None = None
+    symbolSize: float | None = None
+    tooltip: Tooltip1 | None = None
+    type: str | None = 'scatter'
+
+
+class Emphasis3(Emphasis):
+    pass
+
+
+class Series3(BaseModel):
+    id: str | None = None
+    name: str | None = None
+    datasetIndex: float | None = None
+    xAxisIndex: float | None = None
+    yAxisIndex: float | None = None
+    itemStyle: ItemStyle | None = None
+    label: Label | None = None
+    emphasis: Emphasis3 | None = None
+    encode: Any | None = None
+    data: Any | None = None
+    symbolSize: float | None = None
+    tooltip: Tooltip1 | None = None
+    type: str | None = 'heatmap'
+
+
+class Emphasis4(Emphasis):
+    pass
+
+
+class Series4(BaseModel):
+    id: str | None = None
+    name: str | None = None
+    datasetIndex: float | None = None
+    xAxisIndex: float | None = None
+    yAxisIndex: float | None = None
+    itemStyle: ItemStyle | None = None
+    label: Label | None = None
+    emphasis: Emphasis4 | None = None
+    encode: Any | None = None
+    data: Any | None = None
+    symbolSize: float | None = None
+    tooltip: Tooltip1 | None = None
+    type: str | None = 'custom'
+    renderItem: JSCode | None = None
+
+
+class Emphasis5(Emphasis):
+    pass
+
+
+class Series5(BaseModel):
+    id: str | None = None
+    name: str | None = None
+    datasetIndex: float | None = None
+    xAxisIndex: float | None = None
+    yAxisIndex: float | None = None
+    itemStyle: ItemStyle | None = None
+    label: Label | None = None
+    emphasis: Emphasis5 | None = None
+    encode: Any | None = None
+    data: Any | None = None
+    symbolSize: float | None = None
+    tooltip: Tooltip1 | None = None
+    type: str | None = 'sunburst'
+    radius: Any | None = None
+
+
+class Emphasis6(Emphasis):
+    pass
+
+
+class Series6(BaseModel):
+    id: str | None = None
+    name: str | None = None
+    datasetIndex: float | None = None
+    xAxisIndex: float | None = None
+    yAxisIndex: float | None = None
+    itemStyle: ItemStyle | None = None
+    label: Label | None = None
+    emphasis: Emphasis6 | None = None
+    encode: Any | None = None
+    data: Any | None = None
+    symbolSize: float | None = None
+    tooltip: Tooltip1 | None = None
+    type: str | None = 'boxplot'
+
+
+class EChartsOption(BaseModel):
+    title: Title | None = None
+    toolbox: Toolbox | None = None
+    tooltip: Tooltip | None = None
+    legend: Legend | None = None
+    grid: list[Grid] | Grid | None = None
+    xAxis: list[XAxis] | XAxis | None = None
+    yAxis: list[YAxis] | YAxis | None = None
+    dataset: list[Dataset] | Dataset | None = None
+    visualMap: list[VisualMap] | None = None
+    series: (
+        list[Series | Series1 | Series2 | Series3 | Series4 | Series5 | Series6] | None
+    ) = None
+    color: Any | None = None
+    backgroundColor: Any | None = None
+    animation: bool | None = None
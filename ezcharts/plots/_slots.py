@@ -0,0 +1,222 @@
+"""Lightweight slotted base class for eCharts Options Model.
+
+This is the runtime counterpart to `generate-model.py --slots`. Generated
+classes are plain `__slots__` classes that describe their fields through a
+few class-level tables rather than pydantic field definitions:
+
+* `_fields`: the attribute names of the option.
+* `_aliases`: attribute name -> JSON key, for keys that are not identifiers.
+* `_children`: attribute name -> child class (or tuple of candidate classes)
+  used to coerce dictionaries assigned to that attribute.
+* `_types`: attribute name -> eCharts schema type names, used only by the
+  optional validation pass.
+* `_tag`: the value of a constant `type` property (e.g. `"line"` for a line
+  series), used to pick between candidate classes of a union.
+
+Assignments are not validated by default; set `EZCHARTS_VALIDATE=1` to check
+values against the schema types as they are set, or call `.validate()`.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from ezcharts.plots.util import JSCode
+
+
+VALIDATE = os.environ.get("EZCHARTS_VALIDATE") == "1"
+
+json_encoders = {
+    pd.core.indexes.base.Index: lambda x: x.to_list(),
+    pd.Series: lambda x: x.to_json(),
+    np.ndarray: lambda x: x.tolist(),
+    np.number: lambda x: float(x),
+    JSCode: lambda x: x.to_json()}
+
+_python_types = {
+    "string": (str, JSCode),
+    "color": (str, JSCode),
+    "number": (int, float, np.number),
+    "boolean": (bool, np.bool_),
+    "array": (list, tuple, np.ndarray, pd.Series, pd.core.indexes.base.Index),
+    "function": (str, JSCode)}
+
+
+def _encode(value):
+    """Encode values the standard JSON encoder does not understand."""
+    for kind, encoder in json_encoders.items():
+        if isinstance(value, kind):
+            return encoder(value)
+    raise TypeError(
+        f"Object of type '{value.__class__.__name__}' is not JSON serializable")
+
+
+def _serialise(value, **kwargs):
+    """Recursively convert models within a value to dictionaries."""
+    if isinstance(value, SlotsModel):
+        return value.dict(**kwargs)
+    if isinstance(value, (list, tuple)):
+        return [_serialise(x, **kwargs) for x in value]
+    if isinstance(value, dict):
+        return {k: _serialise(v, **kwargs) for k, v in value.items()}
+    return value
+
+
+class SlotsModel:
+    """Base class for slotted eCharts Options."""
+
+    # Note: this class's name in referenced in generate-model.py
+    __slots__ = ()
+    _fields = ()
+    _field_set = frozenset()
+    _keys = {}
+    _aliases = {}
+    _children = {}
+    _types = {}
+    _tag = None
+
+    def __init_subclass__(cls, **kwargs):
+        """Build lookup tables for generated subclasses."""
+        super().__init_subclass__(**kwargs)
+        if "_fields" in cls.__dict__:
+            cls._field_set = frozenset(cls._fields)
+            cls._keys = {
+                cls._aliases.get(name, name): name for name in cls._fields}
+
+    def __init__(self, **data):
+        """Initialize the option with keyword arguments."""
+        for key, value in data.items():
+            setattr(self, self._keys.get(key, key), value)
+
+    def __getattr__(self, name):
+        """Return None for fields that have not been set."""
+        # only called when normal lookup fails, i.e. for unset slots
+        if name in self._field_set:
+            return None
+        raise AttributeError(
+            f"'{self.__class__.__name__}' object has no attribute '{name}'")
+
+    def __setattr__(self, name, value):
+        """Set a field, coercing dictionaries to child options."""
+        if name not in self._field_set:
+            if name.startswith("_"):
+                object.__setattr__(self, name, value)
+                return
+            raise ValueError(
+                f'"{self.__class__.__name__}" object has no field "{name}"')
+        if VALIDATE:
+            self._check(name, value)
+        if name in self._children:
+            value = self._coerce(self._children[name], value)
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name):
+        """Unset a field."""
+        try:
+            object.__delattr__(self, name)
+        except AttributeError:
+            if name not in self._field_set:
+                raise
+
+    def __eq__(self, other):
+        """Compare options by their set fields."""
+        if not isinstance(other, SlotsModel):
+            return NotImplemented
+        return self.dict() == other.dict()
+
+    def __repr__(self):
+        """Represent the option by its set fields."""
+        fields = ", ".join(f"{k}={v!r}" for k, v in self._items())
+        return f"{self.__class__.__name__}({fields})"
+
+    @classmethod
+    def _coerce(cls, child, value):
+        """Convert a dictionary (or list of dictionaries) to child options."""
+        if isinstance(value, dict):
+            return cls._resolve(child, value)(**value)
+        if isinstance(value, list):
+            return [cls._coerce(child, x) for x in value]
+        return value
+
+    @staticmethod
+    def _resolve(child, value):
+        """Choose the class to build from a dictionary."""
+        if not isinstance(child, tuple):
+            return child
+        tag = value.get("type")
+        if tag is not None:
+            for candidate in child:
+                if candidate._tag == tag:
+                    return candidate
+        keys = value.keys()
+        for candidate in child:
+            if all(key in candidate._keys for key in keys):
+                return candidate
+        raise ValueError(
+            f"No option type in {[c.__name__ for c in child]} "
+            f"accepts keys: {sorted(keys)}")
+
+    def _check(self, name, value):
+        """Check a value against the schema types of a field."""
+        types = self._types.get(name)
+        if value is None or not types:
+            return
+        if isinstance(value, (dict, SlotsModel)) and (
+                "object" in types or name in self._children):
+            return
+        accepted = tuple(
+            t for kind in types for t in _python_types.get(kind, (object,)))
+        if "object" in types:
+            accepted += (dict,)
+        if not isinstance(value, accepted):
+            raise ValueError(
+                f'"{self.__class__.__name__}.{name}" expects {types}, '
+                f"got {type(value).__name__}")
+
+    def _items(self):
+        """Yield (name, value) pairs of fields that have been set."""
+        for name in self._fields:
+            try:
+                yield name, object.__getattribute__(self, name)
+            except AttributeError:
+                continue
+
+    def validate(self):
+        """Validate all set fields, recursively.
+
+        :returns: self, to allow chaining.
+        :raises ValueError: if a value does not match the schema types.
+        """
+        for name, value in self._items():
+            self._check(name, value)
+            values = value if isinstance(value, list) else [value]
+            for x in values:
+                if isinstance(x, SlotsModel):
+                    x.validate()
+        return self
+
+    def dict(self, exclude_unset=False, exclude_none=False, **kwargs):
+        """Convert the option to a dictionary keyed by JSON names.
+
+        :param exclude_unset: accepted for compatibility with the pydantic
+            model, unset fields are never included.
+        :param exclude_none: exclude fields set to None.
+        """
+        return {
+            self._aliases.get(name, name): _serialise(
+                value, exclude_none=exclude_none)
+            for name, value in self._items()
+            if not (exclude_none and value is None)}
+
+    def json(self, exclude_unset=False, exclude_none=False, **dumps_kwargs):
+        """Serialise the option to JSON.
+
+        :param exclude_unset: see `.dict()`.
+        :param exclude_none: see `.dict()`.
+        :param dumps_kwargs: passed to `json.dumps`.
+        """
+        return json.dumps(
+            self.dict(exclude_unset=exclude_unset, exclude_none=exclude_none),
+            default=_encode, **dumps_kwargs)
@@ -0,0 +1,237 @@
+"""Flat representation of hierarchical (e.g. taxonomic) count data.
+
+Trees are held as parallel arrays of nodes, with the index of each node's
+parent (-1 for roots) and parents preceding their children, so that
+traversal is iterative and trees can be serialised compactly. This is
+shared by the sankey and sunburst plots, which take nested input in
+different layouts.
+"""
+
+from collections import deque
+
+import numpy as np
+
+
+class FlatTree:
+    """A tree stored as flat arrays of nodes and parent indices."""
+
+    def __init__(self, names, parents, values, ranks, attrs=None):
+        """Initialize the tree.
+
+        :param names: node names.
+        :param parents: index of the parent of each node, -1 for roots.
+            Parents must precede their children.
+        :param values: node values, NaN where not given.
+        :param ranks: rank of each node, used to apply cutoffs per rank.
+        :param attrs: other per-node data (dicts) to carry through.
+        """
+        self.names = list(names)
+        self.parents = np.asarray(parents, dtype=int)
+        self.values = np.asarray(values, dtype=float)
+        self.ranks = list(ranks)
+        self.attrs = list(attrs) if attrs is not None else [{}] * len(self.names)
+
+    def __len__(self):
+        """Return the number of nodes."""
+        return len(self.names)
+
+    @classmethod
+    def _from_nested(cls, roots, children, read):
+        """Build from nested data breadth first.
+
+        :param roots: iterable of root items.
+        :param children: function returning the child items of an item.
+        :param read: function returning `(name, value, rank, attrs)` of an
+            item at a given depth.
+        """
+        names, parents, values, ranks, attrs = [], [], [], [], []
+        queue = deque((item, -1, 0) for item in roots)
+        while queue:
+            item, parent, depth = queue.popleft()
+            name, value, rank, extra = read(item, depth)
+            index = len(names)
+            names.append(name)
+            parents.append(parent)
+            values.append(np.nan if value is None else value)
+            ranks.append(rank)
+            attrs.append(extra)
+            queue.extend((child, index, depth + 1) for child in children(item))
+        return cls(names, parents, values, ranks, attrs)
+
+    @classmethod
+    def from_sankey(cls, data):
+        """Build from `{name: {"rank": ..., "count": ..., "children": {...}}}`."""
+        def read(item, depth):
+            name, node = item
+            extra = {
+                k: v for k, v in node.items()
+                if k not in ("rank", "count", "children")}
+            return name, node.get("count"), node.get("rank"), extra
+
+        return cls._from_nested(
+            data.items(), lambda item: item[1].get("children", {}).items(), read)
+
+    @classmethod
+    def from_records(cls, data):
+        """Build from `[{"name": ..., "value": ..., "children": [...]}]`.
+
+        Nodes are ranked by their depth.
+        """
+        def read(node, depth):
+            extra = {
+                k: v for k, v in node.items()
+                if k not in ("name", "value", "children")}
+            return node.get("name"), node.get("value"), depth, extra
+
+        return cls._from_nested(data, lambda node: node.get("children", []), read)
+
+    def totals(self):
+        """Return node values, with missing values summed from descendants."""
+        totals = self.values.tolist()
+        parents = self.parents.tolist()
+        sums = [0] * len(self)
+        has_children = [False] * len(self)
+        # children follow their parents, so a reverse pass sees every child
+        # before its parent
+        for index in range(len(self) - 1, -1, -1):
+            if totals[index] != totals[index]:  # NaN
+                totals[index] = sums[index] if has_children[index] else 0
+            parent = parents[index]
+            if parent >= 0:
+                sums[parent] += totals[index]
+                has_children[parent] = True
+        return np.asarray(totals, dtype=float)
+
+    def prune(self, min_abundance=None, top_n=None, other="Other"):
+        """Collapse small nodes into a single "Other" node per parent.
+
+        :param min_abundance: minimum value of a node as a fraction of the sum
+            of the root values. Either a number or a dict keyed by rank.
+        :param top_n: number of the largest nodes of each rank to keep. Either
+            a number or a dict keyed by rank.
+        :param other: name of the nodes replacing collapsed siblings. "Other"
+            nodes of non-root parents are named "<other> (<parent name>)" to
+            keep names distinct.
+        :return: a new `FlatTree`. Descendants of collapsed nodes are dropped.
+        """
+        if min_abundance is None and top_n is None:
+            return self
+        totals = self.totals()
+        grand_total = totals[self.parents < 0].sum()
+
+        def per_rank(setting, rank):
+            if isinstance(setting, dict):
+                return setting.get(rank)
+            return setting
+
+        keep = np.ones(len(self), dtype=bool)
+        for index, rank in enumerate(self.ranks):
+            threshold = per_rank(min_abundance, rank)
+            if threshold is not None:
+                keep[index] = totals[index] >= threshold * grand_total
+        if top_n is not None:
+            by_rank = dict()
+            for index, rank in enumerate(self.ranks):
+                by_rank.setdefault(rank, []).append(index)
+            for rank, indices in by_rank.items():
+                n = per_rank(top_n, rank)
+                if n is None or len(indices) <= n:
+                    continue
+                indices = np.asarray(indices)
+                # stable sort so ties keep their input order
+                order = np.argsort(-totals[indices], kind="stable")
+                keep[indices[order[n:]]] = False
+
+        names, parents, values, ranks, attrs = [], [], [], [], []
+        new_index = np.full(len(self), -1)
+        others = dict()  # old parent index -> [new parent index, rank, value]
+        for index, parent in enumerate(self.parents.tolist()):
+            if parent >= 0 and new_index[parent] < 0:
+                continue  # the parent was collapsed
+            if not keep[index]:
+                other_node = others.setdefault(
+                    parent, [new_index[parent] if parent >= 0 else -1,
+                             self.ranks[index], 0])
+                other_node[2] += totals[index]
+                continue
+            new_index[index] = len(names)
+            names.append(self.names[index])
+            parents.append(new_index[parent] if parent >= 0 else -1)
+            values.append(self.values[index])
+            ranks.append(self.ranks[index])
+            attrs.append(self.attrs[index])
+        # "Other" nodes have no children so can follow all other nodes,
+        # which also places them after their siblings
+        for parent, (new_parent, rank, value) in others.items():
+            names.append(other if parent < 0 else f"{other} ({self.names[parent]})")
+            parents.append(new_parent)
+            values.append(value)
+            ranks.append(rank)
+            attrs.append({})
+        return FlatTree(names, parents, values, ranks, attrs)
+
+    def _to_nested(self, make, attach):
+        """Rebuild nested data, returning the root items.
+
+        :param make: function returning a new item for a node index.
+        :param attach: function adding a child item to its parent item.
+        """
+        items = [make(index) for index in range(len(self))]
+        roots = list()
+        for index, parent in enumerate(self.parents):
+            if parent < 0:
+                roots.append((index, items[index]))
+            else:
+                attach(items[parent], index, items[index])
+        return roots
+
+    @staticmethod
+    def _value(value):
+        """Convert a value to a JSON friendly number."""
+        return int(value) if float(value).is_integer() else float(value)
+
+    def to_sankey(self):
+        """Convert to the nested dictionary layout of `from_sankey`."""
+        def make(index):
+            node = dict(rank=self.ranks[index])
+            if not np.isnan(self.values[index]):
+                node["count"] = self._value(self.values[index])
+            node.update(self.attrs[index])
+            node["children"] = dict()
+            return node
+
+        def attach(parent, index, child):
+            parent["children"][self.names[index]] = child
+
+        return {
+            self.names[index]: node for index, node in self._to_nested(make, attach)}
+
+    def to_records(self):
+        """Convert to the list of nested dictionaries layout of `from_records`."""
+        def make(index):
+            node = dict(name=self.names[index])
+            if not np.isnan(self.values[index]):
+                node["value"] = self._value(self.values[index])
+            node.update(self.attrs[index])
+            return node
+
+        def attach(parent, index, child):
+            parent.setdefault("children", []).append(child)
+
+        return [node for _, node in self._to_nested(make, attach)]
+
+    def encode(self, names, ranks):
+        """Encode as flat arrays, with names and ranks as table indices.
+
+        :param names: dict of name to index, extended with new names.
+        :param ranks: dict of rank to index, extended with new ranks.
+        :return: dict of `name`, `parent`, `rank` and `count` lists.
+        """
+        def lookup(table, key):
+            return table.setdefault(key, len(table))
+
+        return dict(
+            name=[lookup(names, name) for name in self.names],
+            parent=self.parents.tolist(),
+            rank=[lookup(ranks, rank) for rank in self.ranks],
+            count=[self._value(value) for value in self.totals()])
@@ -9,6 +9,8 @@ import pandas as pd
 from seaborn.categorical import _BarPlotter
 
 from ezcharts.plots import BokehPlot
+from ezcharts.plots._estimate import grouped_estimate
+from ezcharts.plots.util import QuantileSketch
 
 
 __all__ = [
@@ -37,7 +39,12 @@ def boxplot(
         dodge=None, width=None, gap=None, whis=1.5, linecolor='auto', linewidth=1,
         fliersize=6, hue_norm=None, native_scale=None, log_scale=None,
         formatter=None, legend=None, ax=None, **kwargs):
-    """Draw a box plot to show distributions with respect to categories."""
+    """Draw a box plot to show distributions with respect to categories.
+
+    `data` may also be a `QuantileSketch`, or a dictionary of sketches keyed
+    by category, in which case quartiles are approximate and outliers are
+    not drawn.
+    """
     # deal with stuff we haven't implemented, yet
     not_implemented = [
         hue, hue_order, orient, dodge, width, ax, formatter, legend,
@@ -51,39 +58,56 @@ def boxplot(
     if palette is None and color is None:
         palette = BokehPlot.colors
 
-    # If data is list-like make it into a dataframe
-    if not isinstance(data, pd.DataFrame):
+    if isinstance(data, QuantileSketch):
+        data = {"0": data}
+    sketches = isinstance(data, dict) and len(data) > 0 and all(
+        isinstance(sketch, QuantileSketch) for sketch in data.values())
+    # If data is list-like (or sketches) make it into a dataframe
+    if not isinstance(data, pd.DataFrame) or sketches:
         if x is None:
             x = "variable"
         if y is None:
             y = "value"
-        # Use dummy column x for grouping variable
-        data = pd.DataFrame({x: "0", y: data})
+        if not sketches:
+            # Use dummy column x for grouping variable
+            data = pd.DataFrame({x: "0", y: data})
 
     if x is None:
         x = data.columns[0]
     if y is None:
         y = data.columns[1]
 
-    # we are going to group by our x
-    groups = data[x].unique()
-
-    # compute quantiles
-    qs = data.groupby(x)[y].quantile([0.25, 0.5, 0.75])
-    qs = qs.unstack().reset_index()
-    qs.columns = [x, "q1", "q2", "q3"]
-    df = pd.merge(data, qs, on=x, how="left")
-
-    # compute mean, min and max for hover
-    mean_val = df.groupby(x)[y].mean().reset_index()
-    mean_val.columns = [x, "mean"]
-    df = pd.merge(df, mean_val, on=x, how="left")
-    min_val = df.groupby(x)[y].min().reset_index()
-    min_val.columns = [x, "min"]
-    df = pd.merge(df, min_val, on=x, how="left")
-    max_val = df.groupby(x)[y].max().reset_index()
-    max_val.columns = [x, "max"]
-    df = pd.merge(df, max_val, on=x, how="left")
+    if sketches:
+        groups = list(data)
+        q1, q2, q3 = np.transpose([
+            sketch.quantile([0.25, 0.5, 0.75]) for sketch in data.values()])
+        df = pd.DataFrame({
+            x: groups, "q1": q1, "q2": q2, "q3": q3,
+            "mean": [sketch.mean() for sketch in data.values()],
+            "min": [sketch.min for sketch in data.values()],
+            "max": [sketch.max for sketch in data.values()]})
+        # there are no values to draw as outliers
+        df[y] = df["q2"]
+    else:
+        # we are going to group by our x
+        groups = data[x].unique()
+
+        # compute quantiles
+        qs = data.groupby(x)[y].quantile([0.25, 0.5, 0.75])
+        qs = qs.unstack().reset_index()
+        qs.columns = [x, "q1", "q2", "q3"]
+        df = pd.merge(data, qs, on=x, how="left")
+
+        # compute mean, min and max for hover
+        mean_val = df.groupby(x)[y].mean().reset_index()
+        mean_val.columns = [x, "mean"]
+        df = pd.merge(df, mean_val, on=x, how="left")
+        min_val = df.groupby(x)[y].min().reset_index()
+        min_val.columns = [x, "min"]
+        df = pd.merge(df, min_val, on=x, how="left")
+        max_val = df.groupby(x)[y].max().reset_index()
+        max_val.columns = [x, "max"]
+        df = pd.merge(df, max_val, on=x, how="left")
 
     # if the user specifies an order for their categorical variables
     if isinstance(order, list):
@@ -195,6 +219,41 @@ def pointplot(*args, **kwargs):
     raise NotImplementedError
 
 
+class _VectorisedBarPlotter(_BarPlotter):
+    """Seaborn's bar plotter, estimating all groups at once."""
+
+    def estimate_statistic(self, estimator, errorbar, n_boot, seed):
+        """Estimate the statistic and confidence interval of each bar."""
+        n_hues = 1 if self.hue_names is None else len(self.hue_names)
+        values, codes, units = [], [], []
+        for i, group_data in enumerate(self.plot_data):
+            values.append(np.asarray(group_data))
+            if self.plot_hues is None:
+                hue_codes = np.zeros(len(group_data), dtype=int)
+            else:
+                hue_codes = pd.Categorical(
+                    self.plot_hues[i], categories=self.hue_names).codes
+            codes.append(np.where(hue_codes < 0, -1, i * n_hues + hue_codes))
+            if self.plot_units is not None:
+                units.append(np.asarray(self.plot_units[i]))
+        values, codes = np.concatenate(values), np.concatenate(codes)
+        keep = codes >= 0
+        estimate, lower, upper = grouped_estimate(
+            values[keep], codes[keep], len(self.plot_data) * n_hues,
+            estimator=estimator, errorbar=errorbar, n_boot=n_boot, seed=seed,
+            units=np.concatenate(units)[keep] if units else None)
+
+        if self.hue_names is None:
+            self.statistic = estimate
+            self.confint = np.array([]) if errorbar is None else np.column_stack(
+                [lower, upper])
+        else:
+            shape = (len(self.plot_data), n_hues)
+            self.statistic = estimate.reshape(shape)
+            self.confint = np.empty(shape[:1] + (0,)) if errorbar is None \
+                else np.stack([lower, upper], axis=-1).reshape(shape + (2,))
+
+
 def barplot(
     data=None, *, x=None, y=None, hue=None, order=None, hue_order=None,
     estimator='mean', errorbar=('ci', 95), n_boot=1000, units=None, seed=None,
@@ -226,7 +285,7 @@ def barplot(
             )
 
     # Create bar plot with seaborn
-    plotter = _BarPlotter(
+    plotter = _VectorisedBarPlotter(
         x,
         y,
         hue,
@@ -377,12 +436,19 @@ def barplot(
         p.legend.location = "top"
         p.add_layout(p.legend[0], "above")
 
+    # bars are drawn from zero, stacked bars to the sum of the hue levels
+    statistic = np.asarray(plotter.statistic, dtype=float)
+    if plotter.plot_hues is not None and not dodge and not nested_x:
+        statistic = np.nansum(statistic, axis=1)
+    extent = np.append(statistic.ravel(), 0)
     if plotter.orient == "v":
         p.xgrid.grid_line_color = None
         p.y_range.start = 0
+        plt.accumulate_extents(y=extent)
     else:
         p.ygrid.grid_line_color = None
         p.x_range.start = 0
+        plt.accumulate_extents(x=extent)
 
     if not nested_x:
         p.xaxis.axis_label = x.capitalize()
@@ -3,10 +3,13 @@
 from itertools import cycle
 
 from bokeh.models import ColumnDataSource, HoverTool
+import numpy as np
 import pandas as pd
 from seaborn._statistics import Histogram, KDE
 
+from ezcharts import kernels
 from ezcharts.plots import BokehPlot, util
+from ezcharts.plots._kde import fft_kde
 
 
 __all__ = ["displot", "histplot", "kdeplot", "ecdfplot", "rugplot", "distplot"]
@@ -17,6 +20,14 @@ def displot(*args, **kwargs):
     raise NotImplementedError
 
 
+def _bin_edges(estimator, data, weights):
+    """Return the bin edges a seaborn `Histogram` would use for data."""
+    bin_kws = estimator.define_bin_params(data, weights=weights, cache=False)
+    if 'range' in bin_kws:
+        return np.linspace(*bin_kws['range'], bin_kws['bins'] + 1)
+    return np.asarray(bin_kws['bins'])
+
+
 def histplot(
     data=None, *, x=None, y=None, hue=None, weights=None,
     stat='count', bins='auto', binwidth=None, binrange=None,
@@ -62,7 +73,12 @@ def histplot(
         if len(data.columns) > 1:
             quad_kwargs["legend_label"] = col
         variable_data = data[col].dropna()
-        heights, edges = estimator(variable_data, weights=weights)
+        # without numba this is no faster than seaborn's own `np.histogram`
+        if kernels.HAVE_NUMBA and stat == 'count' and not cumulative:
+            edges = _bin_edges(estimator, variable_data, weights)
+            heights = kernels.histogram(variable_data, edges, weights=weights)
+        else:
+            heights, edges = estimator(variable_data, weights=weights)
 
         plt._fig.quad(
             top=heights,
@@ -74,6 +90,7 @@ def histplot(
             line_color=color,
             **quad_kwargs,
         )
+        plt.accumulate_extents(x=edges, y=np.append(heights, 0))
     plt._fig.y_range.start = 0
     hover = plt._fig.select(dict(type=HoverTool))
     hover.tooltips = [(stat.capitalize(), "@top")]
@@ -90,13 +107,22 @@ def kdeplot(
     gridsize=200, cut=3, clip=None,
     legend=None, cbar=None, cbar_ax=None,
     cbar_kws=None, bokeh_kwargs=None, ax=None,
-    compute=True, **kwargs,
+    compute=True, method="exact", **kwargs,
 ):
-    """Plot uni-variate distributions using kernel density estimation."""
+    """Plot uni-variate distributions using kernel density estimation.
+
+    :param method: "exact" to evaluate every kernel at every grid point with
+        seaborn, or "fft" to bin the data and convolve it with the kernel,
+        which is much faster for large data. Weights are supported by "fft".
+    """
+    if method not in ("exact", "fft"):
+        raise ValueError(f"`method` must be 'exact' or 'fft', not {method!r}.")
     not_implemented = [
         hue, hue_order, ax, legend, hue_norm, log_scale, levels, warn_singular, thresh,
-        cbar, cbar_ax, cbar_kws, multiple, weights, fill, common_norm, common_grid
+        cbar, cbar_ax, cbar_kws, multiple, fill, common_norm, common_grid
     ]
+    if method == "exact":
+        not_implemented.append(weights)
     for i in not_implemented:
         if i is not None:
             raise NotImplementedError(
@@ -114,8 +140,11 @@ def kdeplot(
             clip=clip,
             cumulative=cumulative,
         )
-        estimator = KDE(**estimate_kws)
-        density, support = estimator(data, weights=weights)
+        if method == "fft":
+            density, support = fft_kde(data, weights, **estimate_kws)
+        else:
+            estimator = KDE(**estimate_kws)
+            density, support = estimator(data, weights=weights)
     else:
         density, support = data
 
@@ -123,6 +152,7 @@ def kdeplot(
         data=dict(x=support, y=density)
     )
     plt._fig.varea(x='x', y1=0, y2='y', source=source)
+    plt.accumulate_extents(x=support, y=np.append(density, 0))
     plt._fig.y_range.start = 0
 
     hover = plt._fig.select(dict(type=HoverTool))
@@ -1,6 +1,7 @@
 """Ideoplots."""
 
 import argparse
+import functools
 from importlib.resources import files
 
 import pandas as pd
@@ -59,20 +60,11 @@ class MakeRectangles(util.JSCode):
         super().__init__(jscode)
 
 
-def load_ucsc_bands(genome="hg38", types=None):
-    """Load "standard" UCSC bands from included BED file.
-
-    :param genome:
-    :param types: a list of (stain) types to include.
-    """
+@functools.lru_cache(maxsize=None)
+def _read_ucsc_bands(genome):
+    """Read and annotate the packaged UCSC bands, once per process."""
     # TODO: clean up package data
     src = str(files('ezcharts').joinpath(f"data/reference/{genome}/cytoBand.txt.gz"))
-    if types is None:
-        types = [
-            'acen', 'gneg',
-            'gpos25', 'gpos50', 'gpos75', 'gpos100',
-            'gvar', 'stalk']
-
     names = ['chr', 'start', 'end', 'name', 'type']
     bands_df = pd.read_csv(src, sep="\t", header=None, names=names)
     # annotate with colours, this is why this is isn't a generic
@@ -93,11 +85,9 @@ def load_ucsc_bands(genome="hg38", types=None):
     return bands_df
 
 
-def load_chr_sizes(genome="hg38"):
-    """Load chr size data.
-
-    :param genome:
-    """
+@functools.lru_cache(maxsize=None)
+def _read_chr_sizes(genome):
+    """Read the packaged chromosome sizes, once per process."""
     # TODO: clean up package data
     src = str(files('ezcharts').joinpath(
         f"data/reference/{genome}/{genome}.chrom.sizes.gz"))
@@ -106,6 +96,45 @@ def load_chr_sizes(genome="hg38"):
     return sizes
 
 
+def load_ucsc_bands(genome="hg38", types=None):
+    """Load "standard" UCSC bands from included BED file.
+
+    The parsed file is cached, a copy is returned.
+
+    :param genome:
+    :param types: a list of (stain) types to include.
+    """
+    return _read_ucsc_bands(genome).copy()
+
+
+def load_chr_sizes(genome="hg38"):
+    """Load chr size data.
+
+    The parsed file is cached, a copy is returned.
+
+    :param genome:
+    """
+    return _read_chr_sizes(genome).copy()
+
+
+def _partition_blocks(blocks_data):
+    """Partition blocks by chromosome and colour.
+
+    :param blocks_data: dataframe with `chr`, `start`, `end` and `color`.
+    :returns: dictionary mapping chromosome to a dictionary of colour to
+        `[chr, start, end, length]` records, in order of appearance.
+    """
+    blocks_data = blocks_data.assign(
+        length=blocks_data['end'] - blocks_data['start'])
+    partition = dict()
+    for (chrom, color), group in blocks_data.groupby(
+            ['chr', 'color'], sort=False):
+        partition.setdefault(chrom, dict())[color] = list(map(list, zip(
+            group['chr'].tolist(), group['start'].tolist(),
+            group['end'].tolist(), group['length'].tolist())))
+    return partition
+
+
 def ideogram(blocks=None, track=None, genome='hg38'):
     """Draw an ideogram in various styles.
 
@@ -155,6 +184,15 @@ def ideogram(blocks=None, track=None, genome='hg38'):
 
     # need chrom sizes for outer boxes
     sizes = load_chr_sizes(genome)
+    max_size = max(sizes['size'])
+
+    # partition the data by chromosome up front, rather than filtering
+    # everything for each chromosome in turn
+    blocks_partitions = [_partition_blocks(x) for x in blocks_list]
+    if track is not None:
+        track_partition = {
+            chrom: group[['start', 'value']].values.tolist()
+            for chrom, group in track_data.groupby('chr', sort=False)}
 
     # off we go
     plt = Plot()
@@ -215,7 +253,7 @@ def ideogram(blocks=None, track=None, genome='hg38'):
             xaxis.append({
                 'gridIndex': track_grid_index,
                 'show': False,
-                'max': max(sizes['size'])})
+                'max': max_size})
 
             yaxis.append({
                 'gridIndex': track_grid_index,
@@ -226,10 +264,8 @@ def ideogram(blocks=None, track=None, genome='hg38'):
                 'interval': 2.2,
                 'axisLine': {'onZero': False}})
 
-            # subset our track data to the chromosome we are dealing with
-            data = track_data.loc[
-                track_data['chr'] == chromosome]
-            data = data[['start', 'value']].values.tolist()
+            # track data for the chromosome we are dealing with
+            data = track_partition.get(chromosome, list())
 
             # track data series
             plt.add_series(dict(
@@ -262,20 +298,9 @@ def ideogram(blocks=None, track=None, genome='hg38'):
             chromosome_grid_index = count
 
         # now add blocks
-        for blocks_data in blocks_list:
-            # subset our bands data to the chormosome we are dealing with
-            blocks_data_chr = blocks_data.loc[
-                blocks_data['chr'] == chromosome]
-
-            blocks_dataset = dict()
-            for index_blocks, row_blocks in blocks_data_chr.iterrows():
-                if row_blocks['color'] not in blocks_dataset:
-                    blocks_dataset[row_blocks['color']] = list()
-                blocks_dataset[row_blocks['color']].append([
-                    row_blocks['chr'],
-                    row_blocks['start'],
-                    row_blocks['end'],
-                    row_blocks['end']-row_blocks['start']])
+        for blocks_partition in blocks_partitions:
+            # blocks for the chromosome we are dealing with, by colour
+            blocks_dataset = blocks_partition.get(chromosome, dict())
 
             for count, (data_type, data) in enumerate(blocks_dataset.items()):
                 if data_type == 0:
@@ -305,7 +330,7 @@ def ideogram(blocks=None, track=None, genome='hg38'):
         xaxis.append({
             'gridIndex': chromosome_grid_index,
             'show': show,
-            'max':  max(sizes['size'])})
+            'max': max_size})
         yaxis.append({
             'gridIndex': chromosome_grid_index,
             'axisLine': {'show': False},
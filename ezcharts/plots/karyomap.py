@@ -4,7 +4,7 @@ import pandas as pd
 import seaborn as sns
 
 import ezcharts as ezc
-from ezcharts.components.common import make_breaks
+from ezcharts import kernels
 
 
 __all__ = ["karyomap"]
@@ -42,29 +42,8 @@ def karyomap(
     if not isinstance(df, pd.DataFrame):
         df = pd.DataFrame(df)
 
-    def build_intervals(ctgid, start, end, size):
-        """Build a dataframe of intervals."""
-        breaks = make_breaks(start, end, size)
-        return pd.DataFrame(
-            data={
-                'chr': ctgid,
-                'start': breaks[0:-1],
-                'end': breaks[1:]})
-
-    # Compute central value.
-    def compute_value(data, x, col='values', stats=stats):
-        """Return the average of a given column in a region."""
-        data_ = data[(data[chrom] == x.chr) &
-                     (data[pos] >= x.start) &
-                     (data[pos] < x.end)]
-        if stats == 'count':
-            return data_.shape[0]
-        if stats == 'median':
-            return data_[col].median()
-        elif stats == 'mean':
-            return data_[col].mean()
-        else:
-            raise ValueError("stats must be one of 'count', 'mean', or 'median'")
+    if stats not in ('count', 'mean', 'median'):
+        raise ValueError("stats must be one of 'count', 'mean', or 'median'")
 
     # If no ref_length, define it from the positions
     if ref_lengths is None:
@@ -92,14 +71,44 @@ def karyomap(
         else:
             ref_lengths = ref_lengths.loc[ref_lengths.length > window_size]
 
-    # Build intervals to visualize
-    intervals = pd.concat([
-        build_intervals(r.chrom, 0, r.length, window_size)
-        for idx, r in ref_lengths.iterrows()])
-
-    # Compute median -log10(P-value) for each interval
-    intervals['value'] = intervals.apply(
-        lambda x: compute_value(df, x, col=value, stats=stats), axis=1)
+    # Build intervals to visualize, as with `make_breaks` the last window
+    # of each sequence is shortened to the sequence length
+    lengths = ref_lengths['length'].to_numpy(dtype=np.int64)
+    n_windows = -(-lengths // window_size)
+    offsets = np.cumsum(n_windows) - n_windows
+    window = np.arange(n_windows.sum()) - np.repeat(offsets, n_windows)
+    starts = window * window_size
+    intervals = pd.DataFrame({
+        'chr': np.repeat(ref_lengths['chrom'].to_numpy(), n_windows),
+        'start': starts,
+        'end': np.minimum(starts + window_size, np.repeat(lengths, n_windows))})
+
+    # Assign each data point to its window
+    code = pd.Categorical(
+        df[chrom], categories=ref_lengths['chrom'].to_numpy()).codes
+    positions = df[pos].to_numpy()
+    valid = code >= 0
+    code, positions = code[valid], positions[valid]
+    inside = (positions >= 0) & (positions < lengths[code])
+    valid[valid] = inside
+    groups = offsets[code[inside]] + (
+        positions[inside] // window_size).astype(np.int64)
+
+    # Compute the chosen statistic for each interval
+    if stats == 'count':
+        intervals['value'] = np.bincount(groups, minlength=len(intervals))
+    else:
+        values = df[value].to_numpy(dtype=float)[valid]
+        present = ~np.isnan(values)
+        groups, values = groups[present], values[present]
+        if stats == 'mean':
+            with np.errstate(invalid='ignore', divide='ignore'):
+                intervals['value'] = np.bincount(
+                    groups, weights=values, minlength=len(intervals)
+                ) / np.bincount(groups, minlength=len(intervals))
+        else:
+            intervals['value'] = kernels.grouped_median(
+                groups, values, len(intervals))
     intervals = intervals.fillna(0).replace([np.inf, -np.inf], 0)
 
     # Transpose the matrix
@@ -5,15 +5,45 @@ from dominate.tags import button, div, label, li, main, script, select, style, u
 from dominate.util import raw
 
 from ezcharts.layout.resource import ScriptResource, StyleResource
+from ezcharts.plots._tree import FlatTree
 
 
 __all__ = ["metagenomics_sankey"]
 
+# static assets
+sankey_D3_js = ScriptResource("metagenomics-sankey-util.js", tag=script)
+sankey_js = ScriptResource("metagenomics-sankey.js")
+sankey_css = StyleResource("metagenomics-sankey.css", tag=style)
 
-def metagenomics_sankey(data):
+
+def encode_samples(data, min_abundance=None, top_n=None):
+    """Prune per-sample taxonomy trees and encode them as flat arrays.
+
+    :param data (dict): per-sample taxonomy trees, as `metagenomics_sankey`.
+    :param min_abundance: see `metagenomics_sankey`.
+    :param top_n: see `metagenomics_sankey`.
+    :return (dict): `names` and `ranks` tables and, for each sample, arrays of
+        name index, parent index (-1 for roots), rank index and count per node.
+    """
+    names, ranks = dict(), dict()
+    samples = {
+        sample: FlatTree.from_sankey(tree).prune(
+            min_abundance=min_abundance, top_n=top_n).encode(names, ranks)
+        for sample, tree in data.items()}
+    return dict(names=list(names), ranks=list(ranks), samples=samples)
+
+
+def metagenomics_sankey(data, min_abundance=None, top_n=None):
     """Create a Sankey plot for taxonomic counts.
 
     :param data (dict): Dictionary with input data.
+    :param min_abundance (float or dict): Minimum count of a taxon as a
+        fraction of the total count of its sample. Taxa below this are
+        collapsed into an "Other" node under their parent before the data is
+        embedded in the report. A dict gives a fraction per rank.
+    :param top_n (int or dict): Number of the most abundant taxa of each rank
+        to keep per sample, the rest are collapsed into "Other" nodes. A dict
+        gives a number per rank.
 
     Each node in the dict should contain values called `rank`, `count`, and `children`.
 
@@ -21,24 +51,19 @@ def metagenomics_sankey(data):
         {"Bacteria": {
             "rank": "superkingdom", "count": 3000, "children": { "Firmicutes": {...
     """
-    # get relevant static assets
-    sankey_D3_js = ScriptResource("metagenomics-sankey-util.js", tag=script)
-    sankey_js = ScriptResource("metagenomics-sankey.js")
-    sankey_css = StyleResource("metagenomics-sankey.css", tag=style)
-
-    # add the D3 scripts
-    sankey_D3_js()
-    # load the actual sankey JS and insert the data
-    insert = json.dumps(data).replace('"', '"')
+    # add the D3 scripts and the sankey style, once per report
+    sankey_D3_js.require()
+    sankey_css.require()
+    # load the actual sankey JS and insert the data, as a JSON string literal
+    # of flat per-sample arrays which the script expands
+    insert = json.dumps(json.dumps(
+        encode_samples(data, min_abundance=min_abundance, top_n=top_n),
+        separators=(',', ':'))).replace("</", "<\\/")
     with open(sankey_js.data_file) as sankey_code_js:
-        sankey_js = sankey_code_js.read()
-    sankey_data = sankey_js.replace("replace_me", insert.replace('"', '\\"'))
+        sankey_data = sankey_code_js.read().replace('"replace_me"', insert)
 
     # create the plot
     with div(className="container"):
-        # load sankey style
-        sankey_css()
-
         with main(className="metagenomics-sankey"):
             with div(id="controls-sankey"):
                 with ul():
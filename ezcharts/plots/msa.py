@@ -1,13 +1,23 @@
 """Make an multiple sequence alignment image."""
 import base64
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import inspect
+import io
 import os
 
 from Bio import AlignIO
 from dominate.tags import img, p
+import matplotlib.pyplot as plt
 from pymsaviz import MsaViz
 
 
-__all__ = ["msa"]
+__all__ = ["msa", "msa_many"]
+
+# rendered images keyed by the alignment file hash and rendering options,
+# evicted oldest first
+MSA_CACHE_SIZE = 32
+_msa_cache = dict()
 
 COLOR_SCHEMES = [
     'Clustal',
@@ -29,7 +39,31 @@ COLOR_SCHEMES = [
 ]
 
 
-def msa(
+def _file_digest(msa_file):
+    """Hash the contents of a file."""
+    digest = hashlib.sha256()
+    with open(msa_file, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_key(msa_file, options):
+    """Key the cache on file contents, or None if the file is missing."""
+    if not os.path.exists(msa_file):
+        return None
+    return _file_digest(msa_file), tuple(sorted(options.items()))
+
+
+def _render_options(**kwargs):
+    """Complete rendering options with defaults, for consistent cache keys."""
+    bound = inspect.signature(_render).bind(None, **kwargs)
+    bound.apply_defaults()
+    del bound.arguments["msa_file"]
+    return bound.arguments
+
+
+def _render(
         msa_file,
         color='#0ebbb2',
         wrap_lengh=80,
@@ -40,45 +74,27 @@ def msa(
         identity=50,
         start=0,
         end=None):
-    """
-    Make a nice multiple sequence alignment with pymsaviz.
-
-    Args:
-        msa_file (str): The path to the MSA file in AFA (Aligned FASTA) format.
-        color (str, optional): The color to use for the alignment.
-        Defaults to '#0ebbb2'.
-        wrap_lengh (int, optional): The maximum length of each line in the
-        alignment. Defaults to 80.
-        show_count (bool, optional): Whether to show the count of each residue
-        in the alignment. Defaults to True.
-        show_consensus (bool, optional): Whether to show the consensus
-        sequence in the alignment. Defaults to False.
-        color_scheme (str, optional): The color scheme to use for the
-        alignment. Defaults to "Identity".
-        identity (int, optional): The minimum identity threshold for
-        highlighting mismatches. Defaults to 50.
-        start (int): The start position compliant with bed format. Defaults to 0
-        end (int, optional): The end position compliant with bed format.
-        If empty MSA will be start:len(MSA).
+    """Render an MSA to a base64 encoded PNG.
 
-    Returns:
-        str: The HTML code for displaying the generated alignment image.
+    Returns a tuple of `(image, message)`, where `image` is None and
+    `message` explains why if the MSA could not be plotted. The result
+    is picklable so this can be run in a worker process.
     """
     # check MSA file exists
     if not os.path.exists(msa_file):
-        return p("Unable to plot MSA. MSA file not found.")
+        return None, "Unable to plot MSA. MSA file not found."
 
     # check for records in the MSA file
     try:
         alignment = AlignIO.read(msa_file, "fasta")
         if len(alignment) == 0:
-            return p("Unable to plot MSA. MSA file does not contain any records.")
+            return None, "Unable to plot MSA. MSA file does not contain any records."
     except (ValueError, FileNotFoundError):
-        return p("Unable to plot MSA. Invalid FASTA file.")
+        return None, "Unable to plot MSA. Invalid FASTA file."
 
     # check color scheme is allowed
     if color_scheme not in COLOR_SCHEMES:
-        return p(f"Invalid color scheme. Choose from: {', '.join(COLOR_SCHEMES)}")
+        return None, f"Invalid color scheme. Choose from: {', '.join(COLOR_SCHEMES)}"
 
     mv = MsaViz(
         msa_file,
@@ -105,11 +121,108 @@ def msa(
     mv.set_plot_params(
         identity_color=color, identity_color_min_thr=identity_color_min_thr)
 
-    mv.savefig("msa.png")
+    # as MsaViz.savefig, but to memory rather than a file in the working
+    # directory so concurrent renders can't overwrite each other
+    fig = mv.plotfig(dpi=100)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=100, pad_inches=0.5)
+    fig.clear()
+    plt.close(fig)
+    return base64.b64encode(buffer.getvalue()).decode('utf-8'), None
+
+
+def _store(key, result):
+    """Cache a rendered image."""
+    if key is None or result[0] is None:
+        return
+    while len(_msa_cache) >= MSA_CACHE_SIZE:
+        del _msa_cache[next(iter(_msa_cache))]
+    _msa_cache[key] = result
+
+
+def _to_html(result):
+    """Wrap a rendered image, or the reason there is none, in a tag."""
+    image, message = result
+    if image is None:
+        return p(message)
+    return img(src=f"data:image/png;base64,{image}", cls="img-fluid")
+
+
+def msa(
+        msa_file,
+        color='#0ebbb2',
+        wrap_lengh=80,
+        show_count=True,
+        identity_color_min_thr=40,
+        show_consensus=False,
+        color_scheme="Identity",
+        identity=50,
+        start=0,
+        end=None):
+    """
+    Make a nice multiple sequence alignment with pymsaviz.
+
+    Images are cached by the contents of `msa_file` and the other arguments,
+    so the same alignment is rendered only once.
+
+    Args:
+        msa_file (str): The path to the MSA file in AFA (Aligned FASTA) format.
+        color (str, optional): The color to use for the alignment.
+        Defaults to '#0ebbb2'.
+        wrap_lengh (int, optional): The maximum length of each line in the
+        alignment. Defaults to 80.
+        show_count (bool, optional): Whether to show the count of each residue
+        in the alignment. Defaults to True.
+        show_consensus (bool, optional): Whether to show the consensus
+        sequence in the alignment. Defaults to False.
+        color_scheme (str, optional): The color scheme to use for the
+        alignment. Defaults to "Identity".
+        identity (int, optional): The minimum identity threshold for
+        highlighting mismatches. Defaults to 50.
+        start (int): The start position compliant with bed format. Defaults to 0
+        end (int, optional): The end position compliant with bed format.
+        If empty MSA will be start:len(MSA).
+
+    Returns:
+        str: The HTML code for displaying the generated alignment image.
+    """
+    return msa_many(
+        [msa_file], threads=1,
+        color=color, wrap_lengh=wrap_lengh, show_count=show_count,
+        identity_color_min_thr=identity_color_min_thr,
+        show_consensus=show_consensus, color_scheme=color_scheme,
+        identity=identity, start=start, end=end)[0]
+
+
+def msa_many(msa_files, threads=None, **kwargs):
+    """
+    Make multiple sequence alignment images for several alignments.
+
+    Alignments are rendered in parallel across a pool of processes, as
+    rendering is CPU bound. Cached images are reused as with `msa`.
 
-    with open("msa.png", "rb") as image_file:
-        data = base64.b64encode(image_file.read())
+    Args:
+        msa_files (list): Paths to MSA files in AFA (Aligned FASTA) format.
+        threads (int, optional): Number of worker processes. Defaults to
+        the number of CPUs. With 1, alignments are rendered in this process.
+        kwargs: Options passed to `msa` for every alignment.
 
-    return img(
-        src=f"data:image/png;base64,{data.decode('utf-8')}",
-        cls="img-fluid")
+    Returns:
+        list: The HTML code for each alignment image, in the order of
+        `msa_files`.
+    """
+    options = _render_options(**kwargs)
+    keys = [_cache_key(msa_file, options) for msa_file in msa_files]
+    results = [_msa_cache.get(key) for key in keys]
+    todo = [i for i, result in enumerate(results) if result is None]
+    if threads == 1 or len(todo) < 2:
+        rendered = [_render(msa_files[i], **options) for i in todo]
+    else:
+        with ProcessPoolExecutor(max_workers=threads) as executor:
+            futures = [
+                executor.submit(_render, msa_files[i], **options) for i in todo]
+            rendered = [future.result() for future in futures]
+    for i, result in zip(todo, rendered):
+        results[i] = result
+        _store(keys[i], result)
+    return [_to_html(result) for result in results]
@@ -3,9 +3,12 @@
 import numbers
 
 from bokeh.models import HoverTool
+import numpy as np
+import pandas as pd
 from seaborn.relational import _LinePlotter, _ScatterPlotter
 
 from ezcharts.plots import BokehPlot, util
+from ezcharts.plots._estimate import grouped_estimate
 
 
 __all__ = ["relplot", "scatterplot", "lineplot"]
@@ -66,6 +69,7 @@ class Mixin:
             if data['hue'].nunique() > 1:
                 relational_kwargs["legend_label"] = hue_name
 
+            df = self.aggregate(df)
             y_min = min(y_min, df.y.min())
             color = kws.get("color")
             if self._hue_map.levels:
@@ -73,6 +77,10 @@ class Mixin:
                 # this to override the color (in case one was passed)
                 color = self._hue_map(hue_name)
 
+            self.plot_errors(plt, df, color)
+            if 'ymin' in df:
+                y_min = min(y_min, df.ymin.min())
+
             if self.series_type == 'line':
                 plt._fig.line(
                     df.x, df.y, line_color=color,
@@ -90,6 +98,7 @@ class Mixin:
                     df.x, df.y, size=symbol_size, marker=marker,
                     color=color, **relational_kwargs)
 
+            plt.accumulate_extents(x=df.x, y=df.y)
             plt._fig.xaxis.axis_label = x_name
             plt._fig.yaxis.axis_label = y_name
 
@@ -99,6 +108,13 @@ class Mixin:
         # TODO: add legend
         return plt
 
+    def aggregate(self, data):
+        """Return the data to draw for a semantic subset."""
+        return data
+
+    def plot_errors(self, plt, data, color):
+        """Draw error bars or bands for a semantic subset."""
+
 
 class ScatterPlotter(Mixin, _ScatterPlotter):
     """Making scatter plots."""
@@ -142,6 +158,52 @@ class LinePlotter(Mixin, _LinePlotter):
 
     series_type = 'line'
 
+    def aggregate(self, data):
+        """Aggregate repeated observations with the estimator, if any.
+
+        Data without repeated observations is drawn as it is.
+        """
+        orient = self.orient
+        if orient not in {"x", "y"}:
+            raise ValueError(
+                f"`orient` must be either 'x' or 'y', not {orient!r}.")
+        if self.estimator is None or data[orient].is_unique:
+            return data
+        if "units" in self.variables:
+            raise ValueError("estimator must be None when specifying units")
+        other = {"x": "y", "y": "x"}[orient]
+        codes, levels = pd.factorize(data[orient], sort=self.sort)
+        estimate, lower, upper = grouped_estimate(
+            data[other], codes, len(levels), estimator=self.estimator,
+            errorbar=self.errorbar, n_boot=self.n_boot, seed=self.seed)
+        return pd.DataFrame({
+            orient: levels, other: estimate,
+            f"{other}min": lower, f"{other}max": upper})
+
+    def plot_errors(self, plt, data, color):
+        """Draw the error interval of aggregated data as a band or bars."""
+        other = {"x": "y", "y": "x"}[self.orient]
+        if f"{other}min" not in data or data[f"{other}min"].isna().all():
+            return
+        lower, upper = data[f"{other}min"], data[f"{other}max"]
+        kws = dict(color=color)
+        if self.err_style == "band":
+            kws.update(fill_alpha=0.2, **self.err_kws)
+            if self.orient == "x":
+                plt._fig.varea(x=data.x, y1=lower, y2=upper, **kws)
+            else:
+                plt._fig.harea(y=data.y, x1=lower, x2=upper, **kws)
+        elif self.err_style == "bars":
+            kws.update(self.err_kws)
+            if self.orient == "x":
+                plt._fig.segment(data.x, lower, data.x, upper, **kws)
+            else:
+                plt._fig.segment(lower, data.y, upper, data.y, **kws)
+        elif self.err_style is not None:
+            raise ValueError(
+                f"`err_style` must be 'band' or 'bars', not {self.err_style}")
+        plt.accumulate_extents(**{other: np.append(lower, upper)})
+
 
 def lineplot(
         data=None, *,
@@ -149,10 +211,15 @@ def lineplot(
         palette=None, hue_order=None, hue_norm=None,
         sizes=None, size_order=None, size_norm=None,
         dashes=True, markers=None, style_order=None,
-        estimator="mean", errorbar=("ci", 95), n_boot=1000, seed=None,
+        estimator=None, errorbar=("ci", 95), n_boot=1000, seed=None,
         orient="x", sort=True, err_style="band", err_kws=None,
         legend="auto", ci="deprecated", ax=None, bokeh_kwargs={}, **kwargs):
-    """Draw a line plot with possibility of several semantic groupings."""
+    """Draw a line plot with possibility of several semantic groupings.
+
+    Unlike seaborn, data is drawn as given by default. Pass an `estimator`
+    (e.g. "mean") to aggregate repeated x (or y) values and draw the
+    `errorbar` interval.
+    """
     # see https://github.com/mwaskom/seaborn/blob/949dec3666ab12a366d2fc05ef18d6e90625b5fa/seaborn/relational.py#L597  # noqa
 
     if palette is None:
@@ -12,6 +12,8 @@ from ezcharts.layout.resource import VendorResource
 
 __all__ = ["seqviz"]
 
+seqviz_js = VendorResource("seqviz.min.js", tag=script)
+
 
 def seqviz(plannotate_json, fasta, alias):
     """Visualize a plasmid using SeqViz."""
@@ -56,9 +58,8 @@ def seqviz(plannotate_json, fasta, alias):
     if 'enzymes' in plannotate[alias]:
         enzymes = [enzyme['name'] for enzyme in plannotate[alias]["enzymes"]]
 
-    # add the seqviz js
-    seqviz_js = VendorResource("seqviz.min.js", tag=script)
-    seqviz_js()
+    # add the seqviz js, once per report
+    seqviz_js.require()
 
     with div(className="container"):
         with div(id="seqviz", cls="bg-light border p-4"):
@@ -1,6 +1,7 @@
 """Sunburst plots."""
 
 from ezcharts.plots import _NoAxisFixPlot, util
+from ezcharts.plots._tree import FlatTree
 
 
 __all__ = ["sunburst"]
@@ -9,7 +10,8 @@ __all__ = ["sunburst"]
 @util.plot_wrapper
 def sunburst(
     data, tooltip=True, visualMap=True, min_value=0, max_value=None,
-    color_scale=None, label_rotate="radial", label_minAngle=0, show_label=True
+    color_scale=None, label_rotate="radial", label_minAngle=0, show_label=True,
+    min_abundance=None, top_n=None
 ):
     """Create sunburst plot.
 
@@ -34,8 +36,17 @@ def sunburst(
     :param label_minAngle (int): Do not display the text if angle of data piece is
         smaller than this value (in degrees).
     :param show_label (bool): Whether to show labels.
+    :param min_abundance (float or dict): Minimum value of a section as a fraction
+        of the total. Smaller sections are collapsed into an "Other" section under
+        their parent. A dict gives a fraction per level (0 being the innermost).
+    :param top_n (int or dict): Number of the largest sections of each level to
+        keep, the rest are collapsed into "Other" sections. A dict gives a number
+        per level.
     :return (plot): Sunburst plot.
     """
+    if min_abundance is not None or top_n is not None:
+        data = FlatTree.from_records(data).prune(
+            min_abundance=min_abundance, top_n=top_n).to_records()
     plt = _NoAxisFixPlot()  # we don't have an axis so no point trying to fix
     plt.xAxis = dict(show=False)
     plt.yAxis = dict(show=False)
@@ -81,16 +92,16 @@ def sunburst(
 def sum_terminal_nodes(node):
     """Get the sum of the terminal nodes.
 
-    :param node (dictionary): dictionary that contains name, value (optional) and
-        and children (optional).
+    :param node (dictionary or list): dictionary that contains name, value
+        (optional) and and children (optional), or a list of these.
     :return (int): sum of the terminal nodes.
     """
-    if "children" in node:
-        # recursive case
-        total = 0
-        for child in node["children"]:
-            total += sum_terminal_nodes(child)
-        return total
-    else:
-        # base case
-        return node["value"]
+    stack = list(node) if isinstance(node, list) else [node]
+    total = 0
+    while stack:
+        node = stack.pop()
+        if "children" in node:
+            stack.extend(node["children"])
+        else:
+            total += node["value"]
+    return total
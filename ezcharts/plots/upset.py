@@ -8,12 +8,104 @@ from bokeh.models import (
     Range1d,
 )
 from bokeh.plotting import figure
+import numpy as np
 import pandas as pd
 
 from ezcharts.plots import BokehPlot
 
 __all__ = ["UpSetPlot"]
 
+# sets are packed into the bits of an unsigned 64-bit integer
+MAX_SETS = 64
+
+
+def _set_bits(n_sets):
+    """Bit values for each of `n_sets` sets."""
+    if n_sets > MAX_SETS:
+        raise ValueError(f"At most {MAX_SETS} sets are supported.")
+    return np.left_shift(np.uint64(1), np.arange(n_sets, dtype=np.uint64))
+
+
+def membership_bitmasks(memberships, sets=None):
+    """Pack per-element set memberships into integer bitmasks.
+
+    Parameters
+    ----------
+    memberships : dict or pd.DataFrame
+        Either a mapping of set name to an iterable of the elements (e.g.
+        variant IDs or read IDs) in that set, or a DataFrame with one row
+        per element and one boolean column per set. Missing elements (None
+        or NaN) in the mapping are ignored.
+    sets : list of str, optional
+        Sets to consider, in order. Defaults to all keys of the mapping or
+        all columns of the DataFrame.
+
+    Returns
+    -------
+    masks : np.ndarray
+        One `uint64` per element, with bit `j` set if the element is a
+        member of `sets[j]`.
+    sets : list of str
+        The sets corresponding to each bit.
+    """
+    if isinstance(memberships, pd.DataFrame):
+        sets = list(memberships.columns) if sets is None else list(sets)
+        bits = _set_bits(len(sets))
+        member = memberships[sets].to_numpy(dtype=bool)
+        masks = np.bitwise_or.reduce(
+            np.where(member, bits, np.uint64(0)), axis=1, dtype=np.uint64)
+        return masks, sets
+
+    sets = list(memberships) if sets is None else list(sets)
+    bits = _set_bits(len(sets))
+    elements = list()
+    for s in sets:
+        members = memberships[s]
+        if not isinstance(members, (np.ndarray, pd.Series, pd.Index)):
+            members = list(members)
+        elements.append(pd.Series(members))
+    if sum(len(e) for e in elements) == 0:
+        return np.zeros(0, dtype=np.uint64), sets
+    # a single factorisation gives each element an index across all sets
+    codes, uniques = pd.factorize(pd.concat(elements, ignore_index=True))
+    masks = np.zeros(len(uniques), dtype=np.uint64)
+    offset = 0
+    for bit, members in zip(bits, elements):
+        set_codes = codes[offset:offset + len(members)]
+        # missing elements (None or NaN) are coded -1
+        masks[set_codes[set_codes >= 0]] |= bit
+        offset += len(members)
+    return masks, sets
+
+
+def intersections_from_memberships(memberships, sets=None, size_col="size"):
+    """Count set intersections from per-element set memberships.
+
+    Parameters
+    ----------
+    memberships : dict or pd.DataFrame
+        See `membership_bitmasks`.
+    sets : list of str, optional
+        See `membership_bitmasks`.
+    size_col : str, default "size"
+        Name of the column to hold the intersection sizes.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per non-empty intersection, with one boolean column per set
+        and the intersection size, as expected by `UpSetPlot`. Elements in
+        none of the sets are not counted.
+    """
+    masks, sets = membership_bitmasks(memberships, sets)
+    combos, counts = np.unique(masks, return_counts=True)
+    keep = combos != 0
+    combos, counts = combos[keep], counts[keep]
+    member = (combos[:, None] & _set_bits(len(sets))) != 0
+    df = pd.DataFrame(member, columns=sets)
+    df[size_col] = counts
+    return df
+
 
 class UpSetPlot(BokehPlot):
     """
@@ -133,6 +225,38 @@ class UpSetPlot(BokehPlot):
         super().__init__()
         self._fig = self._compose_grid()
 
+    @classmethod
+    def from_memberships(cls, memberships, sets=None, size_col="size", **kwargs):
+        """Create an UpSet plot from per-element set memberships.
+
+        Elements' sets are packed into integer bitmasks and the distinct
+        bitmasks counted, so this scales to millions of elements.
+
+        Parameters
+        ----------
+        memberships : dict or pd.DataFrame
+            Either a mapping of set name to an iterable of the elements in
+            that set, or a DataFrame with one row per element and one
+            boolean column per set.
+        sets : list of str, optional
+            Sets to display, in order. Defaults to all sets in
+            `memberships`.
+        size_col : str, default "size"
+            Column name used for intersection sizes.
+        kwargs : dict
+            Keyword arguments passed to `UpSetPlot`.
+
+        Example::
+
+            plt = UpSetPlot.from_memberships({
+                "caller_A": ["var1", "var2", "var3"],
+                "caller_B": ["var2", "var3", "var4"],
+            })
+
+        """
+        data = intersections_from_memberships(memberships, sets, size_col)
+        return cls(data, sets=list(data.columns[:-1]), size_col=size_col, **kwargs)
+
     def _validate_data(self, data):
         """Validate input DataFrame has required columns and correct types."""
         if not isinstance(data, pd.DataFrame):
@@ -231,27 +355,22 @@ class UpSetPlot(BokehPlot):
         """Create the dot matrix showing set membership per intersection."""
         n_sets = len(self.sets)
 
-        inactive_x, inactive_y = [], []
-        active_x, active_y = [], []
-        seg_x, seg_top, seg_bottom = [], [], []
-
-        for i, (_, row) in enumerate(self.data.iterrows()):
-            active_ys = []
-            for j, set_name in enumerate(self.sets):
-                y_pos = n_sets - 1 - j
-                is_active = bool(row[set_name])
-                if is_active:
-                    active_x.append(self.x_coords[i])
-                    active_y.append(y_pos)
-                    active_ys.append(y_pos)
-                else:
-                    inactive_x.append(self.x_coords[i])
-                    inactive_y.append(y_pos)
-
-            if len(active_ys) > 1:
-                seg_x.append(self.x_coords[i])
-                seg_top.append(max(active_ys))
-                seg_bottom.append(min(active_ys))
+        member = self._membership()
+        x_coords = np.array(self.x_coords, dtype=object)
+        y_pos = n_sets - 1 - np.arange(n_sets)
+
+        # row-major, i.e. by intersection then by set
+        rows, cols = np.nonzero(member)
+        active_x, active_y = x_coords[rows].tolist(), y_pos[cols].tolist()
+        rows, cols = np.nonzero(~member)
+        inactive_x, inactive_y = x_coords[rows].tolist(), y_pos[cols].tolist()
+
+        # connect the first and last active sets of intersections of 2+ sets
+        multi = member.sum(axis=1) > 1
+        first = np.argmax(member[multi], axis=1)
+        last = n_sets - 1 - np.argmax(member[multi, ::-1], axis=1)
+        seg_x = x_coords[multi].tolist()
+        seg_top, seg_bottom = y_pos[first].tolist(), y_pos[last].tolist()
 
         inactive_source = ColumnDataSource(dict(x=inactive_x, y=inactive_y))
         active_source = ColumnDataSource(dict(x=active_x, y=active_y))
@@ -298,12 +417,14 @@ class UpSetPlot(BokehPlot):
 
         return fig
 
+    def _membership(self):
+        """Boolean matrix of intersections (rows) by sets (columns)."""
+        return self.data[self.sets].to_numpy(dtype=bool)
+
     def _compute_set_totals(self):
         """Sum intersection sizes for each set across all intersections."""
-        return {
-            s: self.data.loc[self.data[s], self.size_col].sum()
-            for s in self.sets
-        }
+        totals = self.data[self.size_col].to_numpy() @ self._membership()
+        return dict(zip(self.sets, totals))
 
     def _create_totals_panel(self):
         """Create the left-hand horizontal bar chart showing per-set totals."""
@@ -381,3 +502,8 @@ class UpSetPlot(BokehPlot):
 def upsetplot(data, sets, **kwargs):
     """Functional alias for `UpSetPlot`."""
     return UpSetPlot(data, sets, **kwargs)
+
+
+def upsetplot_from_memberships(memberships, sets=None, **kwargs):
+    """Functional alias for `UpSetPlot.from_memberships`."""
+    return UpSetPlot.from_memberships(memberships, sets, **kwargs)
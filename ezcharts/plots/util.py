@@ -1,14 +1,24 @@
 """Utility functions for aiding plotting."""
+from collections import OrderedDict
+import copy
+import hashlib
 from importlib.resources import files
 from itertools import cycle, islice
 import os
 
+from bokeh.core.serialization import Deserializer, Serializer
+from bokeh.models import (
+    CDSView, ColumnDataSource, GlyphRenderer, GroupFilter, HoverTool, Legend,
+    LegendItem, Line, MultiLine, Title)
+from bokeh.models.glyphs import ConnectedXYGlyph
+from bokeh.util.serialization import make_id
 import numpy as np
 import pandas as pd
 from scipy import stats as sp_stats
 import si_prefix
 
 from ezcharts import plots, util
+from ezcharts.plots._kde import fft_kde
 
 sns_type_to_echarts = {
     "categorical": "category",
@@ -173,11 +183,13 @@ ont_colors = _ontColors()
 ond_colors = _ondColors()
 
 
-def kernel_density_estimate(x, step=0.2):
+def kernel_density_estimate(x, step=0.2, method="exact"):
     """Kernel density to approximate distribution.
 
     :param x: data of which to find mode.
     :param step: discretization of KDE PDF.
+    :param method: "exact" to evaluate the KDE with scipy, or "fft" to
+        approximate it by binning, which is much faster for large data.
     """
     # estimate bandwidth of kde, R's nrd0 rule-of-thumb
     hi = np.std(x, ddof=1)
@@ -190,11 +202,236 @@ def kernel_density_estimate(x, step=0.2):
 
     # create a KDE
     x_grid = np.arange(min(x), max(x), step)
+    if method == "fft":
+        pdf, x_grid = fft_kde(x, bw_method=bw, support=x_grid)
+        return x_grid, pdf
     kernel = sp_stats.gaussian_kde(x, bw_method=bw)
     pdf = kernel(x_grid)
     return x_grid, pdf
 
 
+class QuantileSketch:
+    """Mergeable sketch of a distribution, giving approximate quantiles.
+
+    Values are counted in buckets whose bounds grow geometrically, as in
+    DDSketch, so every quantile is estimated to within a relative error of
+    `relative_accuracy` of the true value. Sketches are updated and merged
+    by adding bucket counts, so the sketch of chunked or distributed data is
+    the same as that of the data all together. The count, sum, minimum and
+    maximum are kept exactly.
+    """
+
+    # smaller magnitudes are counted as zero
+    MIN_VALUE = 1e-9
+
+    def __init__(self, relative_accuracy=0.01):
+        """Initialize an empty sketch.
+
+        :param relative_accuracy: relative error bound of quantiles.
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("`relative_accuracy` must be between 0 and 1.")
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = np.log(self._gamma)
+        # bucket counts of positive and negative values, by key from offset
+        self._stores = {1: (0, np.zeros(0)), -1: (0, np.zeros(0))}
+        self.zero_count = 0.0
+        self.count = 0.0
+        self.sum = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    @classmethod
+    def from_values(cls, values, weights=None, **kwargs):
+        """Create a sketch of values.
+
+        :param values: values, NaNs are ignored.
+        :param weights: counts of each value.
+        :param kwargs: passed to the constructor.
+        """
+        return cls(**kwargs).update(values, weights)
+
+    @classmethod
+    def from_histogram(cls, hist, x="start", y="count", **kwargs):
+        """Create a sketch of histogram data.
+
+        :param hist: pd.DataFrame with columns [start, end, count].
+        :param x: the column of values.
+        :param y: the column of counts.
+        :param kwargs: passed to the constructor.
+        """
+        return cls.from_values(hist[x], hist[y], **kwargs)
+
+    def _add(self, sign, keys, weights):
+        """Add counts to the buckets of one sign."""
+        if len(keys) == 0:
+            return
+        offset, counts = self._stores[sign]
+        if len(counts) == 0:
+            offset = keys.min()
+        lo = min(offset, keys.min())
+        hi = max(offset + len(counts), keys.max() + 1)
+        merged = np.zeros(hi - lo)
+        merged[offset - lo:offset - lo + len(counts)] = counts
+        merged += np.bincount(keys - lo, weights=weights, minlength=hi - lo)
+        self._stores[sign] = (lo, merged)
+
+    def update(self, values, weights=None):
+        """Add values to the sketch.
+
+        :param values: values, NaNs are ignored.
+        :param weights: counts of each value.
+        :returns: the sketch.
+        """
+        values = np.asarray(values, dtype=float).ravel()
+        weights = np.ones_like(values) if weights is None else \
+            np.asarray(weights, dtype=float).ravel()
+        keep = ~np.isnan(values) & (weights != 0)
+        values, weights = values[keep], weights[keep]
+        if len(values) == 0:
+            return self
+        zero = np.abs(values) < self.MIN_VALUE
+        self.zero_count += weights[zero].sum()
+        for sign in (1, -1):
+            select = ~zero & (np.sign(values) == sign)
+            keys = np.ceil(
+                np.log(np.abs(values[select])) / self._log_gamma).astype(np.int64)
+            self._add(sign, keys, weights[select])
+        self.count += weights.sum()
+        self.sum += np.dot(values, weights)
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        return self
+
+    def merge(self, other):
+        """Add the counts of another sketch to this one.
+
+        :param other: a sketch with the same relative accuracy.
+        :returns: the sketch.
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches of different accuracies.")
+        for sign in (1, -1):
+            offset, counts = other._stores[sign]
+            keys = np.flatnonzero(counts)
+            self._add(sign, keys + offset, counts[keys])
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def __add__(self, other):
+        """Return the merge of two sketches."""
+        return copy.deepcopy(self).merge(other)
+
+    def values(self):
+        """Return representative values of the buckets, and their counts.
+
+        Each value is within the relative accuracy of the values counted in
+        its bucket, so these can stand in for the data, for example to draw
+        a histogram.
+
+        :returns: tuple of increasing values and their counts.
+        """
+        parts = []
+        for sign in (-1, 1):
+            offset, counts = self._stores[sign]
+            keys = np.flatnonzero(counts)
+            values = sign * 2 * self._gamma ** (keys + offset) / (self._gamma + 1)
+            parts.append((values, counts[keys]))
+        (neg, neg_counts), (pos, pos_counts) = parts
+        values = np.concatenate([neg[::-1], [0.0], pos])
+        counts = np.concatenate([neg_counts[::-1], [self.zero_count], pos_counts])
+        keep = counts > 0
+        return values[keep], counts[keep]
+
+    def histogram(self, edges):
+        """Return approximate counts of values in bins.
+
+        The count of each bucket is spread evenly over the bounds of the
+        bucket (limited to the minimum and maximum), rather than placed at
+        its representative value (see `values`), so bins narrower than the
+        buckets are not left empty.
+
+        :param edges: increasing bin edges.
+        :returns: counts of each bin.
+        """
+        edges = np.asarray(edges, dtype=float)
+        bounds, counts = [], []
+        for sign in (-1, 1):
+            offset, store = self._stores[sign]
+            keys = np.flatnonzero(store)
+            lower = self._gamma ** (keys + offset - 1)
+            upper = self._gamma ** (keys + offset)
+            if sign < 0:
+                lower, upper = -upper[::-1], -lower[::-1]
+                keys = keys[::-1]
+            bounds.append(np.column_stack((lower, upper)))
+            counts.append(store[keys])
+            if sign < 0:
+                bounds.append(np.zeros((1, 2)))
+                counts.append([self.zero_count])
+        bounds = np.clip(np.concatenate(bounds), self.min, self.max)
+        counts = np.concatenate(counts)
+        if not counts.sum():
+            return np.zeros(len(edges) - 1)
+        # the cumulative counts at the bounds, piecewise linear between
+        cumulative = np.cumsum(counts)
+        knots = bounds.ravel()
+        totals = np.column_stack((cumulative - counts, cumulative)).ravel()
+        return np.diff(np.interp(edges, knots, totals))
+
+    def quantile(self, q):
+        """Return approximate quantiles.
+
+        :param q: quantile or array of quantiles, between 0 and 1.
+        :returns: quantiles, NaN for an empty sketch. The 0 and 1 quantiles
+            are the exact minimum and maximum.
+        """
+        q = np.asarray(q, dtype=float)
+        if self.count == 0:
+            return np.full(q.shape, np.nan)[()]
+        values, counts = self.values()
+        rank = q * (self.count - 1)
+        index = np.searchsorted(np.cumsum(counts), rank, side="right")
+        out = np.clip(values[np.minimum(index, len(values) - 1)], self.min, self.max)
+        out = np.where(q <= 0, self.min, np.where(q >= 1, self.max, out))
+        return out[()]
+
+    def median(self):
+        """Return the approximate median."""
+        return self.quantile(0.5)
+
+    def mean(self):
+        """Return the mean."""
+        return self.sum / self.count if self.count else np.nan
+
+    def to_dict(self):
+        """Return the sketch as a JSON serialisable dictionary."""
+        stores = {}
+        for name, sign in (("positive", 1), ("negative", -1)):
+            offset, counts = self._stores[sign]
+            stores[name] = dict(offset=int(offset), counts=counts.tolist())
+        return dict(
+            relative_accuracy=self.relative_accuracy, zero_count=self.zero_count,
+            count=self.count, sum=self.sum, min=self.min, max=self.max, **stores)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create a sketch from the output of `to_dict`."""
+        sketch = cls(float(data["relative_accuracy"]))
+        for name, sign in (("positive", 1), ("negative", -1)):
+            store = data[name]
+            sketch._stores[sign] = (
+                int(store["offset"]), np.asarray(store["counts"], dtype=float))
+        for name in ("zero_count", "count", "sum", "min", "max"):
+            setattr(sketch, name, float(data[name]))
+        return sketch
+
+
 def choose_palette(name='colorblind', ncolours=None):
     """Choose colour palette.
 
@@ -286,9 +523,515 @@ def empty_plot(text=None, subtext=None, **kwargs):
     return plt
 
 
+class _Uncacheable(TypeError):
+    """Raised for arguments or plots that cannot be cached."""
+
+
+FINGERPRINT_ROWS = 100_000
+
+
+def _hash_frame(data):
+    """Hash the rows of a pandas object, sampling rows of large objects."""
+    if len(data) > FINGERPRINT_ROWS:
+        rows = np.linspace(0, len(data) - 1, FINGERPRINT_ROWS).astype(int)
+        data = data.iloc[np.unique(rows)]
+    try:
+        hashes = pd.util.hash_pandas_object(data, index=True).to_numpy()
+    except TypeError as e:
+        raise _Uncacheable(str(e))
+    return hashlib.sha1(hashes.tobytes()).hexdigest()
+
+
+def fingerprint(value):
+    """Return a hashable summary of a plotting function argument.
+
+    Scalars are used as they are, containers are summarised item by item.
+    DataFrames and Series are summarised by their shape, labels, dtypes and a
+    hash of their rows; beyond `FINGERPRINT_ROWS` rows only an evenly spaced
+    sample of rows is hashed, so a change to other rows goes unnoticed.
+
+    :param value: the argument.
+    :raises TypeError: for values that cannot be fingerprinted, for example
+        plot models that are meant to be shared between plots.
+    """
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        return (type(value).__name__, value)
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(fingerprint(x) for x in value))
+    if isinstance(value, dict):
+        return ('dict', tuple(sorted(
+            ((repr(k), fingerprint(v)) for k, v in value.items()),
+            key=lambda item: item[0])))
+    if isinstance(value, pd.DataFrame):
+        return (
+            'DataFrame', value.shape, tuple(map(str, value.columns)),
+            tuple(map(str, value.dtypes)), _hash_frame(value))
+    if isinstance(value, pd.Series):
+        return (
+            'Series', value.shape, str(value.name), str(value.dtype),
+            _hash_frame(value))
+    if isinstance(value, np.ndarray) and value.dtype != object:
+        return (
+            'ndarray', value.shape, str(value.dtype),
+            _hash_frame(pd.Series(value.reshape(-1))))
+    if isinstance(value, np.generic):
+        return (type(value).__name__, value.item())
+    if isinstance(value, QuantileSketch):
+        return ('QuantileSketch', fingerprint(value.to_dict()))
+    raise _Uncacheable(f"Cannot fingerprint {type(value).__name__}.")
+
+
+def _nbytes(value):
+    """Estimate the memory used by plot data."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(np.sum(value.memory_usage(index=False)))
+    if isinstance(value, dict):
+        return sum(_nbytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return 8 * len(value) + sum(
+            _nbytes(v) for v in value if isinstance(v, (list, tuple, dict)))
+    return 8
+
+
+def _clone_bokeh(model):
+    """Copy a Bokeh model and everything it references, with new IDs."""
+    rep = Serializer(deferred=False).encode(model)
+    ids = dict()
+
+    def collect(item):
+        if isinstance(item, dict):
+            if item.get('type') == 'object' and 'id' in item:
+                ids[item['id']] = make_id()
+            for value in item.values():
+                collect(value)
+        elif isinstance(item, list):
+            for value in item:
+                collect(value)
+
+    def replace(item):
+        if isinstance(item, dict):
+            item = {key: replace(value) for key, value in item.items()}
+            if item.get('id') in ids and (
+                    item.get('type') == 'object' or len(item) == 1):
+                item['id'] = ids[item['id']]
+            return item
+        if isinstance(item, list):
+            return [replace(value) for value in item]
+        return item
+
+    collect(rep)
+    return Deserializer().decode(replace(rep))
+
+
+def copy_plot(plot):
+    """Return an independent copy of a plot.
+
+    :param plot: an eChart `Plot` or a `BokehPlot`.
+    :raises TypeError: for other objects.
+    """
+    if isinstance(plot, plots.Plot):
+        return copy.deepcopy(plot)
+    if isinstance(plot, plots.BokehPlot):
+        new = copy.copy(plot)
+        new.__dict__ = copy.deepcopy(
+            {k: v for k, v in vars(plot).items() if k != '_fig'})
+        new._fig = _clone_bokeh(plot._fig)
+        return new
+    raise _Uncacheable(f"Cannot copy {type(plot).__name__}.")
+
+
+def plot_size(plot):
+    """Estimate the memory used by the data of a plot.
+
+    :param plot: an eChart `Plot` or a `BokehPlot`.
+    """
+    if isinstance(plot, plots.BokehPlot):
+        sources = [
+            model.data for model in plot._fig.references()
+            if isinstance(model, ColumnDataSource)]
+    else:
+        sources = [ds.source for ds in (plot.dataset or list())]
+    # allow for the models themselves
+    return 4096 + sum(_nbytes(source) for source in sources)
+
+
+# data with fewer rows than this are left alone by `decimate_plot`
+DECIMATE_MIN_ROWS = 256
+# glyphs (and eChart series types) whose data can be thinned to every nth row
+_THINNABLE = {
+    'Line', 'Step', 'Scatter', 'Circle', 'VArea', 'HArea', 'line', 'scatter'}
+
+
+def _thin(source, factor):
+    """Keep every `factor`-th row of a source, and its last row."""
+    if isinstance(source, pd.DataFrame):
+        rows = np.unique(np.append(np.arange(0, len(source), factor), -1))
+        return source.iloc[rows]
+    keep = source[::factor]
+    if (len(source) - 1) % factor:
+        keep = (
+            np.concatenate([keep, source[-1:]]) if isinstance(source, np.ndarray)
+            else list(keep) + [source[-1]])
+    return keep
+
+
+def _merge_bins(data, factor):
+    """Merge runs of `factor` adjacent bins of `Quad` data.
+
+    Merged bins span their constituents and are drawn at their mean height,
+    such that densities are unchanged; other columns take the first value.
+    """
+    n = len(data['left'])
+    starts = np.arange(0, n, factor)
+    merged = dict()
+    for name, values in data.items():
+        values = np.asarray(values)
+        if name == 'right':
+            merged[name] = values[np.minimum(starts + factor, n) - 1]
+        elif name == 'top' and np.issubdtype(values.dtype, np.number):
+            merged[name] = np.add.reduceat(values, starts) / np.diff(
+                np.append(starts, n))
+        else:
+            merged[name] = values[starts]
+    return merged
+
+
+def _group_column(renderers):
+    """Return the column on which renderers of a source filter it, if any."""
+    for renderer in renderers:
+        view_filter = getattr(getattr(renderer, 'view', None), 'filter', None)
+        if isinstance(view_filter, GroupFilter):
+            return view_filter.column_name
+    return None
+
+
+def _per_group(data, column, func):
+    """Apply a function to the runs of rows with the same value in a column."""
+    if column is None or column not in data:
+        return func(data)
+    groups = np.asarray(data[column])
+    bounds = np.flatnonzero(groups[1:] != groups[:-1]) + 1
+    parts = [
+        func({name: np.asarray(values)[start:end] for name, values in data.items()})
+        for start, end in zip(
+            np.append(0, bounds), np.append(bounds, len(groups)))]
+    return {
+        name: np.concatenate([part[name] for part in parts]) for name in data}
+
+
+def decimate_plot(plot, factor=2):
+    """Reduce the data drawn in a plot, to shrink its serialised size.
+
+    This is the level-of-detail fallback applied to plots when a report
+    exceeds its size budget. Data of lines, areas and markers is thinned to
+    every `factor`-th point and histogram (`Quad`) bins are merged in runs of
+    `factor`. Data with fewer than `DECIMATE_MIN_ROWS` rows, and data drawn
+    by other glyphs (or eChart series other than lines and scatters), is
+    left unchanged. Sources shared by renderers that filter them by group
+    (see `overlay_plots`) are reduced within each group.
+
+    :param plot: an eChart `Plot` or a `BokehPlot`, modified in place.
+    :param factor: factor by which to reduce the number of rows.
+    :returns: whether any data was reduced.
+    """
+    reduced = False
+    if isinstance(plot, plots.BokehPlot):
+        glyphs = dict()
+        for renderer in plot._fig.renderers:
+            source = getattr(renderer, 'data_source', None)
+            if isinstance(source, ColumnDataSource):
+                glyphs.setdefault(source.id, (source, set(), list()))
+                glyphs[source.id][1].add(type(renderer.glyph).__name__)
+                glyphs[source.id][2].append(renderer)
+        for source, names, renderers in glyphs.values():
+            data = source.data
+            n = len(next(iter(data.values()), ()))
+            if n < DECIMATE_MIN_ROWS:
+                continue
+            if names == {'Quad'} and 'left' in data and 'right' in data:
+                source.data = _per_group(
+                    data, _group_column(renderers),
+                    lambda x: _merge_bins(x, factor))
+            elif names <= _THINNABLE:
+                source.data = _per_group(
+                    data, _group_column(renderers), lambda x: {
+                        name: _thin(np.asarray(values), factor)
+                        for name, values in x.items()})
+            else:
+                continue
+            reduced = True
+        return reduced
+
+    series = plot.series if isinstance(plot.series, list) else [plot.series]
+    if not plot.dataset or not all(
+            getattr(s, 'type', None) in _THINNABLE for s in series if s):
+        return False
+    for dataset in plot.dataset:
+        source = dataset.source
+        if source is not None and len(source) >= DECIMATE_MIN_ROWS:
+            dataset.source = _thin(source, factor)
+            reduced = True
+    return reduced
+
+
+def overlay_plots(
+        bokeh_plots, labels, column="sample", alpha=0.4, recolor=True):
+    """Draw the data of several Bokeh plots of the same kind on one figure.
+
+    The data of the n-th renderer of each plot is gathered into a single
+    `ColumnDataSource` with a column of labels, drawn by a renderer per
+    label with a `CDSView` filtering on it. Renderers are tagged with their
+    label, and titles whose text differs between the plots (e.g. summary
+    statistics) with the text for each label, such that a single label can
+    be shown client-side by `ezchartsSelectLabel` (`data/scripts/overlay.js`).
+    Axis limits set on all of the plots are combined, others follow the
+    visible data.
+
+    :param bokeh_plots: `BokehPlot` instances, e.g. made by one plotting
+        function for several samples.
+    :param labels: label of each plot.
+    :param column: name of the column of labels.
+    :param alpha: fill opacity of the overlaid glyphs, or None to keep that
+        of the plots.
+    :param recolor: colour the glyphs of each label from the palette, rather
+        than keeping the colours of the plots.
+    :returns: `BokehPlot`.
+    """
+    labels = [str(x) for x in labels]
+    first = bokeh_plots[0]._fig
+    combined = plots.BokehPlot(width=first.width, height=first.height)
+    fig = combined._fig
+    for axis in ('xaxis', 'yaxis'):
+        getattr(fig, axis).axis_label = getattr(first, axis)[0].axis_label
+    for axis in ('x', 'y'):
+        plot_range = getattr(fig, f'{axis}_range')
+        plot_range.only_visible = True
+        ranges = [getattr(plot._fig, f'{axis}_range') for plot in bokeh_plots]
+        starts = [x.start for x in ranges]
+        ends = [x.end for x in ranges]
+        if None not in starts:
+            plot_range.start = min(starts)
+        if None not in ends:
+            plot_range.end = max(ends)
+        for plot in bokeh_plots:
+            extent = getattr(plot, f'{axis}_extent')
+            if not extent.empty:
+                getattr(combined, f'{axis}_extent').accumulate(
+                    [extent.min, extent.max])
+
+    # titles, taking the text of the first plot for those common to all
+    titles = [
+        [x for x in plot._fig.above if isinstance(x, Title)]
+        for plot in bokeh_plots]
+    for number, title in enumerate(titles[0]):
+        texts = [x[number].text if number < len(x) else '' for x in titles]
+        tags = [] if len(set(texts)) == 1 else [dict(zip(labels, texts))]
+        fig.add_layout(
+            Title(text=texts[0] if not tags else '',
+                  text_font_size=title.text_font_size, tags=tags),
+            'above')
+
+    # the n-th renderer of each kind of glyph of each plot are drawn together
+    groups = dict()
+    for plot, label in zip(bokeh_plots, labels):
+        counts = dict()
+        for renderer in plot._fig.renderers:
+            if not isinstance(renderer, GlyphRenderer):
+                continue
+            kind = type(renderer.glyph).__name__
+            counts[kind] = counts.get(kind, -1) + 1
+            groups.setdefault((kind, counts[kind]), list()).append(
+                (label, renderer))
+    colors = cycle(choose_palette())
+    label_colors = {label: next(colors) for label in labels}
+
+    def _style(glyph, label):
+        for name in ('line_color', 'fill_color'):
+            if recolor and getattr(glyph, name, None) is not None:
+                setattr(glyph, name, label_colors[label])
+        if alpha is not None and getattr(glyph, 'fill_alpha', None) is not None:
+            glyph.fill_alpha = alpha
+        return glyph
+
+    def _filtered(label):
+        return CDSView(filter=GroupFilter(column_name=column, group=label))
+
+    lines, drawn = list(), dict()
+    for key, entries in groups.items():
+        glyph = entries[0][1].glyph
+        drawn[key] = list()
+        if isinstance(glyph, Line):
+            # filters cannot select points of connected glyphs, so draw the
+            # lines as rows of one multi-line source
+            source = ColumnDataSource({
+                'xs': [np.asarray(r.data_source.data[r.glyph.x]) for _, r in entries],
+                'ys': [np.asarray(r.data_source.data[r.glyph.y]) for _, r in entries],
+                column: [label for label, _ in entries]})
+            for label, renderer in entries:
+                drawn[key].append(fig.add_glyph(
+                    source, _style(MultiLine(
+                        xs='xs', ys='ys', line_color=renderer.glyph.line_color,
+                        line_width=renderer.glyph.line_width,
+                        line_alpha=renderer.glyph.line_alpha,
+                        line_dash=renderer.glyph.line_dash), label),
+                    tags=[label], view=_filtered(label)))
+            lines.extend(drawn[key])
+            continue
+        if isinstance(glyph, ConnectedXYGlyph):
+            # other connected glyphs (e.g. areas) keep a source per label
+            for label, renderer in entries:
+                data = dict(renderer.data_source.data)
+                data[column] = [label] * len(next(iter(data.values()), ()))
+                drawn[key].append(fig.add_glyph(
+                    ColumnDataSource(data), _style(renderer.glyph.clone(), label),
+                    tags=[label]))
+            continue
+        names = set.intersection(
+            *(set(renderer.data_source.data) for _, renderer in entries))
+        data = {
+            name: np.concatenate([
+                np.asarray(renderer.data_source.data[name])
+                for _, renderer in entries])
+            for name in sorted(names)}
+        data[column] = np.repeat(
+            [label for label, _ in entries],
+            [len(next(iter(renderer.data_source.data.values())))
+             for _, renderer in entries])
+        source = ColumnDataSource(data)
+        for label, renderer in entries:
+            drawn[key].append(fig.add_glyph(
+                source, _style(renderer.glyph.clone(), label), tags=[label],
+                view=_filtered(label)))
+
+    # legends of the first plot, with items showing the glyphs of all labels
+    keys = {
+        renderer.id: key for key, entries in groups.items()
+        for label, renderer in entries if label == labels[0]}
+    for legend in first.legend:
+        items = [
+            LegendItem(label=item.label, renderers=[
+                x for renderer in item.renderers
+                for x in drawn.get(keys.get(renderer.id), ())])
+            for item in legend.items]
+        fig.add_layout(Legend(
+            items=items, location=legend.location,
+            click_policy=legend.click_policy))
+
+    hover = fig.select_one(HoverTool)
+    tooltips = first.select_one(HoverTool)
+    tooltips = tooltips.tooltips if tooltips is not None else None
+    if hover is not None and tooltips:
+        hover.tooltips = [(column.capitalize(), f"@{column}"), *tooltips]
+    if hover is not None and lines:
+        # points along multi-lines are not rows of their source
+        line_tooltips = [
+            (column.capitalize(), f"@{column}"),
+            (fig.xaxis[0].axis_label or "x", "$x"),
+            (fig.yaxis[0].axis_label or "y", "$y")]
+        others = [x for x in fig.renderers if x not in lines]
+        if others:
+            hover.renderers = others
+            fig.add_tools(HoverTool(renderers=lines, tooltips=line_tooltips))
+        else:
+            hover.tooltips = line_tooltips
+    return combined
+
+
+class PlotCache:
+    """Least recently used cache of plots, bounded by their estimated size.
+
+    Plots are copied on the way in and on the way out, so callers are free to
+    modify the plots they are given.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 ** 2):
+        """Initialize the cache.
+
+        :param max_bytes: maximum total estimated size of the cached plots.
+        """
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._plots = OrderedDict()
+
+    def __len__(self):
+        """Return the number of cached plots."""
+        return len(self._plots)
+
+    def clear(self):
+        """Remove all plots."""
+        self._plots.clear()
+        self.nbytes = 0
+
+    def get(self, key):
+        """Return a copy of the plot stored for a key, or None."""
+        entry = self._plots.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._plots.move_to_end(key)
+        return copy_plot(entry[0])
+
+    def put(self, key, plot):
+        """Store a copy of a plot, evicting the least recently used plots.
+
+        Plots larger than the cache are not stored.
+        """
+        size = plot_size(plot)
+        if size > self.max_bytes:
+            return
+        if key in self._plots:
+            self.nbytes -= self._plots.pop(key)[1]
+        self._plots[key] = (copy_plot(plot), size)
+        self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            _, (_, evicted) = self._plots.popitem(last=False)
+            self.nbytes -= evicted
+
+
+def _cache_from_env():
+    """Create the plot cache if requested by `EZCHARTS_PLOT_CACHE`."""
+    size = os.environ.get("EZCHARTS_PLOT_CACHE")
+    if not size:
+        return None
+    return PlotCache(max_bytes=int(float(size) * 1024 ** 2))
+
+
+_plot_cache = _cache_from_env()
+
+
+def enable_plot_cache(max_bytes=256 * 1024 ** 2):
+    """Memoise plotting functions decorated with `plot_wrapper`.
+
+    Calls with the same arguments return copies of the first plot made.
+    Arguments are compared using `fingerprint`; calls with arguments that
+    cannot be fingerprinted are not cached. The cache can also be enabled
+    by setting `EZCHARTS_PLOT_CACHE` to a size in megabytes.
+
+    :param max_bytes: maximum total estimated size of the cached plots.
+    :returns: the `PlotCache`.
+    """
+    global _plot_cache
+    _plot_cache = PlotCache(max_bytes=max_bytes)
+    return _plot_cache
+
+
+def disable_plot_cache():
+    """Stop memoising plotting functions and drop any cached plots."""
+    global _plot_cache
+    _plot_cache = None
+
+
 def plot_wrapper(func):
     """Decorate plotting functions to ignore exceptions.
 
+    Plots are memoised when the plot cache is enabled, see
+    `enable_plot_cache`.
+
     :param func: plotting function.
     :param args: the arguments provided.
     :param kwargs: other optional key word arguments.
@@ -299,8 +1042,26 @@ def plot_wrapper(func):
     def wrapper_accepting_arguments(*args, **kwargs):
         """Argument wrapper for decorator."""
         logger = util.get_named_logger("PlotWrap")
+        cache = _plot_cache
+        key = None
+        if cache is not None:
+            try:
+                key = (
+                    func.__module__, func.__qualname__,
+                    fingerprint(args), fingerprint(kwargs))
+            except TypeError:
+                pass
+            else:
+                p = cache.get(key)
+                if p is not None:
+                    return p
         try:
             p = func(*args, **kwargs)
+            if key is not None:
+                try:
+                    cache.put(key, p)
+                except Exception as e:
+                    logger.warning("Could not cache plot: " + str(e))
             return p
         except Exception as e:
             # check if debug mode is enabled:
@@ -340,10 +1101,15 @@ class Limiter(object):
 
         """
         if len(data) > 0:
-            self.min = min(self.min, min(data))
-            self.max = max(self.max, max(data))
+            self.min = min(self.min, np.nanmin(data))
+            self.max = max(self.max, np.nanmax(data))
         return self
 
+    @property
+    def empty(self):
+        """Whether no limits have been gathered."""
+        return self.min > self.max
+
     def fix(self, lower=None, upper=None):
         """Fix limits to new values.
 
@@ -362,6 +1128,49 @@ class Limiter(object):
         return repr((self.min, self.max))
 
 
+def link_axes(plots, axis="y", start=False, end=True):
+    """Share the limits of an axis between a group of plots.
+
+    Limits are taken from the extents recorded on the plots as data was
+    added, see `BokehPlot.accumulate_extents()`, so the cost is constant per
+    plot. Plots without recorded data (e.g. an `empty_plot()`) are left
+    untouched.
+
+    :param plots: iterable of `BokehPlot` and/or `Plot` instances.
+    :param axis: axis to link, "x" or "y".
+    :param start: set the start of the axis to the common minimum.
+    :param end: set the end of the axis to the common maximum.
+
+    :returns: `Limiter` with the common limits.
+    """
+    if axis not in ("x", "y"):
+        raise ValueError("`axis` must be one of 'x' or 'y'.")
+    linked = list()
+    limits = Limiter()
+    for plot in plots:
+        extent = getattr(plot, f"{axis}_extent", None)
+        if extent is None or extent.empty:
+            continue
+        linked.append(plot)
+        limits.accumulate([extent.min, extent.max])
+    for plot in linked:
+        if hasattr(plot, "_fig"):  # bokeh
+            plot_range = getattr(plot._fig, f"{axis}_range")
+            if start:
+                plot_range.start = limits.min
+            if end:
+                plot_range.end = limits.max
+        else:
+            plot_axis = getattr(plot, f"{axis}Axis")
+            if plot_axis is None or isinstance(plot_axis, list):
+                continue
+            if start:
+                plot_axis.min = limits.min
+            if end:
+                plot_axis.max = limits.max
+    return limits
+
+
 def si_format(n):
     """Use `si-prefix`, but don't add a decimal when `n` is smaller than 1000.
 
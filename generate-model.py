@@ -1,10 +1,30 @@
 #!/usr/bin/env python
+"""Generate ezcharts/plots/_model.py from the eCharts option schema.
 
+By default pydantic models are generated with datamodel-codegen. With
+`--slots` lightweight `__slots__` classes are generated instead, these
+are built on `ezcharts.plots._slots.SlotsModel` and expose the same
+class names and attributes so `Plot` works unchanged with either.
+"""
+
+import argparse
 import json
+import keyword
+import re
 import subprocess
-import sys
 
-with open(sys.argv[1], 'r') as fh:
+
+parser = argparse.ArgumentParser(description=__doc__)
+parser.add_argument("schema", help="eCharts option schema JSON.")
+parser.add_argument(
+    "--slots", action="store_true",
+    help="Generate slotted classes rather than pydantic models.")
+parser.add_argument(
+    "--output", default="ezcharts/plots/_model.py",
+    help="Output python module.")
+args = parser.parse_args()
+
+with open(args.schema, 'r') as fh:
     api = json.load(fh)
 
 new_api = {
@@ -41,45 +61,168 @@ def walk(node):
 
 walk(new_api)
 
-tmpfile = sys.argv[1] + '.clean'
-with open(tmpfile, 'w') as fh:
-    json.dump(new_api, fh, indent=4)
-
-proc = subprocess.run(f"""
-    datamodel-codegen
-        --class-name EChartsOption
-        --base-class ezcharts.plots._base.BaseModel
-        --use-schema-description --reuse-model
-        --input {tmpfile} --input-file-type jsonschema""".split(),
-    capture_output=True)
-
-# make some changes to the models
-model = proc.stdout.decode()
-
-laundry_list = dict(
-    dataset=dict(
-        find="dataset: Optional[Dataset] = Field(",
-        replace="dataset: Optional[Union[List[Dataset], Dataset]] = Field("),
-    grid=dict(
-        find="grid: Optional[Grid] = Field(",
-        replace="grid: Optional[Union[List[Grid], Grid]] = Field("),
-    xaxis=dict(
-        find="xAxis: Optional[XAxis] = Field(",
-        replace="xAxis: Optional[Union[List[XAxis], XAxis]] = Field("),
-    yaxis=dict(
-        find="yAxis: Optional[YAxis] = Field(",
-        replace="yAxis: Optional[Union[List[YAxis], YAxis]] = Field("),
-    renderitem=dict(
-        find="renderItem: Optional[RenderItem] = Field(",
-        replace="renderItem: Optional[JSCode] = Field("),
-    imports=dict(
-        find="from __future__ import annotations",
-        replace="""from __future__ import annotations\n
-        from ezcharts.plots.util import JSCode"""))
-
-for k, v in laundry_list.items():
-    model = model.replace(v['find'], v['replace'])
-
-with open("ezcharts/plots/_model.py", 'w') as fh:
+
+def pydantic_model():
+    tmpfile = args.schema + '.clean'
+    with open(tmpfile, 'w') as fh:
+        json.dump(new_api, fh, indent=4)
+
+    proc = subprocess.run(f"""
+        datamodel-codegen
+            --class-name EChartsOption
+            --base-class ezcharts.plots._base.BaseModel
+            --use-schema-description --reuse-model
+            --input {tmpfile} --input-file-type jsonschema""".split(),
+        capture_output=True)
+
+    # make some changes to the models
+    model = proc.stdout.decode()
+
+    laundry_list = dict(
+        dataset=dict(
+            find="dataset: Optional[Dataset] = Field(",
+            replace="dataset: Optional[Union[List[Dataset], Dataset]] = Field("),
+        grid=dict(
+            find="grid: Optional[Grid] = Field(",
+            replace="grid: Optional[Union[List[Grid], Grid]] = Field("),
+        xaxis=dict(
+            find="xAxis: Optional[XAxis] = Field(",
+            replace="xAxis: Optional[Union[List[XAxis], XAxis]] = Field("),
+        yaxis=dict(
+            find="yAxis: Optional[YAxis] = Field(",
+            replace="yAxis: Optional[Union[List[YAxis], YAxis]] = Field("),
+        renderitem=dict(
+            find="renderItem: Optional[RenderItem] = Field(",
+            replace="renderItem: Optional[JSCode] = Field("),
+        imports=dict(
+            find="from __future__ import annotations",
+            replace="""from __future__ import annotations\n
+            from ezcharts.plots.util import JSCode"""))
+
+    for k, v in laundry_list.items():
+        model = model.replace(v['find'], v['replace'])
+    return model
+
+
+class SlotsEmitter:
+    """Emit `SlotsModel` subclasses for a cleaned schema.
+
+    Classes are emitted children first so the class-level `_children`
+    tables can refer to them directly. Structurally identical nodes share
+    a class, as with datamodel-codegen's `--reuse-model`.
+    """
+
+    # fields that are never coerced to child options (cf. laundry list above)
+    passthrough = {"renderItem"}
+
+    def __init__(self):
+        self.classes = list()
+        self.names = set()
+        self.signatures = dict()
+
+    @staticmethod
+    def types(node):
+        kind = node.get("type", [])
+        if isinstance(kind, str):
+            kind = [kind]
+        return tuple(sorted({k.lower() for k in kind}))
+
+    @staticmethod
+    def signature(node):
+        def strip(x):
+            if isinstance(x, dict):
+                return {
+                    k: strip(v) for k, v in x.items()
+                    if k != "description"}
+            if isinstance(x, list):
+                return [strip(v) for v in x]
+            return x
+        return json.dumps(strip(node), sort_keys=True)
+
+    @staticmethod
+    def identifier(key):
+        name = re.sub(r"\W", "_", key)
+        if not name or name[0].isdigit():
+            name = "field_" + name
+        if keyword.iskeyword(name):
+            name += "_"
+        return name
+
+    def class_name(self, key):
+        base = re.sub(r"\W", "", key[:1].upper() + key[1:]) or "Model"
+        name, i = base, 0
+        while name in self.names:
+            i += 1
+            name = f"{base}{i}"
+        self.names.add(name)
+        return name
+
+    def children(self, key, node):
+        """Return the class names of objects described by a property."""
+        found = list()
+        if "properties" in node:
+            found.append(self.emit(key, node))
+        if isinstance(node.get("items"), dict):
+            found.extend(self.children(key, node["items"]))
+        for union in ("anyOf", "oneOf"):
+            for option in node.get(union, []):
+                found.extend(self.children(key, option))
+        return list(dict.fromkeys(found))
+
+    def emit(self, key, node):
+        sig = self.signature(node)
+        if sig in self.signatures:
+            return self.signatures[sig]
+        name = self.class_name(key)
+        self.signatures[sig] = name
+        fields, aliases, children, types = list(), dict(), dict(), dict()
+        for prop, spec in node["properties"].items():
+            attr = self.identifier(prop)
+            while attr in fields:
+                attr += "_"
+            fields.append(attr)
+            if attr != prop:
+                aliases[attr] = prop
+            if self.types(spec):
+                types[attr] = self.types(spec)
+            if prop in self.passthrough:
+                continue
+            kids = self.children(prop, spec)
+            if len(kids) == 1:
+                children[attr] = kids[0]
+            elif kids:
+                children[attr] = "(" + ", ".join(kids) + ",)"
+        tag = node["properties"].get("type", {}).get("default")
+        lines = [
+            f"class {name}(SlotsModel):",
+            f"    _fields = {tuple(fields)!r}",
+            "    __slots__ = _fields"]
+        if aliases:
+            lines.append(f"    _aliases = {aliases!r}")
+        if children:
+            lines.append("    _children = {%s}" % ", ".join(
+                f"{k!r}: {v}" for k, v in children.items()))
+        if types:
+            lines.append(f"    _types = {types!r}")
+        if isinstance(tag, str):
+            lines.append(f"    _tag = {tag!r}")
+        self.classes.append("\n".join(lines))
+        return name
+
+    def module(self, schema):
+        # the root claims its name first, but is written out last
+        self.emit("EChartsOption", schema)
+        header = (
+            '"""eCharts option classes, generated by generate-model.py --slots."""'
+            "\n\nfrom ezcharts.plots._slots import SlotsModel")
+        return header + "\n\n\n" + "\n\n\n".join(self.classes) + "\n"
+
+
+if args.slots:
+    model = SlotsEmitter().module(new_api)
+else:
+    model = pydantic_model()
+
+with open(args.output, 'w') as fh:
     fh.write("# flake8: noqa\n")
     fh.write(model)
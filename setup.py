@@ -34,7 +34,10 @@ with open(os.path.join(dir_path, 'requirements.txt')) as fh:
     install_requires = [req for line in fh if (req := line.strip()) and not req.startswith("#")]
 
 data_files = []
-extra_requires = {}
+extra_requires = {
+    # compiled kernels, see ezcharts.kernels
+    'numba': ['numba'],
+}
 extensions = []
 
 setup(
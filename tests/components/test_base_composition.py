@@ -0,0 +1,74 @@
+"""Test the base composition component."""
+
+import json
+
+from bokeh.embed import json_item
+from bokeh.models import Range1d
+import numpy as np
+import pandas as pd
+
+from ezcharts.components.base_composition import BaseComposition
+
+
+def _data(n):
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame({
+        'x': np.arange(1, n + 1),
+        'COV': rng.integers(1, 100, n),
+        'reference_base': rng.choice(list('ATGC'), n),
+        'qscore': rng.normal(30, 5, n)})
+    for base in ['A', 'T', 'G', 'C', 'DEL']:
+        data[base] = rng.integers(0, 50, n)
+    return data
+
+
+def test_001_multiresolution_levels():
+    """Binned levels preserve coverage and give per-bin proportions."""
+    data = _data(2500)
+    plot = BaseComposition(
+        data, qscore='qscore', multiresolution=True, bin_widths=(10, 100, 5000))
+    # widths not smaller than the data are dropped
+    assert plot.level_widths == [1, 10, 100]
+    for width, level in zip(plot.level_widths, plot.levels):
+        cols = level.data
+        assert len(cols['x']) == len(data) // width
+        assert cols['COV'].dtype == np.float32
+        np.testing.assert_allclose(
+            cols['COV'].sum() * width, data['COV'].sum(), rtol=1e-5)
+        props = np.column_stack([cols[b] for b in plot.base_columns])
+        np.testing.assert_allclose(props.sum(axis=1), 1, rtol=1e-5)
+    # the initial view is 100 positions so the finest level is drawn
+    assert plot.level_source.tags == [0]
+    assert all(labels.visible for labels in plot._label_sets)
+    callback, = plot.view_range.js_property_callbacks['change:start']
+    assert callback.args['source'] is plot.level_source
+
+
+def test_002_multiresolution_zoomed_out():
+    """A wide initial view starts at a coarse level with labels hidden."""
+    plot = BaseComposition(
+        _data(50000), multiresolution=True, max_bins=1000,
+        view_range=Range1d(1, 40000))
+    assert plot.level_widths[plot.level_source.tags[0]] == 100
+    assert not any(labels.visible for labels in plot._label_sets)
+
+
+def test_003_multiresolution_size():
+    """Labels are drawn from the level sources, and each level embedded once."""
+    n = 20000
+    data = _data(n)
+    data['consensus'] = data['reference_base']
+    plot = BaseComposition(
+        data, qscore='qscore', consensus_base='consensus', multiresolution=True)
+    assert all(x.source is plot.level_source for x in plot._label_sets)
+    callback, = plot.view_range.js_property_callbacks['change:start']
+    levels = callback.args['levels']
+    assert levels[plot.level_source.tags[0]] is None
+    # codes of the bases at the finest level, blank at coarser levels
+    codes = plot.levels[0].data['_reference_base_code']
+    assert codes.dtype == np.int8 and codes.min() > 0
+    assert not plot.levels[1].data['_reference_base_code'].any()
+    # the numeric columns of the finest level are about 60 bytes per position
+    # when base64 encoded, with coarser levels adding a tenth of this
+    size = len(json.dumps(json_item(plot._fig)))
+    assert size < 80 * n
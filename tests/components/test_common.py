@@ -0,0 +1,50 @@
+"""Test the common parsers."""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from ezcharts.components.common import add_missing_windows, compact_frame
+
+
+def test_001_add_missing_windows():
+    """Leading, intermediate and trailing windows are added."""
+    faidx = pd.DataFrame({'chrom': ['chr1', 'chr2'], 'length': [100, 30]})
+    intervals = pd.DataFrame({
+        'chrom': ['chr1', 'chr1'], 'start': [20, 60], 'end': [40, 70],
+        'depth': [5.0, 7.0]})
+    result = add_missing_windows(intervals, faidx, value='depth', winsize=25)
+    assert result['chrom'].tolist() == ['chr1'] * 6 + ['chr2'] * 2
+    assert result['start'].tolist() == [0, 20, 40, 60, 70, 95, 0, 25]
+    assert result['end'].tolist() == [20, 40, 60, 70, 95, 100, 25, 30]
+    assert result['depth'].tolist() == [0, 5, 0, 7, 0, 0, 0, 0]
+
+
+def test_002_compact_frame(caplog):
+    """Columns are narrowed where their values are kept, and logged."""
+    df = pd.DataFrame({
+        'length': np.array([10, 20, 2**31 - 1], dtype=np.int64),
+        'big': np.array([0, 1, 2**31], dtype=np.int64),
+        'nullable': pd.array([1, None, 3], dtype="Int64"),
+        'quality': [10.25, 12.3, 15.1],
+        'position': [1.5e8 + 0.5, 2.0, 3.0],
+        'pval': [1e-50, 0.1, 0.5],
+        'sample': ['a', 'a', 'a'],
+        'read_id': ['r1', 'r2', 'r3'],
+    })
+    with caplog.at_level(logging.INFO):
+        result = compact_frame(
+            df, keep=['length', 'big', 'nullable', 'quality', 'position',
+                      'pval', 'sample', 'missing'], name='test')
+    assert 'Loaded test: 3 rows' in caplog.text
+    assert list(result.columns) == [
+        'length', 'big', 'nullable', 'quality', 'position', 'pval', 'sample']
+    assert result.dtypes.to_dict() == {
+        'length': np.int32, 'big': np.int64, 'nullable': pd.Int32Dtype(),
+        'quality': np.float32, 'position': np.float64, 'pval': np.float64,
+        'sample': pd.CategoricalDtype(['a'])}
+    assert result['nullable'].isna().tolist() == [False, True, False]
+    np.testing.assert_allclose(result['quality'], df['quality'], rtol=1e-6)
+    # the input is left unchanged
+    assert df['length'].dtype == np.int64
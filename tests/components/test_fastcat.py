@@ -5,10 +5,14 @@ from importlib.resources import files
 import os
 import tempfile
 
+import numpy as np
 import pandas as pd
 import pytest
 
+import ezcharts as ezc
 from ezcharts.components import fastcat
+from ezcharts.components.ezchart import _BokehChart
+from ezcharts.plots.util import QuantileSketch
 
 
 def _read_pandas(fname, dtype, target_cols=None):
@@ -110,6 +114,20 @@ def test_005_fastcat_empty():
             fastcat.load_fastcat(fname)
 
 
+def test_003_read_fastcat_compact():
+    """Load only the plotted columns, in narrow types."""
+    fname = str(files('ezcharts').joinpath("data/test/fastcat/f1.tsv.gz"))
+    df = fastcat.load_fastcat(fname, compact=True)
+    expected = _read_pandas(
+        fname, fastcat.FASTCAT_COLS_DTYPES, fastcat.FASTCAT_PLOT_COLUMNS)
+    assert list(df.columns) == fastcat.FASTCAT_PLOT_COLUMNS
+    assert df['read_length'].dtype == np.int32
+    assert df['mean_quality'].dtype == np.float32
+    np.testing.assert_array_equal(df['read_length'], expected['read_length'])
+    np.testing.assert_allclose(
+        df['mean_quality'], expected['mean_quality'], rtol=1e-6)
+
+
 def test_011_read_bamstats():
     """Reading a bamstats file."""
     fname = str(files('ezcharts').joinpath(
@@ -239,6 +257,44 @@ def test_041_load_histogram():
         _compare_frames(actual, expected)
 
 
+def test_043_compact_histogram_yield(tmp_path):
+    """Yield and N50 of compact histograms do not overflow."""
+    starts = np.arange(1000, 300000, 1000)
+    pd.DataFrame({
+        "start": starts, "end": starts + 1000, "count": np.full(len(starts), 10**5)
+    }).to_csv(tmp_path / "length.hist", sep="\t", header=False, index=False)
+    hists = [
+        fastcat.load_histogram(tmp_path, "length", compact=compact)
+        for compact in (False, True)]
+    assert hists[1]["start"].dtype == np.int32
+    assert hists[1]["count"].dtype == np.int64
+    titles = [
+        [x.text for x in fastcat.base_yield_plot(hist)._fig.above]
+        for hist in hists]
+    assert titles[0] == titles[1]
+    assert "Total yield: 4490.0 Gb" in titles[0][0]
+    # narrowed by the caller
+    narrow = hists[0].astype(np.int32)
+    assert [x.text for x in fastcat.base_yield_plot(narrow)._fig.above] == titles[0]
+    bases = [
+        fastcat.SampleSummary().add_histogram("length", hist).bases
+        for hist in (hists[0], narrow)]
+    assert bases == [int(np.dot(starts, np.full(len(starts), 10**5)))] * 2
+
+
+def test_044_yield_plot_raw_reads():
+    """The yield curve of per-read data is drawn as a single line of all points."""
+    rng = np.random.default_rng(0)
+    # repeated read lengths
+    data = pd.DataFrame({"read_length": rng.integers(100, 200, size=999)})
+    plt = fastcat.base_yield_plot(data)
+    assert [type(r.glyph).__name__ for r in plt._fig.renderers] == ["Line"]
+    # a leading zero and all reads, too few to be thinned
+    line = plt._fig.renderers[0].data_source.data
+    np.testing.assert_array_equal(
+        line["x"], np.concatenate(([0], np.sort(data.read_length))) / 1000)
+
+
 def test_042_load_unallowed_histogram():
     """Load an unallowed type."""
     hist_dir = str(files('ezcharts').joinpath(
@@ -354,3 +410,155 @@ def test_108_SeqSummary_empty_histogram_files():
             "data/test/histogram_stats/empty_sample/"
         ))
     )
+
+
+def test_109_plots_from_sketch():
+    """Read length, histogram and box plots can be drawn from sketches."""
+    rng = np.random.default_rng(0)
+    lengths = rng.lognormal(8, 1, 10000).astype(int) + 1
+    sketch = QuantileSketch.from_values(lengths)
+    plt = fastcat.read_length_plot(
+        sketch, xlim=(0.05, 0.95), quantile_limits=True)
+    lo, hi = np.quantile(lengths, [0.05, 0.95]) / 1000
+    assert plt._fig.x_range.start == pytest.approx(lo, rel=0.01)
+    assert plt._fig.x_range.end == pytest.approx(hi, rel=0.01)
+    plt = fastcat.histogram_plot(sketch, col="read_length", binwidth=100)
+    assert "Median" in plt._fig.above[0].text
+
+    plt = ezc.boxplot({"a": sketch, "b": QuantileSketch.from_values(lengths * 2)})
+    medians = plt._fig.renderers[0].data_source.data["q2"]
+    np.testing.assert_allclose(
+        medians, np.median(lengths) * np.array([1, 2]), rtol=0.01)
+
+
+def test_109b_sketch_histograms():
+    """Histograms drawn from sketches follow those of the raw values."""
+    rng = np.random.default_rng(1)
+    lengths = rng.gamma(2, 3000, 50000).astype(int) + 1
+    sketch = QuantileSketch.from_values(lengths)
+    plt = fastcat.histogram_plot(sketch, col="read_length", binwidth=100)
+    data = plt._fig.renderers[0].data_source.data
+    edges = np.append(data["left"], data["right"][-1])
+    expected, _ = np.histogram(lengths, bins=edges)
+    heights = np.asarray(data["top"])
+    assert heights.sum() == pytest.approx(len(lengths))
+    # no empty bins or spikes where buckets are wider than the bins
+    assert np.all(heights[expected > 50] > 0)
+    assert np.abs(heights - expected).sum() / len(lengths) < 0.05
+
+    plt = fastcat.read_length_plot(sketch, binwidth=100)
+    data = plt._fig.renderers[0].data_source.data
+    edges = np.append(data["left"], data["right"][-1]) * 1000
+    expected, _ = np.histogram(lengths, bins=edges)
+    assert np.abs(data["top"] - expected).sum() / len(lengths) < 0.05
+
+
+def _write_batches(directory, n_batches=2):
+    """Split a fastcat per-read stats file into batches, as in a live run."""
+    reads = pd.read_csv(files('ezcharts').joinpath(
+        "data/test/real_data_test/fastcat/barcode01/per-read-stats.tsv.gz"),
+        sep="\t")
+    paths = []
+    for i, batch in enumerate(np.array_split(reads, n_batches)):
+        paths.append(os.path.join(directory, f"batch{i}.tsv"))
+        batch.to_csv(paths[-1], sep="\t", index=False)
+    return reads, paths
+
+
+def test_110_sample_summary():
+    """Summaries of reads and of histograms agree."""
+    data = files('ezcharts').joinpath("data/test/real_data_test/bamstats/barcode01")
+    reads = fastcat.load_stats(str(data.joinpath("bamstats.readstats.tsv.gz")))
+    from_reads = fastcat.SampleSummary().add_reads(reads)
+    from_hists = fastcat.SampleSummary().add(str(data))
+    assert from_reads.reads == from_hists.reads == len(reads)
+    assert from_reads.bases == from_hists.bases == reads.read_length.sum()
+    _compare_frames(
+        from_reads.histogram("length"), from_hists.histogram("length"))
+    expected = reads.read_length.value_counts().sort_index()
+    np.testing.assert_array_equal(
+        from_reads.histogram("length")["start"], expected.index)
+    np.testing.assert_array_equal(
+        from_reads.histogram("length")["count"], expected)
+    restored = fastcat.SampleSummary.from_dict(from_hists.to_dict())
+    for metric in fastcat.HISTOGRAM_BINWIDTHS:
+        _compare_frames(restored.histogram(metric), from_hists.histogram(metric))
+
+
+def test_111_live_summary():
+    """Live summaries read only new files and persist their state."""
+    with tempfile.TemporaryDirectory() as tmp:
+        reads, paths = _write_batches(tmp, 3)
+        state = os.path.join(tmp, "state.json")
+        live = fastcat.LiveSummary(state)
+        assert live.update("s1", paths[:2]) == paths[:2]
+        live.save()
+        live = fastcat.LiveSummary(state)
+        assert live.update("s1", paths) == paths[2:]
+        assert live.update("s1", paths) == []
+        summary = live.samples["s1"]
+        assert summary.reads == len(reads)
+        assert summary.bases == reads.read_length.sum()
+        live.save()
+        fastcat.SeqSummary(seq_summary=fastcat.LiveSummary(state))
+
+        # files may not change once added
+        with open(paths[0], "a") as fh:
+            fh.write("\n")
+        with pytest.raises(ValueError, match="has changed"):
+            fastcat.LiveSummary(state).update("s1", paths)
+
+
+def _summaries_equal(a, b):
+    """Check two summaries have the same totals, histograms and quantiles."""
+    assert (a.reads, a.bases) == (b.reads, b.bases)
+    assert a.histograms.keys() == b.histograms.keys()
+    for metric in a.histograms:
+        _compare_frames(a.histogram(metric), b.histogram(metric))
+        np.testing.assert_array_equal(
+            a.quantile(metric, [0, 0.1, 0.5, 0.9, 1]),
+            b.quantile(metric, [0, 0.1, 0.5, 0.9, 1]))
+
+
+@pytest.mark.parametrize("suffix", [".json", ".npz"])
+def test_112_sample_summary_merge(suffix):
+    """Summaries of batches merge into the summary of the whole."""
+    with tempfile.TemporaryDirectory() as tmp:
+        reads, paths = _write_batches(tmp, 3)
+        whole = fastcat.SampleSummary.from_dataframe(
+            fastcat.load_stats(paths[0]).iloc[:0])
+        for path in paths:
+            whole.add(path)
+        a, b, c = map(fastcat.SampleSummary.from_file, paths)
+        _summaries_equal((a + b) + c, a + (b + c))
+        _summaries_equal(a + b + c, whole)
+        assert whole.quantile("length", 0.5) == pytest.approx(
+            reads.read_length.median(), rel=0.01)
+
+        path = os.path.join(tmp, f"summary{suffix}")
+        whole.save(path)
+        _summaries_equal(fastcat.SampleSummary.load(path), whole)
+        empty = os.path.join(tmp, f"empty{suffix}")
+        fastcat.SampleSummary().save(empty)
+        assert fastcat.SampleSummary.load(empty).reads == 0
+
+        fastcat.SeqSummary(seq_summary=(a, b + c), sample_names=("a", "bc"))
+        fastcat.SeqCompare(seq_summary=(a, b + c), sample_names=("a", "bc"))
+
+
+def test_113_seq_compare_single_figure():
+    """Draw all samples on one figure per metric with a sample selector."""
+    data = str(files('ezcharts').joinpath("data/test/real_data_test/fastcat"))
+    summaries = tuple(
+        fastcat.SampleSummary.from_file(f"{data}/{name}/per-read-stats.tsv.gz")
+        for name in ("barcode01", "barcode02"))
+    comp = fastcat.SeqCompare(
+        summaries, sample_names=("b", "a"), single_figure=True)
+    charts = comp.get(_BokehChart)
+    assert len(charts) == 3  # length, yield and quality
+    for chart in charts:
+        renderers = chart.plot._fig.renderers
+        assert {x.tags[0] for x in renderers} == {"a", "b"}
+    html = comp.render()
+    assert "ezchartsSelectLabel(this)" in html
+    assert html.index(">a<") < html.index(">b<")
@@ -0,0 +1,88 @@
+"""Test the sample switcher."""
+
+from importlib.resources import files
+import json
+import re
+
+import numpy as np
+import pandas as pd
+
+import ezcharts as ezc
+from ezcharts.components import fastcat, mosdepth
+from ezcharts.components.ezchart import _BokehChart, _ReportChart
+from ezcharts.components.reports.labs import BasicReport
+from ezcharts.components.switcher import SampleSwitcher
+from ezcharts.layout.snippets import DataTable
+from ezcharts.plots.util import empty_plot
+
+
+def _store(html):
+    """Return the slots registered with the switcher, without eChart options."""
+    match = re.search(r"ezchartsSwitcher\.register\('(\w+)', \[(.*)\]\);", html)
+    assert match is not None
+    return match.group(1), match.group(2)
+
+
+def test_001_sample_switcher():
+    """Draw one chart and table, with the data of each sample in the store."""
+    frames = {
+        name: pd.DataFrame({'x': [1, 2, 3], 'y': [i, i + 1, i + 2]})
+        for i, name in enumerate(('a', 'b'))}
+    samples = SampleSwitcher(['a', 'b'])
+    with samples:
+        chart = samples.add_chart({k: empty_plot(text=k) for k in frames})
+        table = samples.add_table(frames)
+    assert len(samples.get(_ReportChart)) == 1
+    assert len(samples.get(DataTable)) == 1
+    html = samples.render()
+    uid, slots = _store(html)
+    assert f'data-switcher="{uid}"' in html
+    assert f'kind: "echarts", target: "{chart.uid}"' in slots
+    assert f'target: "{table.uid}"' in slots
+    rows = re.search(r'kind: "table", target: "\w+", data: (\{.*\})\}', slots)
+    assert json.loads(rows.group(1)) == {
+        'a': [['1', '0'], ['2', '1'], ['3', '2']],
+        'b': [['1', '1'], ['2', '2'], ['3', '3']]}
+
+
+def test_002_sample_switcher_bokeh():
+    """Overlay Bokeh plots of all samples, showing the first."""
+    rng = np.random.default_rng(1)
+    plots = {
+        name: ezc.histplot(data=rng.normal(size=100), bins=20)
+        for name in ('a', 'b')}
+    samples = SampleSwitcher(['b', 'a'])
+    with samples:
+        samples.add_chart(plots)
+    charts = samples.get(_BokehChart)
+    assert len(charts) == 1
+    fig = charts[0].plot._fig
+    assert {x.tags[0]: x.visible for x in fig.renderers} == {'a': False, 'b': True}
+    _, slots = _store(samples.render())
+    assert f'kind: "bokeh", target: "{fig.name}"' in slots
+
+
+def test_003_components_switcher(tmp_path):
+    """Multi-sample components draw a single set of charts with a switcher."""
+    data = str(files('ezcharts').joinpath("data/test"))
+    report = BasicReport("Test")
+    with report.main_content:
+        seq = fastcat.SeqSummary(
+            seq_summary=(
+                f"{data}/fastcat/f1.tsv.gz", f"{data}/fastcat/f2.tsv.gz"),
+            sample_names=("S1", "S2"), switcher=True)
+        bed = mosdepth.load_mosdepth_regions(
+            f"{data}/test_mosdepth.bed.gz", faidx=f"{data}/ref.fa.fai")
+        depth = mosdepth.DepthSummary(
+            mosdepth_region=pd.concat([
+                bed.assign(sample_name='A'), bed.assign(sample_name='B')]),
+            switcher=True)
+    assert len(seq.get(SampleSwitcher)) == 1
+    assert len(seq.get(_ReportChart)) == 3
+    assert len(depth.get(_ReportChart)) == 1
+    path = tmp_path / "report.html"
+    report.write(path)
+    html = path.read_text()
+    assert html.count('ezchartsSwitcher.register(') == 2
+    # the script is included once
+    assert html.count('const ezchartsSwitcher') == 1
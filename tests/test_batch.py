@@ -0,0 +1,82 @@
+"""Test building reports in batches."""
+
+import json
+import os
+
+from dominate.tags import p
+import pandas as pd
+import pytest
+
+from ezcharts.batch import build_reports, read_manifest
+from ezcharts.components.reports.labs import BasicReport
+
+
+def report_template(text, fail="no"):
+    """Build a small report."""
+    if fail == "yes":
+        raise RuntimeError("template failed")
+    if fail == "exit":
+        # kill the worker process, as e.g. the OOM killer would
+        os._exit(1)
+    report = BasicReport("Test")
+    with report.add_section("Text", "Text"):
+        p(text)
+    return report
+
+
+@pytest.mark.parametrize("threads", [1, 2])
+def test_001_build_reports(tmp_path, threads):
+    """Reports are built, with failures recorded but not raised."""
+    entries = [
+        (report_template, dict(text=f"text_{i}", fail="yes" if i == 1 else "no"),
+         tmp_path / f"{i}.html")
+        for i in range(4)]
+    # templates need not be picklable
+    entries.append((lambda: report_template("lambda"), dict(), tmp_path / "4.html"))
+    summary = tmp_path / "summary.tsv"
+    results = build_reports(entries, threads=threads, summary=summary)
+    assert [x["status"] for x in results] == ["ok", "failed", "ok", "ok", "ok"]
+    assert results[1]["error"] == "RuntimeError: template failed"
+    assert not (tmp_path / "1.html").exists()
+    for i, text in [(0, "text_0"), (3, "text_3"), (4, "lambda")]:
+        assert text in (tmp_path / f"{i}.html").read_text()
+    table = pd.read_csv(summary, sep="\t")
+    assert list(table.columns) == ["output", "template", "status", "seconds", "error"]
+    assert table.template[0] == "tests.test_batch:report_template"
+    assert table.status.tolist() == [x["status"] for x in results]
+
+
+def test_001b_worker_died(tmp_path):
+    """Only the report whose worker died fails, the others are still built."""
+    entries = [
+        (report_template, dict(text=f"text_{i}", fail="exit" if i == 2 else "no"),
+         tmp_path / f"{i}.html")
+        for i in range(8)]
+    results = build_reports(entries, threads=3)
+    assert [x["status"] for x in results] == ["ok"] * 2 + ["failed"] + ["ok"] * 5
+    assert results[2]["error"].startswith("BrokenProcessPool")
+    for i in (0, 1, 3, 4, 5, 6, 7):
+        assert f"text_{i}" in (tmp_path / f"{i}.html").read_text()
+
+
+def test_002_manifest(tmp_path):
+    """Manifests are read from TSV and JSON files."""
+    template = "tests.test_batch:report_template"
+    tsv = tmp_path / "manifest.tsv"
+    tsv.write_text(
+        "template\toutput\ttext\tfail\n"
+        f"{template}\t{tmp_path / 'a.html'}\ta\t\n"
+        f"{template}\t{tmp_path / 'b.html'}\tb\tyes\n"
+        f"missing.module:function\t{tmp_path / 'c.html'}\tc\t\n")
+    entries = read_manifest(tsv)
+    assert entries[0].inputs == dict(text="a")
+    results = build_reports(entries, threads=2)
+    assert [x["status"] for x in results] == ["ok", "failed", "failed"]
+    assert "ModuleNotFoundError" in results[2]["error"]
+
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(json.dumps([dict(
+        template=template, inputs=dict(text="d"), output=str(tmp_path / "d.html"))]))
+    result, = build_reports(read_manifest(manifest))
+    assert result["status"] == "ok"
+    assert "d" in (tmp_path / "d.html").read_text()
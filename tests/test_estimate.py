@@ -0,0 +1,109 @@
+"""Test grouped estimates against seaborn's per-group aggregation."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from seaborn._statistics import EstimateAggregator
+
+import ezcharts as ezc
+from ezcharts.plots._estimate import grouped_estimate
+
+
+def _data(n_groups=20, seed=0):
+    rng = np.random.default_rng(seed)
+    codes = rng.integers(0, n_groups, 2000)
+    values = rng.normal(codes, 1).round(1)  # round to give ties
+    values[::97] = np.nan
+    # an empty group and a group with a single value
+    codes[codes == 3] = 4
+    codes[np.flatnonzero(codes == 5)[1:]] = 6
+    return values, codes, n_groups
+
+
+def _seaborn(values, codes, n_groups, estimator, errorbar):
+    agg = EstimateAggregator(estimator, errorbar, n_boot=1000, seed=0)
+    out = np.full((3, n_groups), np.nan)
+    for code in range(n_groups):
+        group = pd.DataFrame({"y": values[codes == code]})
+        if len(group):
+            res = agg(group, "y")
+            out[:, code] = res["y"], res["ymin"], res["ymax"]
+    return out
+
+
+@pytest.mark.parametrize("estimator", [
+    "mean", "median", "sum", "min", "max", "std", "var", np.mean])
+@pytest.mark.parametrize("errorbar", [None, "sd", "se", ("pi", 50), "pi"])
+def test_001_grouped_estimate(estimator, errorbar):
+    """Estimates and deterministic intervals match seaborn."""
+    values, codes, n_groups = _data()
+    result = grouped_estimate(
+        values, codes, n_groups, estimator=estimator, errorbar=errorbar)
+    expected = _seaborn(values, codes, n_groups, estimator, errorbar)
+    if estimator in ("sum", np.mean) or errorbar is not None:
+        # seaborn gives sums of empty groups as zero
+        expected[:, 3] = result[:, 3]
+    np.testing.assert_allclose(result, expected, rtol=1e-10, atol=1e-12)
+
+
+@pytest.mark.parametrize("estimator", ["mean", "median", "sum"])
+def test_002_grouped_estimate_bootstrap(estimator):
+    """Bootstrap intervals are close to seaborn's."""
+    values, codes, n_groups = _data()
+    # seaborn resamples NaNs, which are summed as zero
+    values[np.isnan(values)] = 0
+    result = grouped_estimate(
+        values, codes, n_groups, estimator=estimator, seed=0)
+    expected = _seaborn(values, codes, n_groups, estimator, ("ci", 95))
+    result, expected = np.delete(result, 3, 1), np.delete(expected, 3, 1)
+    # intervals are drawn from different samples, so compare with their widths
+    width = np.nan_to_num(expected[2] - expected[1])
+    np.testing.assert_allclose(result[0], expected[0], rtol=1e-10)
+    assert np.all(np.nan_to_num(abs(result[1:] - expected[1:])) <= 0.3 * width)
+    np.testing.assert_array_equal(np.isnan(result), np.isnan(expected))
+
+
+def test_003_grouped_estimate_normal_approximation():
+    """Large bootstraps of means give the normal approximation."""
+    values, codes, n_groups = _data()
+    boot = grouped_estimate(values, codes, n_groups, seed=0, max_draws=None)
+    normal = grouped_estimate(values, codes, n_groups, max_draws=0)
+    np.testing.assert_array_equal(boot[0], normal[0])
+    width = np.nanmax(boot[2] - boot[1])
+    np.testing.assert_allclose(normal[1:], boot[1:], atol=0.1 * width)
+
+
+def test_004_barplot_estimates():
+    """Bar heights and error bars are computed for each bar and hue."""
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame({
+        "x": np.repeat(list("abcd"), 50), "hue": np.tile(["p", "q"], 100),
+        "y": rng.normal(size=200)})
+    plt = ezc.barplot(data=data, x="x", y="y", hue="hue", errorbar="sd")
+    expected = data.groupby(["hue", "x"]).y.mean()
+    source = plt._fig.renderers[0].data_source.data
+    for hue in ["p", "q"]:
+        np.testing.assert_allclose(source[hue], expected[hue], rtol=1e-10)
+
+
+def test_005_lineplot_aggregates_repeats():
+    """Repeated x values are aggregated on request, unique x values drawn as given."""
+    data = pd.DataFrame({"x": [2, 1, 2, 1, 3], "y": [1., 2, 3, 4, 5]})
+    # raw data is drawn unless an estimator is given
+    plt = ezc.lineplot(data=data, x="x", y="y")
+    glyphs = [type(r.glyph).__name__ for r in plt._fig.renderers]
+    assert glyphs == ["Line", "Scatter"]
+    assert len(plt._fig.renderers[0].data_source.data["x"]) == 5
+
+    plt = ezc.lineplot(data=data, x="x", y="y", estimator="mean")
+    glyphs = [type(r.glyph).__name__ for r in plt._fig.renderers]
+    assert glyphs == ["VArea", "Line", "Scatter"]
+    line = plt._fig.renderers[1].data_source.data
+    assert list(line["x"]) == [1, 2, 3]
+    assert list(line["y"]) == [3, 2, 5]
+
+    unique = data.drop_duplicates("x")
+    plt = ezc.lineplot(data=unique, x="x", y="y", sort=False)
+    glyphs = [type(r.glyph).__name__ for r in plt._fig.renderers]
+    assert glyphs == ["Line", "Scatter"]
+    assert list(plt._fig.renderers[0].data_source.data["x"]) == [2, 1, 3]
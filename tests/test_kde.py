@@ -0,0 +1,77 @@
+"""Test the FFT kernel density estimate against seaborn and scipy."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from seaborn._statistics import KDE
+
+import ezcharts as ezc
+from ezcharts.components.fastcat import histogram_kde
+from ezcharts.plots._kde import fft_kde
+from ezcharts.plots.util import kernel_density_estimate
+
+
+@pytest.fixture
+def rng():
+    """Random number generator."""
+    return np.random.default_rng(42)
+
+
+@pytest.mark.parametrize("kws", [
+    dict(), dict(bw_method="silverman", bw_adjust=0.5), dict(clip=(0, None)),
+    dict(cumulative=True), dict(bw_method=0.3, cut=0, gridsize=51)])
+@pytest.mark.parametrize("weighted", [False, True])
+def test_001_fft_kde(rng, kws, weighted):
+    """Estimates agree with seaborn's `KDE`."""
+    x = np.concatenate([rng.lognormal(2, 0.5, 3000), rng.normal(30, 1, 1000)])
+    weights = rng.random(len(x)) if weighted else None
+    estimator = KDE(**{"bw_method": "scott", **kws})
+    estimator.define_support(x, weights=weights)
+    expected, support = estimator(x, weights=weights)
+    density, result_support = fft_kde(x, weights, **kws)
+    np.testing.assert_allclose(result_support, support)
+    np.testing.assert_allclose(density, expected, atol=1e-3 * expected.max())
+
+
+def test_002_fft_kde_frequency_weights(rng):
+    """Counts of values give the estimate of the repeated values."""
+    values = rng.integers(0, 50, 3000)
+    unique, counts = np.unique(values, return_counts=True)
+    expected, support = KDE(bw_method="scott")(values.astype(float))
+    density, result_support = fft_kde(unique, counts, frequency_weights=True)
+    np.testing.assert_allclose(result_support, support)
+    np.testing.assert_allclose(density, expected, atol=1e-3 * expected.max())
+
+    hist = pd.DataFrame({"start": unique, "end": unique + 1, "count": counts})
+    density, result_support = histogram_kde(hist)
+    np.testing.assert_allclose(result_support, support + 0.5)
+    np.testing.assert_allclose(density, expected, atol=1e-3 * expected.max())
+
+
+def test_003_fft_kde_errors():
+    """Data without spread, and uneven grids, are rejected."""
+    with pytest.raises(ValueError):
+        fft_kde(np.ones(10))
+    with pytest.raises(ValueError):
+        fft_kde(np.arange(10), support=[0, 1, 3])
+
+
+def test_004_kernel_density_estimate(rng):
+    """The FFT method gives the scipy estimate on the same grid."""
+    x = rng.normal(10, 2, 5000)
+    grid, expected = kernel_density_estimate(x)
+    result_grid, density = kernel_density_estimate(x, method="fft")
+    np.testing.assert_array_equal(result_grid, grid)
+    np.testing.assert_allclose(density, expected, atol=1e-3 * expected.max())
+
+
+def test_005_kdeplot_fft(rng):
+    """A kdeplot can be drawn with the FFT method and weights."""
+    x = rng.normal(size=1000)
+    plt = ezc.kdeplot(x, method="fft", weights=np.ones_like(x))
+    exact = ezc.kdeplot(x)
+    result = plt._fig.renderers[0].data_source.data["y"]
+    expected = exact._fig.renderers[0].data_source.data["y"]
+    np.testing.assert_allclose(result, expected, atol=1e-3 * expected.max())
+    with pytest.raises(NotImplementedError):
+        ezc.kdeplot(x, weights=np.ones_like(x))
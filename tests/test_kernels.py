@@ -0,0 +1,87 @@
+"""Test the NumPy and loop (numba) implementations of kernels agree."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ezcharts import kernels
+
+# without numba the loops run as plain Python, so keep inputs small
+N = 2000
+
+
+@pytest.fixture
+def rng():
+    """Random number generator."""
+    return np.random.default_rng(42)
+
+
+@pytest.mark.parametrize("edges", [
+    np.linspace(0, 100, 21),
+    np.array([0, 1, 5, 5, 30, 90.5, 100]),
+    np.arange(-3, 4)])
+@pytest.mark.parametrize("weights", [None, "int", "float"])
+def test_001_histogram(rng, edges, weights):
+    """Histograms agree with each other and with `np.histogram`."""
+    values = np.concatenate([
+        rng.uniform(-10, 110, N), edges, [np.nan, np.inf, -np.inf]])
+    if weights == "int":
+        weights = rng.integers(0, 100, len(values))
+    elif weights == "float":
+        weights = rng.random(len(values))
+    expected = kernels._histogram_numpy(values, edges, weights)
+    result = kernels._histogram_loop(values, edges, weights)
+    assert result.dtype == expected.dtype
+    np.testing.assert_array_equal(result, expected)
+
+    finite = np.isfinite(values)
+    reference, _ = np.histogram(
+        values[finite], bins=edges,
+        weights=None if weights is None else weights[finite])
+    np.testing.assert_allclose(result, reference, rtol=1e-12)
+
+
+@pytest.mark.parametrize("intervals", [
+    [], [(0, 10)], [(0, 10), (10, 20)], [(5, 7), (30, 40), (95, 100)],
+    [(0, 50), (40, 60)], [(13, 14)]])
+def test_002_fill_windows(intervals, winsize=10, length=100):
+    """Gaps are filled with windows, leaving the intervals in place."""
+    starts = np.array([s for s, _ in intervals], dtype=int)
+    ends = np.array([e for _, e in intervals], dtype=int)
+    result = kernels._fill_windows_loop(starts, ends, length, winsize)
+    expected = kernels._fill_windows_numpy(starts, ends, length, winsize)
+    for x, y in zip(result, expected):
+        np.testing.assert_array_equal(x, y)
+
+    out_starts, out_ends, source = result
+    np.testing.assert_array_equal(source[source >= 0], np.arange(len(starts)))
+    np.testing.assert_array_equal(out_starts[source >= 0], starts)
+    added = source < 0
+    assert np.all(out_ends[added] - out_starts[added] <= winsize)
+    assert np.all(out_ends[added] > out_starts[added])
+    # unless intervals overlap, the whole sequence is covered in order
+    if not intervals or np.all(starts[1:] >= ends[:-1]):
+        assert out_starts[0] == 0 and out_ends[-1] == length
+        np.testing.assert_array_equal(out_starts[1:], out_ends[:-1])
+
+
+def test_003_fill_windows_example():
+    """Windows are aligned to the start of each gap."""
+    out_starts, out_ends, source = kernels.fill_windows([25], [30], 52, 10)
+    assert out_starts.tolist() == [0, 10, 20, 25, 30, 40, 50]
+    assert out_ends.tolist() == [10, 20, 25, 30, 40, 50, 52]
+    assert source.tolist() == [-1, -1, -1, 0, -1, -1, -1]
+
+
+@pytest.mark.parametrize("n_groups", [1, 7, 50])
+def test_004_grouped_median(rng, n_groups):
+    """Medians agree with each other and with pandas."""
+    groups = rng.integers(0, n_groups, N)
+    values = rng.normal(size=N).round(1)  # round to give ties
+    expected = kernels._grouped_median_numpy(groups, values, n_groups + 2)
+    result = kernels._grouped_median_loop(groups, values, n_groups + 2)
+    np.testing.assert_array_equal(result, expected)
+
+    reference = pd.Series(values).groupby(groups).median().reindex(
+        range(n_groups + 2))
+    np.testing.assert_array_equal(result, reference.to_numpy())
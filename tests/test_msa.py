@@ -0,0 +1,47 @@
+"""Test multiple sequence alignment images."""
+
+from importlib.resources import files
+import os
+import shutil
+
+from ezcharts.plots import msa
+
+
+MSA_FILE = str(files("ezcharts").joinpath("data/test/msa/HIGD2A.fa"))
+
+
+def test_001_msa_in_memory(tmp_path, monkeypatch):
+    """Images are rendered without writing to the working directory."""
+    monkeypatch.chdir(tmp_path)
+    html = str(msa.msa(MSA_FILE, start=30, end=80))
+    assert html.startswith('<img class="img-fluid" src="data:image/png;base64,')
+    assert os.listdir(tmp_path) == []
+
+
+def test_002_msa_cache(tmp_path):
+    """Images are cached by file contents and options."""
+    copy = tmp_path / "copy.fa"
+    shutil.copy(MSA_FILE, copy)
+    first = str(msa.msa(MSA_FILE, identity=60, end=40))
+    assert len(msa._msa_cache) > 0
+    # same contents under a different name use the cached image
+    key = msa._cache_key(str(copy), msa._render_options(identity=60, end=40))
+    assert key in msa._msa_cache
+    assert str(msa.msa(str(copy), identity=60, end=40)) == first
+    assert str(msa.msa(MSA_FILE, identity=60, end=41)) != first
+
+
+def test_003_msa_many(tmp_path):
+    """Several alignments are rendered in a process pool, in order."""
+    other = tmp_path / "other.fa"
+    with open(MSA_FILE) as fh:
+        records = fh.read().split(">")[1:4]
+    other.write_text("".join(">" + r for r in records))
+    msa._msa_cache.clear()
+    results = msa.msa_many(
+        [MSA_FILE, str(tmp_path / "missing.fa"), str(other)],
+        threads=2, end=30)
+    assert str(results[0]) == str(msa.msa(MSA_FILE, end=30))
+    assert "MSA file not found" in str(results[1])
+    assert str(results[2]) != str(results[0])
+    assert str(results[2]).startswith('<img')
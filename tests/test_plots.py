@@ -0,0 +1,151 @@
+"""Test the eCharts plotting interface."""
+
+import copy
+
+import numpy as np
+import pandas as pd
+
+import ezcharts as ezc
+from ezcharts.components.fastcat import read_length_plot
+from ezcharts.plots import Plot, util
+from ezcharts.plots.ideogram import (
+    _partition_blocks, load_chr_sizes, load_ucsc_bands)
+from ezcharts.plots.sunburst import sunburst
+from ezcharts.plots.util import empty_plot, link_axes
+
+
+def _value_plot(source):
+    plt = Plot()
+    plt.xAxis = dict(type='value', name='x')
+    plt.yAxis = dict(type='value', name='y')
+    plt.add_dataset(dict(source=source))
+    plt.series = [dict(type='scatter')]
+    return plt
+
+
+def test_001_fix_axis_labels():
+    """Axis name gaps are sized from the data extents."""
+    plt = _value_plot([[0.5, 1], [2.5, 123]])
+    plt.to_json()
+    # integer y labels are at most 3 characters wide
+    assert float(plt.yAxis.nameGap) == 20 + 3 * 6
+    assert float(plt.grid.left) == 20 + 3 * 6 + 10
+
+
+def test_002_fix_axis_labels_repeated():
+    """Axis extents are reused when serialising a plot repeatedly."""
+    plt = _value_plot([[0.5, 1], [2.5, 123]])
+    first = plt.to_json()
+    cached = plt._axis_extents[1]
+    assert plt.to_json() == first
+    assert plt._axis_extents[1] is cached
+    # adding data invalidates the extents
+    plt.add_dataset(dict(source=[[1, 12345678]]))
+    assert plt.to_json() != first
+    assert plt._axis_extents[1] is not cached
+
+
+def test_003_link_axes():
+    """Plots share the y-axis maximum from their recorded extents."""
+    small = ezc.histplot(data=pd.Series([1, 2, 2, 3]), bins=3)
+    large = ezc.histplot(data=pd.Series([1] * 10 + [2]), bins=2)
+    assert small.y_extent.max == 2
+    assert large.x_extent.min == 1 and large.x_extent.max == 2
+    empty = empty_plot()
+    limits = link_axes([small, large, empty])
+    assert limits.max == 10
+    assert small._fig.y_range.end == large._fig.y_range.end == 10
+    assert empty.yAxis is None
+
+
+def test_004_plot_extents():
+    """Plots report the extents of their eCharts datasets."""
+    plt = _value_plot([[0.5, 1], [2.5, 123]])
+    assert (plt.x_extent.min, plt.x_extent.max) == (0.5, 2.5)
+    assert (plt.y_extent.min, plt.y_extent.max) == (1, 123)
+
+
+def test_005_plot_copy():
+    """Copied plots share no state with the original."""
+    plt = _value_plot([[0.5, 1], [2.5, 123]])
+    first = plt.to_json()
+    new = copy.deepcopy(plt)
+    assert new._axis_grid is new.grid and new.grid is not plt.grid
+    assert new.to_json() == first
+    new.add_dataset(dict(source=[[1, 12345678]]))
+    assert plt.to_json() == first
+
+
+def test_006_plot_cache():
+    """Memoised plotting functions return fresh copies of cached plots."""
+    data = pd.DataFrame({
+        'read_length': np.arange(1, 200001) % 997,
+        'mean_quality': np.ones(200000)})
+    tree = [{'name': 'a', 'value': 2, 'children': [{'name': 'b', 'value': 2}]}]
+    cache = util.enable_plot_cache()
+    try:
+        plot = read_length_plot(data)
+        again = read_length_plot(data.copy())
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert again._fig is not plot._fig and again._fig.id != plot._fig.id
+        source, = [r.data_source for r in plot._fig.renderers]
+        copied, = [r.data_source for r in again._fig.renderers]
+        assert copied is not source
+        np.testing.assert_array_equal(copied.data['top'], source.data['top'])
+        assert again.x_extent.max == plot.x_extent.max
+
+        # a different value in the sampled rows misses the cache
+        data.loc[0, 'read_length'] = 5000
+        read_length_plot(data)
+        assert (cache.hits, cache.misses) == (1, 2)
+
+        first = sunburst(tree).to_json()
+        tweaked = sunburst(tree)
+        tweaked.title = dict(text='changed')
+        assert sunburst(tree).to_json() == first
+        assert cache.hits == 3
+    finally:
+        util.disable_plot_cache()
+    assert read_length_plot(data) is not None
+
+
+def test_007_plot_cache_eviction():
+    """The least recently used plots are evicted to fit the size limit."""
+    plots = [_value_plot([[i, i]] * 10) for i in range(3)]
+    size = util.plot_size(plots[0])
+    cache = util.PlotCache(max_bytes=2 * size)
+    for i, plt in enumerate(plots[:2]):
+        cache.put(i, plt)
+    assert cache.get(0) is not None
+    cache.put(2, plots[2])
+    assert len(cache) == 2 and cache.nbytes == 2 * size
+    assert cache.get(1) is None
+    assert cache.get(0).to_json() == copy.deepcopy(plots[0]).to_json()
+
+
+def test_008_ideogram_reference_copies():
+    """The cached reference tables are returned as independent copies."""
+    for load in (load_ucsc_bands, load_chr_sizes):
+        first = load()
+        expected = first.copy()
+        first.iloc[:, 1] = -1
+        first.drop(first.index[:5], inplace=True)
+        first["extra"] = 0
+        pd.testing.assert_frame_equal(load(), expected)
+
+
+def test_009_ideogram_partition_blocks():
+    """Blocks are partitioned as by filtering per chromosome and colour."""
+    rng = np.random.default_rng(0)
+    bands = load_ucsc_bands()
+    # interleave chromosomes and colours
+    blocks = bands.iloc[rng.permutation(len(bands))]
+    partition = _partition_blocks(blocks)
+    for chrom in blocks["chr"].unique():
+        expected = dict()
+        for _, row in blocks.loc[blocks["chr"] == chrom].iterrows():
+            expected.setdefault(row["color"], list()).append([
+                row["chr"], row["start"], row["end"], row["end"] - row["start"]])
+        assert partition[chrom] == expected
+        assert list(partition[chrom]) == list(expected)
+    assert list(partition) == list(blocks["chr"].unique())
@@ -0,0 +1,327 @@
+"""Test writing reports."""
+
+import base64
+import hashlib
+from importlib.resources import files
+import io
+import json
+import re
+import zlib
+
+import dominate
+from dominate.tags import div, p
+import numpy as np
+import pandas as pd
+
+import ezcharts as ezc
+from ezcharts.components.ezchart import EZChart
+from ezcharts.components.nextclade import NextClade, NXTComponent
+from ezcharts.components.reports import TABLE_PREVIEW_ROWS
+from ezcharts.components.reports.labs import BasicReport
+from ezcharts.layout.islands import narrow_dtype
+from ezcharts.layout.snippets import DataTable, Tabs
+from ezcharts.layout.util import (
+    context_ancestors, context_elements, render_element)
+from ezcharts.plots import Plot
+from ezcharts.plots.metagenomics_sankey import sankey_css, sankey_D3_js
+from ezcharts.plots.seqviz import seqviz_js
+from ezcharts.plots.util import DECIMATE_MIN_ROWS, overlay_plots
+
+
+def _build(
+        tmp_path, name, text="text_first", deterministic_ids=True, cache_dir=None,
+        bokeh=False):
+    report = BasicReport("Test", deterministic_ids=deterministic_ids)
+    with report.add_section("Plots", "Plots", cache_key="plots-v1"):
+        tabs = Tabs()
+        with tabs.add_tab("ECharts"):
+            EZChart(ezc.sunburst([dict(name="a", value=1)]))
+        if bokeh:
+            with tabs.add_tab("Bokeh"):
+                EZChart(ezc.histplot(data=[1, 2, 2]))
+        with tabs.add_tab("Text"):
+            p(text)
+    with report.add_section("Status", "Status"):
+        tabs = Tabs()
+        with tabs.add_tab("Status"):
+            p(text)
+    path = tmp_path / name
+    report.write(path, cache_dir=cache_dir)
+    return path.read_text()
+
+
+def test_001_deterministic_ids(tmp_path):
+    """Building a report twice gives identical HTML."""
+    first = _build(tmp_path, "a.html")
+    assert first == _build(tmp_path, "b.html")
+    assert 'id="Section_0"' in first
+    # IDs within a section are numbered within it
+    assert 'id="Tabs_Section_2_0"' in first
+    # random IDs by default
+    assert (
+        _build(tmp_path, "c.html", deterministic_ids=False)
+        != _build(tmp_path, "d.html", deterministic_ids=False))
+
+
+def test_001b_ids_per_report(tmp_path):
+    """Creating another report while building one does not change its IDs."""
+    def build(name, interrupt):
+        report = BasicReport("Test", deterministic_ids=True)
+        with report.add_section("First", "First"):
+            Tabs().add_tab("First")
+        if interrupt:
+            other = BasicReport("Other", deterministic_ids=True)
+            with other.add_section("Other", "Other"):
+                Tabs().add_tab("Other")
+            BasicReport("Other")
+        with report.add_section("Second", "Second"):
+            Tabs().add_tab("Second")
+        path = tmp_path / name
+        report.write(path)
+        return path.read_text()
+
+    assert build("a.html", False) == build("b.html", True)
+
+
+def test_002_cached_sections(tmp_path):
+    """Sections with a cache key are rendered once and reused."""
+    cache = tmp_path / "cache"
+    first = _build(tmp_path, "a.html", cache_dir=cache)
+    assert len(list(cache.iterdir())) == 1
+    assert first.count("text_first") == 2
+    # the cached section is reused, other sections are rendered again
+    second = _build(tmp_path, "b.html", text="text_second", cache_dir=cache)
+    assert second.count("text_first") == 1
+    assert second.count("text_second") == 1
+    assert second.replace("text_second", "text_first") == first
+
+
+def test_003_cached_bokeh(tmp_path):
+    """Bokeh scripts for plots in a cached section are cached with it."""
+    cache = tmp_path / "cache"
+    _build(tmp_path, "a.html", cache_dir=cache, bokeh=True)
+    cached, = cache.iterdir()
+    assert "root.Bokeh.embed.embed_items" in cached.read_text()
+    html = _build(tmp_path, "b.html", cache_dir=cache, bokeh=True)
+    assert html.count("root.Bokeh.embed.embed_items") == 1
+
+
+def test_004_parallel_sections(tmp_path):
+    """Rendering sections in parallel gives the same HTML."""
+    def build(name, threads):
+        report = BasicReport("Test", deterministic_ids=True)
+        for i in range(4):
+            with report.add_section(f"Table {i}", f"Table {i}"):
+                DataTable.from_pandas(pd.DataFrame({"a": range(i * 10), "b": "x"}))
+        path = tmp_path / name
+        report.write(path, threads=threads)
+        return path.read_text()
+
+    assert build("a.html", 1) == build("b.html", 3)
+
+
+def test_005_size_budget(tmp_path):
+    """Reports over budget have their largest charts and tables reduced."""
+    def build(name, **kwargs):
+        rng = np.random.default_rng(0)
+        report = BasicReport("Test", deterministic_ids=True)
+        with report.add_section("Data", "Data"):
+            EZChart(ezc.histplot(data=rng.normal(size=1000), bins=1000))
+            EZChart(ezc.lineplot(
+                data=pd.DataFrame({"x": range(2000), "y": rng.normal(size=2000)}),
+                x="x", y="y"))
+            DataTable.from_pandas(pd.DataFrame({"a": range(1000), "b": "x"}))
+        path = tmp_path / name
+        report.write(path, **kwargs)
+        return report, path.stat().st_size
+
+    report, full = build("a.html", sizes=True)
+    assert {x["kind"] for x in report.sizes} == {"chart", "table", "resource"}
+    assert [x["bytes"] for x in report.sizes] == sorted(
+        (x["bytes"] for x in report.sizes), reverse=True)
+    sizes = {x["name"]: x["bytes"] for x in report.sizes}
+    largest = next(x["name"] for x in report.sizes if x["kind"] != "resource")
+
+    # a budget a little below the full size only reduces the largest component
+    report, size = build("b.html", max_bytes=full - 20000)
+    reduced = {x["name"]: x["bytes"] for x in report.sizes}
+    assert size < full - 20000
+    assert reduced.pop(largest) < sizes.pop(largest)
+    assert reduced == sizes
+
+    # an impossible budget reduces everything as far as possible
+    report, size = build("c.html", max_bytes=0)
+    table, = report.get_sections()[0].get(DataTable)
+    assert table.n_rows == TABLE_PREVIEW_ROWS
+    html = (tmp_path / "c.html").read_text()
+    assert "Export CSV" in html
+    # all rows are kept, compressed, for export
+    payload = re.search(
+        rf'id="{table.uid}_data" type="application/octet-stream">([^<]*)<', html)
+    rows = pd.read_csv(io.StringIO(
+        zlib.decompress(base64.b64decode(payload.group(1))).decode()))
+    assert list(rows.columns) == ["index", "a", "b"]
+    assert rows.a.tolist() == list(range(1000))
+    bokeh = report.get_bokeh_charts()
+    assert all(
+        len(x.plot._fig.renderers[0].data_source.data["x" if i else "left"])
+        < DECIMATE_MIN_ROWS for i, x in enumerate(bokeh))
+
+
+def test_006_pack_data(tmp_path):
+    """Numeric dataset columns are embedded as compressed typed arrays."""
+    rng = np.random.default_rng(0)
+    depths = rng.normal(size=500)
+    plt = Plot()
+    plt.xAxis = dict(type="value")
+    plt.yAxis = dict(type="value")
+    plt.add_dataset(dict(source=[["pos", "depth", "name"]] + [
+        [i * 10, depth, f"n{i % 3}"] for i, depth in enumerate(depths)]))
+    plt.add_series(dict(type="scatter", datasetIndex=0))
+    report = BasicReport("Test", deterministic_ids=True)
+    with report.add_section("Data", "Data"):
+        EZChart(plt)
+        EZChart(ezc.lineplot(
+            data=pd.DataFrame({"x": range(500), "y": depths}), x="x", y="y"))
+    path = tmp_path / "report.html"
+    report.write(path, pack_data=True)
+    html = path.read_text()
+    assert "const ezchartsIslands" in html
+    islands = dict()
+    for dtype, island_id, text in re.findall(
+            r'<script data-dtype="(\w+)" id="(\w+)" '
+            r'type="application/octet-stream">([^<]*)</script>', html):
+        islands[island_id] = np.frombuffer(
+            zlib.decompress(base64.b64decode(text)), dtype=f"<{dtype}")
+    positions, values = islands.values()
+    assert positions.dtype == np.int32 and values.dtype == np.float32
+    np.testing.assert_array_equal(positions, np.arange(500) * 10)
+    np.testing.assert_allclose(values, depths, rtol=1e-6)
+    # strings are kept inline with the specification of the packed columns
+    assert '["pos", "depth", "name"]' in html
+    assert '"n2", "n0"' in html
+    # the plot itself is unchanged
+    assert plt.dataset[0].source[1] == [0, depths[0], "n0"]
+
+    bokeh, = report.get_bokeh_charts()
+    data = bokeh.plot._fig.renderers[0].data_source.data
+    assert data["x"].dtype == np.int32 and data["y"].dtype == np.float32
+
+
+def test_006b_pack_data_overlaid(tmp_path):
+    """Ragged multi-line columns and large integers are left unchanged."""
+    rng = np.random.default_rng(0)
+    lines = [
+        ezc.lineplot(data=pd.DataFrame({
+            "x": np.arange(n) + 2**40, "y": rng.normal(size=n)}), x="x", y="y")
+        for n in (300, 200)]
+    report = BasicReport("Test", deterministic_ids=True)
+    with report.add_section("Data", "Data"):
+        EZChart(overlay_plots(lines, ["a", "b"]))
+    path = tmp_path / "report.html"
+    report.write(path, pack_data=True)
+    bokeh, = report.get_bokeh_charts()
+    data = bokeh.plot._fig.renderers[0].data_source.data
+    assert [len(x) for x in data["xs"]] == [300, 200]
+    assert data["xs"][0][-1] == 2**40 + 299
+    assert narrow_dtype(np.array([0, 2**40])) is None
+    assert narrow_dtype(np.array([0.5, 2.0**40])) == "f4"
+
+
+def test_007_registered_resources(tmp_path):
+    """Resources required by several components are included once."""
+    data = str(files('ezcharts').joinpath("data/test"))
+    with open(f"{data}/sankey.json") as fh:
+        sankey = json.load(fh)
+    seqviz = (
+        f"{data}/seqviz/plannotate.json",
+        f"{data}/seqviz/barcode01_q10.final.fasta", "sample_1")
+    # a component built before it is added to a report
+    nxt = NextClade(f"{data}/nextclade.json")
+    report = BasicReport("Test")
+    with report.add_section("Data", "Data"):
+        tabs = Tabs()
+        for i in range(2):
+            with tabs.add_tab(f"Sample {i}"):
+                ezc.metagenomics_sankey(sankey)
+                ezc.seqviz(*seqviz)
+        report.main_content.children[-1].add(nxt)
+    path = tmp_path / "report.html"
+    report.write(path, sizes=True)
+    html = path.read_text()
+    head = html[:html.index("</head>")]
+    for resource in (sankey_D3_js, sankey_css, seqviz_js, NXTComponent):
+        content = render_element(resource()).strip()
+        assert html.count(content[-200:]) == 1
+        assert content[-200:] in head
+    names = [x["name"] for x in report.sizes if x["kind"] == "resource"]
+    assert "vendor/seqviz.min.js" in names
+
+
+def test_007b_resources_outside_report():
+    """Required resources are rendered in place outside a report."""
+    data = str(files('ezcharts').joinpath("data/test"))
+    with open(f"{data}/sankey.json") as fh:
+        sankey = json.load(fh)
+    doc = dominate.document()
+    with doc:
+        ezc.metagenomics_sankey(sankey)
+    html = doc.render()
+    for resource in (sankey_D3_js, sankey_css):
+        content = render_element(resource()).strip()
+        assert html.count(content[-200:]) == 1
+
+
+def test_007c_context_ancestors():
+    """Elements being built are found within nested contexts, innermost first."""
+    with div() as outer:
+        assert context_elements() == [outer]
+        with div() as inner:
+            # not yet added to `outer`
+            assert inner.parent is None
+            child = p()
+            assert list(context_ancestors(child)) == [child, inner, outer]
+    assert context_elements() == []
+    assert list(context_ancestors(child)) == [child, inner, outer]
+
+
+def test_008_shared_assets(tmp_path):
+    """Scripts and stylesheets are written once to a shared assets directory."""
+    inlined = _build(tmp_path, "inlined.html", bokeh=True)
+    assets = tmp_path / "assets"
+    paths = list()
+    for name in ("a.html", "b.html"):
+        report = BasicReport("Test", deterministic_ids=True)
+        with report.add_section("Chart", "Chart"):
+            EZChart(Plot(xAxis=dict(type="value"), yAxis=dict(type="value")))
+        paths.append(tmp_path / name)
+        report.write(paths[-1], assets_dir=assets)
+    html = paths[0].read_text()
+    assert paths[1].read_text() == html
+    assert len(html) < len(inlined) / 4
+    files_ = sorted(x.name for x in assets.iterdir())
+    assert any(re.match(r"echarts\.min\.[0-9a-f]{16}\.js$", x) for x in files_)
+    assert any(x.endswith(".css") for x in files_)
+    refs = re.findall(r'<(?:script src|link[^>]*href)="assets/([^"]+)"', html)
+    assert sorted(refs) == files_
+    # local assets cannot be checked by browsers opening the report from disk
+    assert 'integrity=' not in html and 'crossorigin=' not in html
+
+    # refer to assets deployed elsewhere, without writing them
+    path = tmp_path / "c.html"
+    report = BasicReport("Test", deterministic_ids=True)
+    report.write(path, assets_url="https://example.com/assets/")
+    html = path.read_text()
+    assert 'src="https://example.com/assets/echarts.min.' in html
+    refs = [
+        (re.search(r'(?:src|href)="https://example.com/assets/([^"]+)"', tag)
+            .group(1),
+         re.search(r'integrity="(sha384-[^"]+)"', tag).group(1))
+        for tag in re.findall(r'<(?:script|link)[^>]*integrity[^>]*>', html)]
+    assert sorted(x for x, _ in refs) == files_
+    for fname, integrity in refs:
+        digest = hashlib.sha384((assets / fname).read_bytes()).digest()
+        assert integrity == "sha384-" + base64.b64encode(digest).decode()
+    assert html.count('crossorigin="anonymous"') == len(refs)
+    assert len(list(tmp_path.glob("*/*.js"))) == len(
+        [x for x in files_ if x.endswith(".js")])
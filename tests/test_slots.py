@@ -0,0 +1,102 @@
+"""Test the slotted option base class."""
+
+import json
+
+import numpy as np
+import pytest
+
+from ezcharts.plots._slots import SlotsModel
+from ezcharts.plots.util import JSCode
+
+
+class AxisLabel(SlotsModel):
+    """Axis label options."""
+
+    _fields = ('show', 'rotate', 'formatter')
+    __slots__ = _fields
+    _types = {'show': ('boolean',), 'rotate': ('number',)}
+
+
+class Axis(SlotsModel):
+    """Axis options."""
+
+    _fields = ('name', 'axisLabel', 'data')
+    __slots__ = _fields
+    _children = {'axisLabel': AxisLabel}
+
+
+class Line(SlotsModel):
+    """Line series."""
+
+    _fields = ('type', 'smooth')
+    __slots__ = _fields
+    _tag = 'line'
+
+
+class Bar(SlotsModel):
+    """Bar series."""
+
+    _fields = ('type', 'stack')
+    __slots__ = _fields
+    _tag = 'bar'
+
+
+class Option(SlotsModel):
+    """Top-level options."""
+
+    _fields = ('xAxis', 'series', 'from_')
+    __slots__ = _fields
+    _aliases = {'from_': 'from'}
+    _children = {'xAxis': Axis, 'series': (Line, Bar,)}
+
+
+def test_001_coerce_children():
+    """Dictionaries and lists of dictionaries become child options."""
+    opt = Option(xAxis=dict(name="x", axisLabel=dict(rotate=40)))
+    assert isinstance(opt.xAxis, Axis)
+    assert isinstance(opt.xAxis.axisLabel, AxisLabel)
+    assert opt.xAxis.data is None
+    opt.xAxis = [dict(name="a"), dict(name="b")]
+    assert [a.name for a in opt.xAxis] == ["a", "b"]
+
+
+def test_002_union_resolution():
+    """Union members are chosen by type tag, then by keys."""
+    opt = Option(series=[dict(type="bar"), dict(type="line", smooth=True)])
+    assert [type(s) for s in opt.series] == [Bar, Line]
+    opt.series = [dict(stack="a")]
+    assert isinstance(opt.series[0], Bar)
+    with pytest.raises(ValueError):
+        opt.series = [dict(foo=1)]
+
+
+def test_003_unknown_field():
+    """Setting an unknown field raises, as the pydantic models do."""
+    opt = Option()
+    with pytest.raises(ValueError):
+        opt.yAxis = dict()
+    with pytest.raises(ValueError):
+        Option(yAxis=dict())
+
+
+def test_004_json():
+    """Only set fields are serialised, using JSON names and encoders."""
+    opt = Option(
+        xAxis=dict(data=np.array([1, 2]), axisLabel=dict(formatter=JSCode("f"))),
+        **{"from": 3})
+    assert opt.from_ == 3
+    text = JSCode._clean(opt.json(exclude_unset=True))
+    assert text == (
+        '{"xAxis": {"axisLabel": {"formatter": f}, "data": [1, 2]}, "from": 3}')
+    opt.xAxis.axisLabel = None
+    assert json.loads(opt.json(exclude_none=True)) == {
+        "xAxis": {"data": [1, 2]}, "from": 3}
+
+
+def test_005_validate():
+    """The optional validation pass checks schema types."""
+    opt = Option(xAxis=dict(axisLabel=dict(show=True, rotate=np.float32(4))))
+    assert opt.validate() is opt
+    opt.xAxis.axisLabel.rotate = "forty"
+    with pytest.raises(ValueError):
+        opt.validate()
@@ -0,0 +1,87 @@
+"""Test pruning and encoding of taxonomy trees."""
+
+from importlib.resources import files
+import json
+
+import pytest
+
+from ezcharts.plots import sunburst
+from ezcharts.plots._tree import FlatTree
+from ezcharts.plots.metagenomics_sankey import encode_samples
+
+
+@pytest.fixture
+def sankey_data():
+    """Per-sample taxonomy trees from the demo."""
+    with open(files("ezcharts").joinpath("data/test/sankey.json")) as fh:
+        return json.load(fh)
+
+
+def _records():
+    return [
+        {"name": "A", "children": [
+            {"name": "A1", "value": 60},
+            {"name": "A2", "value": 5},
+            {"name": "A3", "value": 3}]},
+        {"name": "B", "children": [{"name": "B1", "value": 30}]},
+        {"name": "C", "value": 2}]
+
+
+def test_001_round_trip(sankey_data):
+    """Nested data converts to a flat tree and back unchanged."""
+    for tree in sankey_data.values():
+        assert FlatTree.from_sankey(tree).to_sankey() == tree
+    assert FlatTree.from_records(_records()).to_records() == _records()
+
+
+def test_002_prune_min_abundance():
+    """Small nodes are collapsed into an "Other" node per parent."""
+    tree = FlatTree.from_records(_records())
+    assert list(tree.totals()) == [68, 30, 2, 60, 5, 3, 30]
+    pruned = tree.prune(min_abundance=0.06).to_records()
+    assert pruned == [
+        {"name": "A", "children": [
+            {"name": "A1", "value": 60},
+            {"name": "Other (A)", "value": 8}]},
+        {"name": "B", "children": [{"name": "B1", "value": 30}]},
+        {"name": "Other", "value": 2}]
+    # cutoffs per rank, here the depth
+    pruned = tree.prune(min_abundance={1: 0.06}).to_records()
+    assert [node["name"] for node in pruned] == ["A", "B", "C"]
+
+
+def test_003_prune_top_n():
+    """Only the largest nodes of each rank are kept."""
+    pruned = FlatTree.from_records(_records()).prune(top_n={0: 1})
+    assert pruned.to_records() == [
+        {"name": "A", "children": [
+            {"name": "A1", "value": 60},
+            {"name": "A2", "value": 5},
+            {"name": "A3", "value": 3}]},
+        {"name": "Other", "value": 32}]
+
+
+def test_004_encode_samples(sankey_data):
+    """Samples share name and rank tables, counts are per node."""
+    encoded = encode_samples(sankey_data, top_n=2)
+    assert set(encoded["samples"]) == set(sankey_data)
+    for sample, tree in encoded["samples"].items():
+        assert len(tree["name"]) == len(tree["parent"]) == len(tree["count"])
+        roots = [i for i, parent in enumerate(tree["parent"]) if parent < 0]
+        assert sum(tree["count"][i] for i in roots) == sum(
+            node["count"] for node in sankey_data[sample].values())
+        # at most two named taxa, plus "Other", at each rank
+        for rank in range(len(encoded["ranks"])):
+            named = [
+                encoded["names"][name] for name, r in zip(tree["name"], tree["rank"])
+                if r == rank and not encoded["names"][name].startswith("Other")]
+            assert len(named) <= 2
+
+
+def test_005_sunburst():
+    """Sunburst sections can be pruned, with values on terminal nodes only."""
+    assert sunburst.sum_terminal_nodes(_records()) == 100
+    plt = sunburst.sunburst(_records(), top_n=1)
+    assert float(plt.visualMap[0].max) == 100
+    data = plt.series[0].data
+    assert [node["name"] for node in data] == ["A", "Other"]
@@ -0,0 +1,73 @@
+"""Test UpSet plot construction."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ezcharts.plots.upset import (
+    intersections_from_memberships, membership_bitmasks, UpSetPlot)
+
+
+MEMBERSHIPS = {
+    "caller_A": ["v1", "v2", "v3", "v5"],
+    "caller_B": ["v2", "v3", "v4", "v2"],
+    "caller_C": ["v3"],
+}
+
+
+def _as_records(df):
+    return sorted(
+        (tuple(row[:-1]), row[-1]) for row in df.itertuples(index=False))
+
+
+def test_001_bitmasks():
+    """Elements are packed into one bit per set."""
+    masks, sets = membership_bitmasks(MEMBERSHIPS)
+    assert sets == ["caller_A", "caller_B", "caller_C"]
+    # v1, v2, v3, v5, v4 in order of first appearance
+    assert masks.tolist() == [1, 3, 7, 1, 2]
+
+
+def test_001b_bitmasks_missing():
+    """Missing elements are not members of any set."""
+    masks, _ = membership_bitmasks({
+        "caller_A": ["v1", None, "v2"],
+        "caller_B": pd.Series(["v2", np.nan]),
+        "caller_C": [None]})
+    assert masks.tolist() == [1, 3]
+
+
+def test_002_intersections_dict_and_frame():
+    """Intersections are counted alike from a mapping or a table."""
+    expected = [
+        ((False, True, False), 1),
+        ((True, False, False), 2),
+        ((True, True, False), 1),
+        ((True, True, True), 1)]
+    df = intersections_from_memberships(MEMBERSHIPS)
+    assert _as_records(df) == expected
+
+    elements = ["v1", "v2", "v3", "v4", "v5", "v6"]
+    table = pd.DataFrame({
+        name: [e in members for e in elements]
+        for name, members in MEMBERSHIPS.items()})
+    # v6 is in no set, and isn't counted
+    assert _as_records(intersections_from_memberships(table)) == expected
+
+
+def test_003_too_many_sets():
+    """Sets must fit in a 64-bit mask."""
+    table = pd.DataFrame(np.ones((2, 65), dtype=bool))
+    with pytest.raises(ValueError):
+        membership_bitmasks(table)
+
+
+def test_004_from_memberships():
+    """Plots are built from memberships with the dot matrix in place."""
+    plt = UpSetPlot.from_memberships(MEMBERSHIPS)
+    assert plt.data["size"].tolist() == [2, 1, 1, 1]
+    assert plt.set_totals == {"caller_A": 4, "caller_B": 3, "caller_C": 1}
+    inactive, segments, active = (
+        r.data_source.data for r in plt.p_matrix.renderers)
+    assert len(active["x"]) + len(inactive["x"]) == 4 * 3
+    assert len(segments["x"]) == 2
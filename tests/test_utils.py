@@ -3,10 +3,16 @@
 import argparse
 import logging
 
+import numpy as np
 import pandas as pd
+import pytest
 
+import ezcharts as ezc
 from ezcharts import util
-from ezcharts.plots.util import concat_dfs_with_categorical_columns
+from ezcharts.plots import Plot
+from ezcharts.plots.util import (
+    concat_dfs_with_categorical_columns, decimate_plot, overlay_plots,
+    QuantileSketch)
 
 
 def test_create_logger():
@@ -61,3 +67,100 @@ def test_010_pandas_cat_properties():
         expected, actual,
         check_dtype=True, check_categorical=True, check_exact=True
     )
+
+
+@pytest.mark.parametrize("accuracy", [0.05, 0.01, 0.001])
+def test_020_quantile_sketch(accuracy):
+    """Sketch quantiles are within the relative error bound."""
+    rng = np.random.default_rng(0)
+    values = np.concatenate([
+        rng.lognormal(8, 1, 20000), -rng.exponential(5, 500), np.zeros(10),
+        [np.nan]])
+    sketch = QuantileSketch.from_values(values, relative_accuracy=accuracy)
+    qs = np.linspace(0, 1, 101)
+    expected = np.nanquantile(values, qs, method="lower")
+    result = sketch.quantile(qs)
+    np.testing.assert_array_less(
+        np.abs(result - expected), accuracy * np.abs(expected) + 1e-12)
+    assert sketch.quantile(0) == np.nanmin(values)
+    assert sketch.quantile(1) == np.nanmax(values)
+    assert sketch.count == len(values) - 1
+    assert sketch.mean() == pytest.approx(np.nanmean(values))
+
+
+def test_021_quantile_sketch_merge():
+    """Merging sketches of chunks gives the sketch of all the data."""
+    rng = np.random.default_rng(1)
+    values = rng.normal(0, 100, 10000)
+    weights = rng.integers(1, 5, len(values))
+    whole = QuantileSketch.from_values(values, weights)
+    chunks = [
+        QuantileSketch.from_values(v, w) for v, w in zip(
+            np.array_split(values, 5), np.array_split(weights, 5))]
+    merged = sum(chunks[1:], chunks[0])
+    qs = np.linspace(0, 1, 21)
+    np.testing.assert_array_equal(merged.quantile(qs), whole.quantile(qs))
+    assert merged.count == whole.count == weights.sum()
+    restored = QuantileSketch.from_dict(merged.to_dict())
+    np.testing.assert_array_equal(restored.quantile(qs), whole.quantile(qs))
+    with pytest.raises(ValueError):
+        merged.merge(QuantileSketch(relative_accuracy=0.1))
+    assert np.isnan(QuantileSketch().median())
+
+
+def test_022_decimate_plot():
+    """Lines are thinned, histogram bins merged and small data left alone."""
+    rng = np.random.default_rng(2)
+    hist = ezc.histplot(data=rng.normal(size=1000), bins=1001, stat="density")
+    data = dict(hist._fig.renderers[0].data_source.data)
+    assert decimate_plot(hist, factor=4)
+    merged = hist._fig.renderers[0].data_source.data
+    assert len(merged["left"]) == 251
+    assert merged["left"][0] == data["left"][0]
+    assert merged["right"][-1] == data["right"][-1]
+    np.testing.assert_allclose(
+        np.sum((merged["right"] - merged["left"]) * merged["top"]), 1)
+
+    plt = Plot()
+    plt.add_dataset(dict(source=np.arange(4000).reshape(2000, 2)))
+    plt.add_series(dict(type="line", datasetIndex=0))
+    assert decimate_plot(plt, factor=3)
+    rows = plt.dataset[0].source[:, 0] // 2
+    assert rows.tolist() == list(range(0, 2000, 3)) + [1999]
+    assert plt.x_extent.max == 3998
+    assert decimate_plot(plt, factor=2)
+    assert len(plt.dataset[0].source) == 335
+    assert decimate_plot(plt, factor=2)
+    # too few rows remain to be thinned again
+    assert not decimate_plot(plt, factor=2)
+
+
+def test_023_overlay_plots():
+    """Plots of several samples are drawn on one figure, from shared sources."""
+    rng = np.random.default_rng(1)
+    samples = ["a", "b", "c"]
+    hists = [
+        ezc.histplot(data=rng.normal(size=1000), bins=200) for _ in samples]
+    combined = overlay_plots(hists, samples)
+    renderers = combined._fig.renderers
+    assert [x.tags for x in renderers] == [[x] for x in samples]
+    assert len({x.data_source.id for x in renderers}) == 1
+    source = renderers[0].data_source
+    assert list(np.unique(source.data["sample"])) == samples
+    assert [x.view.filter.group for x in renderers] == samples
+
+    # reduced within each sample
+    assert decimate_plot(combined)
+    assert len(source.data["left"]) == 300
+    assert list(np.unique(source.data["sample"])) == samples
+
+    # lines are drawn as rows of a multi-line source
+    lines = [
+        ezc.lineplot(
+            data=pd.DataFrame(dict(x=np.arange(10), y=rng.random(10))),
+            x="x", y="y", marker=False)
+        for _ in samples]
+    combined = overlay_plots(lines, samples)
+    assert {type(x.glyph).__name__ for x in combined._fig.renderers} == {
+        "MultiLine"}
+    assert len(combined._fig.renderers[0].data_source.data["xs"]) == 3